@@ -1,8 +1,18 @@
 # 파일명: 1_parse_pdf_to_db.py
 
+import argparse
+import hashlib
+import os
+import queue
+import threading
 import PyPDF2
 import mysql.connector
 import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from lecture_time import format_lecture_time, mask_to_hex, parse_lecture_time
 
 # ---!!! 중요: 자신의 환경에 맞게 수정하세요 !!!---
 DB_CONFIG = {
@@ -13,118 +23,411 @@ DB_CONFIG = {
     'port': 3306  
 }
 PDF_PATH = r'C:\Users\user\Desktop\과목.pdf'  # PDF 파일의 절대 경로로 변경
+BATCH_SIZE = 500  # 한 번에 비교/삽입하고 커밋할 과목 수
+DEFAULT_WORKERS = os.cpu_count() or 1  # 페이지 추출 프로세스 수
+PAGES_PER_TASK = 8  # 워커 한 번의 작업으로 추출할 페이지 수
+QUEUE_SIZE = 64  # 파이프라인 단계 사이 큐의 최대 길이 (메모리 상한)
+STOP_POLL_INTERVAL = 0.5  # 큐에서 기다리는 동안 파이프라인 중단 여부를 확인하는 간격(초)
+PARSER_VERSION = 2  # 파싱 결과 형식이 바뀌면 올림 (저장된 페이지 해시가 모두 달라져 전체 페이지를 한 번 다시 파싱)
 # ---------------------------------------------------
 
-def extract_text_from_pdf(pdf_path):
-    """PDF에서 페이지별 텍스트를 추출합니다."""
-    text_by_page = []
+def page_content_hash(page):
+    """페이지 콘텐츠 스트림(+ 파서 버전)의 해시. 텍스트를 추출하지 않고도 페이지 변경 여부를 알 수 있습니다."""
+    contents = page.get_contents()
+    data = contents.get_data() if contents is not None else b''
+    return hashlib.sha1(f"v{PARSER_VERSION}:".encode('ascii') + data).hexdigest()
+
+def _read_page(page_no, page, known_hashes):
+    """(page_no, text, page_hash)를 만듭니다. 해시가 이전과 같으면 텍스트 추출을 건너뛰고 text=None."""
+    page_hash = page_content_hash(page)
+    if known_hashes and known_hashes.get(page_no) == page_hash:
+        return page_no, None, page_hash
+    return page_no, page.extract_text(), page_hash
+
+def iter_pdf_pages(pdf_path, known_hashes=None, state=None):
+    """PDF에서 페이지를 하나씩 읽어 (page_no, text, page_hash)를 돌려줍니다.
+
+    state(IngestState)를 넘기면 실제 페이지 수와 추출 오류 여부를 기록합니다.
+    """
     try:
         with open(pdf_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
             print(f"PDF 총 페이지 수: {len(reader.pages)}")
-            for page in reader.pages:
-                text_by_page.append(page.extract_text())
-        return text_by_page
+            if state:
+                state.total_pages = len(reader.pages)
+            for page_no, page in enumerate(reader.pages):
+                yield _read_page(page_no, page, known_hashes)
     except FileNotFoundError:
         print(f"오류: PDF 파일을 찾을 수 없습니다. 경로를 확인하세요: {pdf_path}")
-        return []
+        if state:
+            state.failed = True
     except Exception as e:
         print(f"PDF 텍스트 추출 중 오류 발생: {e}")
-        return []
-
-def parse_course_data(text_pages):
-    """추출된 텍스트에서 정규식을 이용해 과목 정보를 파싱합니다."""
-    parsed_courses = []
-    # PDF 텍스트 구조에 맞는 정규식 (공백, 줄바꿈 등에 유연하게 대처)
-    course_pattern = re.compile(
-        r"^(?P<process_type>일반|교직|계약|학석사통합|학석박사통합|계약\(DSC\))\s*"
-        r"(?P<폐강여부>폐강)?\s*"
-        r"(?P<course_code_full>[A-Z0-9]+)\s+"
-        r"(?P<lecture_number>\d{10})\s+"
-        r"(?P<course_name>.+?)\s+"
-        r"(?P<department>.+?)\s+"
-        r"(?P<contact_info>\S+)$",
-        re.MULTILINE
-    )
-
-    for page_text in text_pages:
+        if state:
+            state.failed = True
+
+def _extract_page_range(pdf_path, start, end, known_hashes=None):
+    """(워커 프로세스) [start, end) 범위 페이지의 텍스트를 추출합니다."""
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [_read_page(page_no, reader.pages[page_no], known_hashes) for page_no in range(start, end)]
+
+def iter_pdf_pages_parallel(pdf_path, workers=DEFAULT_WORKERS, pages_per_task=PAGES_PER_TASK, known_hashes=None,
+                            state=None):
+    """페이지 범위를 여러 프로세스에 나누어 추출하고, 끝나는 순서대로 (page_no, text, page_hash)를 돌려줍니다.
+
+    동시에 진행 중인 작업은 워커 수의 2배로 제한하여, 소비가 느려도 추출 결과가 쌓이지 않게 합니다.
+    state(IngestState)를 넘기면 실제 페이지 수와 추출 오류 여부(실패한 작업이 하나라도 있는지)를 기록합니다.
+    """
+    try:
+        with open(pdf_path, 'rb') as file:
+            num_pages = len(PyPDF2.PdfReader(file).pages)
+    except FileNotFoundError:
+        print(f"오류: PDF 파일을 찾을 수 없습니다. 경로를 확인하세요: {pdf_path}")
+        if state:
+            state.failed = True
+        return
+    except Exception as e:
+        print(f"PDF 텍스트 추출 중 오류 발생: {e}")
+        if state:
+            state.failed = True
+        return
+    if state:
+        state.total_pages = num_pages
+    print(f"PDF 총 페이지 수: {num_pages} (워커 {workers}개, 작업당 {pages_per_task}페이지)")
+
+    max_in_flight = workers * 2
+    starts = iter(range(0, num_pages, pages_per_task))
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            for start in islice(starts, max_in_flight - len(pending)):
+                end = min(start + pages_per_task, num_pages)
+                range_hashes = {n: known_hashes[n] for n in range(start, end) if n in known_hashes} if known_hashes else None
+                pending.add(executor.submit(_extract_page_range, pdf_path, start, end, range_hashes))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    print(f"PDF 텍스트 추출 중 오류 발생: {e}")
+                    if state:
+                        state.failed = True
+                    continue
+                yield from pages
+
+# PDF 텍스트 구조에 맞는 정규식 (공백, 줄바꿈 등에 유연하게 대처)
+COURSE_PATTERN = re.compile(
+    r"^(?P<process_type>일반|교직|계약|학석사통합|학석박사통합|계약\(DSC\))\s*"
+    r"(?P<폐강여부>폐강)?\s*"
+    r"(?P<course_code_full>[A-Z0-9]+)\s+"
+    r"(?P<lecture_number>\d{10})\s+"
+    r"(?P<course_name>.+?)\s+"
+    r"(?P<department>.+?)\s+"
+    r"(?P<contact_info>\S+)$",
+    re.MULTILINE
+)
+
+def iter_course_matches(pages):
+    """(page_no, text) 흐름에서 정규식 매칭 결과(groupdict)를 하나씩 돌려줍니다.
+
+    과목명 뒤부터 다음 과목 행 전까지의 텍스트(줄바꿈된 강의 시간 포함)를 'time_text'로 함께 넘깁니다.
+    """
+    for page_no, page_text in pages:
         if not page_text:
             continue
-        
-        for match in course_pattern.finditer(page_text):
+        matches = list(COURSE_PATTERN.finditer(page_text))
+        for i, match in enumerate(matches):
             data = match.groupdict()
-            
-            # 학수번호와 분반 파싱
-            full_code = data['course_code_full']
-            # 학수번호 뒤에 붙은 숫자(최대 3자리)를 분반으로 가정
-            match_suffix = re.search(r'(\d{1,3})$', full_code)
-            if match_suffix and len(full_code) > len(match_suffix.group(1)):
-                class_number = match_suffix.group(1)
-                course_code = full_code[:-len(class_number)]
+            next_start = matches[i + 1].start() if i + 1 < len(matches) else len(page_text)
+            data['time_text'] = page_text[match.end('course_name'):next_start]
+            data['source_page'] = page_no
+            yield data
+
+def normalize_course_record(data):
+    """정규식 매칭 결과를 courses 테이블에 넣을 과목 레코드로 정리합니다."""
+    # 학수번호와 분반 파싱
+    full_code = data['course_code_full']
+    # 학수번호 뒤에 붙은 숫자(최대 3자리)를 분반으로 가정
+    match_suffix = re.search(r'(\d{1,3})$', full_code)
+    if match_suffix and len(full_code) > len(match_suffix.group(1)):
+        class_number = match_suffix.group(1)
+        course_code = full_code[:-len(class_number)]
+    else:
+        class_number = ""
+        course_code = full_code
+    # 강의 시간: 요일/교시 비트마스크 (DB에는 16진수 문자열)
+    time_mask = parse_lecture_time(data.get('time_text'))
+
+    return {
+        'process_type': data['process_type'].strip(),
+        'course_code': course_code.strip(),
+        'class_number': class_number.strip(),
+        'lecture_number': data['lecture_number'].strip(),
+        'course_name': data['course_name'].strip(),
+        'department': data['department'].strip(),
+        'contact_info': data['contact_info'].strip(),
+        'is_폐강': bool(data.get('폐강여부')),
+        'lecture_time': format_lecture_time(time_mask),
+        'time_mask': mask_to_hex(time_mask),
+        'source_page': data.get('source_page')
+    }
+
+# 과목 행의 내용 해시에 포함하는 컬럼 (파싱 결과에 포함되는 컬럼만)
+COURSE_COLUMNS = ('course_name', 'course_code', 'class_number', 'department', 'process_type', 'is_폐강',
+                  'lecture_time', 'time_mask')
+
+# 증분 적재를 위해 기존 `courses` 테이블에 추가하는 컬럼
+INGEST_COLUMNS = {
+    'content_hash': "CHAR(40)",
+    'source_pdf': "VARCHAR(255)",
+    'source_page': "INT",
+    'is_listed': "BOOLEAN NOT NULL DEFAULT TRUE",   # 최신 PDF에 없는 과목은 FALSE
+    'lecture_time': "VARCHAR(100)",                   # 예: '월1,2,3 수4'
+    'time_mask': "VARCHAR(32)",                       # 요일×교시 비트마스크 (16진수, lecture_time.py)
+}
+
+# INSERT ... ON DUPLICATE KEY UPDATE 쿼리 (executemany가 다중 행 INSERT로 묶을 수 있도록 세미콜론 없이 작성)
+UPSERT_SQL = """
+INSERT INTO courses (lecture_number, course_name, course_code, class_number, department, process_type, is_폐강,
+                     lecture_time, time_mask, content_hash, source_pdf, source_page, is_listed)
+VALUES (%(lecture_number)s, %(course_name)s, %(course_code)s, %(class_number)s, %(department)s, %(process_type)s, %(is_폐강)s,
+        %(lecture_time)s, %(time_mask)s, %(content_hash)s, %(source_pdf)s, %(source_page)s, TRUE)
+ON DUPLICATE KEY UPDATE
+    course_name = VALUES(course_name),
+    course_code = VALUES(course_code),
+    class_number = VALUES(class_number),
+    department = VALUES(department),
+    process_type = VALUES(process_type),
+    is_폐강 = VALUES(is_폐강),
+    lecture_time = VALUES(lecture_time),
+    time_mask = VALUES(time_mask),
+    content_hash = VALUES(content_hash),
+    source_pdf = VALUES(source_pdf),
+    source_page = VALUES(source_page),
+    is_listed = TRUE
+"""
+
+def create_courses_table(cursor):
+    """`courses`, `pdf_page_hashes` 테이블을 생성합니다 (이미 있으면 넘어감)."""
+    # 챗봇에 필요한 최소한의 컬럼만 정의
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS courses (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            lecture_number VARCHAR(20) UNIQUE NOT NULL,
+            course_name VARCHAR(255) NOT NULL,
+            course_code VARCHAR(30),
+            class_number VARCHAR(10),
+            department VARCHAR(100),
+            process_type VARCHAR(20),
+            is_폐강 BOOLEAN DEFAULT FALSE,
+            credits FLOAT,
+            course_classification VARCHAR(20)
+        );
+    """)
+    # 이전 버전에서 만든 테이블에는 증분 적재용 컬럼을 추가
+    cursor.execute(
+        "SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'courses'",
+        (DB_CONFIG['database'],))
+    existing_columns = {row[0] for row in cursor.fetchall()}
+    for column, ddl in INGEST_COLUMNS.items():
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE courses ADD COLUMN {column} {ddl}")
+
+    # PDF 페이지별 콘텐츠 해시 (다음 적재 때 바뀌지 않은 페이지를 건너뛰는 데 사용)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pdf_page_hashes (
+            source_pdf VARCHAR(255) NOT NULL,
+            page_no INT NOT NULL,
+            content_hash CHAR(40) NOT NULL,
+            PRIMARY KEY (source_pdf, page_no)
+        );
+    """)
+
+def course_content_hash(course):
+    """과목 행 하나의 내용 해시 (강좌번호 + COURSE_COLUMNS)."""
+    values = [course['lecture_number']] + [str(course[column]) for column in COURSE_COLUMNS]
+    return hashlib.sha1('\x1f'.join(values).encode('utf-8')).hexdigest()
+
+
+class IngestState:
+    """증분 적재 한 번의 진행 상황: 페이지 해시, 다시 파싱한 페이지, 이번 PDF에서 확인한 강좌번호.
+
+    total_pages(PdfReader 기준 실제 페이지 수)와 failed(추출 오류 여부)는 페이지 추출기가 기록합니다.
+    """
+
+    def __init__(self, source_pdf, known_page_hashes=None):
+        self.source_pdf = source_pdf
+        self.known_page_hashes = known_page_hashes or {}
+        self.page_hashes = {}
+        self.changed_pages = set()
+        self.seen_lecture_numbers = set()
+        self.total_pages = None
+        self.failed = False
+
+    def track_pages(self, pages):
+        """(page_no, text, page_hash) 흐름에서 해시를 기록하고, 바뀐 페이지만 (page_no, text)로 넘깁니다."""
+        for page_no, page_text, page_hash in pages:
+            self.page_hashes[page_no] = page_hash
+            if page_text is None:   # 해시가 이전과 같아 추출을 건너뛴 페이지
+                continue
+            self.changed_pages.add(page_no)
+            yield page_no, page_text
+
+    @property
+    def num_pages(self):
+        return self.total_pages if self.total_pages is not None else len(self.page_hashes)
+
+    def is_complete(self):
+        """0 ~ 실제 페이지 수-1의 모든 페이지를 오류 없이 읽었는지 확인합니다.
+
+        추출이 중간에 멈춰 앞쪽 페이지만 읽힌 경우도 완료로 보지 않습니다.
+        """
+        return (not self.failed and bool(self.total_pages)
+                and len(self.page_hashes) == self.total_pages and max(self.page_hashes) == self.total_pages - 1)
+
+
+def load_page_hashes(conn, source_pdf):
+    """이전 적재 때 저장한 페이지 해시를 불러옵니다."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT page_no, content_hash FROM pdf_page_hashes WHERE source_pdf = %s", (source_pdf,))
+        return dict(cursor.fetchall())
+    finally:
+        cursor.close()
+
+def iter_batches(items, batch_size):
+    """iterable을 batch_size 크기의 리스트로 나누어 돌려줍니다."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def upsert_course_batch(conn, batch, state=None):
+    """한 배치를 기존 행의 내용 해시와 비교해 바뀐 행만 executemany로 반영하고 커밋합니다.
+
+    반환값: (inserted, updated, unchanged)
+    """
+    source_pdf = state.source_pdf if state else None
+    # 같은 배치 안에서 강좌번호가 중복되면 마지막 행을 사용
+    courses = {course['lecture_number']: course for course in batch}
+    if state:
+        state.seen_lecture_numbers.update(courses)
+
+    cursor = conn.cursor(dictionary=True)
+    try:
+        placeholders = ','.join(['%s'] * len(courses))
+        cursor.execute(
+            "SELECT lecture_number, content_hash, source_pdf, source_page, is_listed FROM courses "
+            f"WHERE lecture_number IN ({placeholders})",
+            tuple(courses))
+        existing_rows = {row['lecture_number']: row for row in cursor.fetchall()}
+
+        to_write = []
+        inserted = updated = unchanged = 0
+        for lecture_number, course in courses.items():
+            row = dict(course, content_hash=course_content_hash(course), source_pdf=source_pdf,
+                       source_page=course.get('source_page'))
+            existing = existing_rows.get(lecture_number)
+            if existing is None:
+                inserted += 1
+                to_write.append(row)
+            elif existing['content_hash'] != row['content_hash']:
+                updated += 1
+                to_write.append(row)
             else:
-                class_number = ""
-                course_code = full_code
-
-            parsed_courses.append({
-                'process_type': data['process_type'].strip(),
-                'course_code': course_code.strip(),
-                'class_number': class_number.strip(),
-                'lecture_number': data['lecture_number'].strip(),
-                'course_name': data['course_name'].strip(),
-                'department': data['department'].strip(),
-                'contact_info': data['contact_info'].strip(),
-                'is_폐강': bool(data.get('폐강여부'))
-            })
-    print(f"정규식 매칭 성공: 총 {len(parsed_courses)}개 과목 발견")
-    return parsed_courses
-
-def setup_database_and_insert_courses(course_list):
-    """DB에 연결하여 테이블을 생성하고, 과목 리스트를 삽입/업데이트합니다."""
-    if not course_list:
-        print("DB에 삽입할 데이터가 없습니다.")
-        return
+                unchanged += 1
+                # 내용은 같지만 위치가 바뀌었거나 미등재였다가 다시 나타난 행은 위치 정보만 갱신
+                if (not existing['is_listed'] or existing['source_page'] != row['source_page']
+                        or existing['source_pdf'] != source_pdf):
+                    to_write.append(row)
+
+        if to_write:
+            cursor.executemany(UPSERT_SQL, to_write)
+        conn.commit()
+        return inserted, updated, unchanged
+    finally:
+        cursor.close()
+
+def finish_incremental_ingest(conn, state, batch_size=BATCH_SIZE):
+    """다시 파싱한 페이지(와 사라진 페이지)에 있던 과목 중 이번 PDF에 없는 과목을 미등재로 표시하고,
+    페이지 해시를 저장합니다.
+
+    추출 오류가 있었거나 0 ~ 실제 페이지 수-1을 모두 읽지 못했으면 미등재 표시, 해시 삭제/저장을 모두 건너뜁니다
+    (읽은 과목의 upsert는 이미 반영됨). 다음 적재 때 바뀐 페이지를 다시 파싱해 마저 처리합니다.
 
+    반환값: 미등재로 표시한 과목 수
+    """
+    if not state.is_complete():
+        print(f"PDF를 끝까지 읽지 못해(읽은 페이지 {len(state.page_hashes)}/{state.total_pages or '?'}) "
+              "미등재 처리와 페이지 해시 저장을 건너뜁니다.")
+        return 0
+    cursor = conn.cursor()
+    try:
+        absent = []
+        changed_pages = sorted(state.changed_pages)
+        page_filters = [(f"source_page IN ({','.join(['%s'] * len(pages))})", pages)
+                        for pages in iter_batches(changed_pages, batch_size)]
+        page_filters.append(("source_page >= %s", [state.num_pages]))
+        for condition, params in page_filters:
+            cursor.execute(
+                f"SELECT lecture_number FROM courses WHERE source_pdf = %s AND is_listed = TRUE AND {condition}",
+                (state.source_pdf, *params))
+            absent.extend(ln for (ln,) in cursor.fetchall() if ln not in state.seen_lecture_numbers)
+        for lecture_numbers in iter_batches(absent, batch_size):
+            cursor.executemany("UPDATE courses SET is_listed = FALSE WHERE lecture_number = %s",
+                               [(ln,) for ln in lecture_numbers])
+
+        cursor.execute("DELETE FROM pdf_page_hashes WHERE source_pdf = %s AND page_no >= %s",
+                       (state.source_pdf, state.num_pages))
+        changed_hashes = [(state.source_pdf, page_no, page_hash)
+                          for page_no, page_hash in state.page_hashes.items()
+                          if state.known_page_hashes.get(page_no) != page_hash]
+        for rows in iter_batches(changed_hashes, batch_size):
+            cursor.executemany(
+                "INSERT INTO pdf_page_hashes (source_pdf, page_no, content_hash) VALUES (%s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE content_hash = VALUES(content_hash)",
+                rows)
+        conn.commit()
+        return len(absent)
+    finally:
+        cursor.close()
+
+def setup_database_and_insert_courses(course_list, batch_size=BATCH_SIZE, state=None):
+    """DB에 연결하여 테이블을 생성하고, 과목을 배치 단위로 삽입/업데이트합니다.
+
+    course_list는 리스트뿐 아니라 generator도 받으며, 배치가 찰 때마다 바로 커밋합니다.
+    state(IngestState)를 넘기면 끝까지 성공했을 때 미등재 과목 표시와 페이지 해시 저장까지 수행합니다.
+    """
+    totals = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'absent': 0}
+    processed = 0
+    start = time.perf_counter()
     try:
         conn = mysql.connector.connect(**DB_CONFIG)
         cursor = conn.cursor()
 
         print("`courses` 테이블 생성 또는 확인 중...")
-        # `courses` 테이블 생성 (이미 있으면 넘어감)
-        # 챗봇에 필요한 최소한의 컬럼만 정의
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS courses (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                lecture_number VARCHAR(20) UNIQUE NOT NULL,
-                course_name VARCHAR(255) NOT NULL,
-                course_code VARCHAR(30),
-                class_number VARCHAR(10),
-                department VARCHAR(100),
-                process_type VARCHAR(20),
-                is_폐강 BOOLEAN DEFAULT FALSE,
-                credits FLOAT,
-                course_classification VARCHAR(20)
-            );
-        """)
-
-        # INSERT ... ON DUPLICATE KEY UPDATE 쿼리
-        sql = """
-        INSERT INTO courses (lecture_number, course_name, course_code, class_number, department, process_type, is_폐강)
-        VALUES (%(lecture_number)s, %(course_name)s, %(course_code)s, %(class_number)s, %(department)s, %(process_type)s, %(is_폐강)s)
-        ON DUPLICATE KEY UPDATE
-            course_name = VALUES(course_name),
-            course_code = VALUES(course_code),
-            class_number = VALUES(class_number),
-            department = VALUES(department),
-            process_type = VALUES(process_type),
-            is_폐강 = VALUES(is_폐강);
-        """
-        
-        for course in course_list:
-            cursor.execute(sql, course)
-        
-        conn.commit()
-        print(f"데이터 처리 완료: 총 {cursor.rowcount}개 행이 영향을 받았습니다.")
-        
+        create_courses_table(cursor)
+
+        # 배치마다 커밋하므로 중간에 실패해도 앞선 배치는 반영된 상태로 남음
+        for batch_no, batch in enumerate(iter_batches(course_list, batch_size), start=1):
+            inserted, updated, unchanged = upsert_course_batch(conn, batch, state)
+            totals['inserted'] += inserted
+            totals['updated'] += updated
+            totals['unchanged'] += unchanged
+            processed += len(batch)
+            print(f"  배치 {batch_no}: 신규 {inserted}, 변경 {updated}, 동일 {unchanged} "
+                  f"(누적 {processed}행, {time.perf_counter() - start:.2f}초)")
+
+        if state and state.page_hashes:
+            totals['absent'] = finish_incremental_ingest(conn, state, batch_size)
+            print(f"페이지 {state.num_pages}개 중 {len(state.changed_pages)}개만 다시 파싱, "
+                  f"미등재 처리 {totals['absent']}개")
+
     except mysql.connector.Error as err:
         print(f"MySQL 오류: {err}")
     finally:
@@ -132,15 +435,124 @@ def setup_database_and_insert_courses(course_list):
             cursor.close()
             conn.close()
 
+    if processed == 0 and not totals['absent']:
+        print("DB에 반영할 변경 사항이 없습니다.")
+        return totals
+
+    elapsed = time.perf_counter() - start
+    throughput = processed / elapsed if elapsed > 0 else 0.0
+    print(f"데이터 처리 완료: 신규 {totals['inserted']}개, 변경 {totals['updated']}개, 동일 {totals['unchanged']}개 "
+          f"(총 {processed}행, {elapsed:.2f}초, {throughput:.0f}행/초)")
+    return totals
+
+# --- 스트리밍 파이프라인 (pages → 정규식 매칭 → 과목 레코드 → 배치 upsert) ---
+_END_OF_STREAM = object()
+
+def _put_until_stopped(out_queue, item, stop):
+    """큐에 자리가 날 때까지 기다려 넣습니다. 그 전에 stop이 설정되면 False."""
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=STOP_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _pump(source, out_queue, errors, stop):
+    """(스레드) source의 항목을 크기가 제한된 큐로 흘려보냅니다. stop이 설정되면 그만 읽습니다."""
+    try:
+        for item in source:
+            if not _put_until_stopped(out_queue, item, stop):
+                break
+    except Exception as e:
+        errors.append(e)
+    finally:
+        if hasattr(source, 'close'):
+            source.close()   # 추출 프로세스 풀 등 source가 쥔 자원 정리
+        _put_until_stopped(out_queue, _END_OF_STREAM, stop)
+
+def buffered_stage(source, maxsize=QUEUE_SIZE, stop=None):
+    """source를 별도 스레드에서 앞서 읽되, 최대 maxsize개까지만 쌓아 두는 generator.
+
+    큐가 가득 차면 앞 단계가 멈추므로(backpressure) 전체 메모리 사용량이 문서 크기와 무관해집니다.
+    파이프라인의 모든 단계에 같은 stop(threading.Event)을 넘기면, 소비하는 쪽이 실패해 stop을 설정하거나
+    이 generator를 끝까지 읽지 않고 닫았을 때 모든 단계의 스레드가 큐에서 멈춰 있지 않고 끝납니다.
+    """
+    stop = stop or threading.Event()
+    out_queue = queue.Queue(maxsize=maxsize)
+    errors = []
+    worker = threading.Thread(target=_pump, args=(source, out_queue, errors, stop), daemon=True)
+    worker.start()
+    try:
+        while True:
+            try:
+                item = out_queue.get(timeout=STOP_POLL_INTERVAL)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            if item is _END_OF_STREAM:
+                break
+            yield item
+    except BaseException:
+        stop.set()   # 소비하는 쪽이 중간에 닫거나 실패함
+        raise
+    worker.join()
+    if errors:
+        raise errors[0]
+
+def run_ingest_pipeline(pdf_path, workers=DEFAULT_WORKERS, batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE,
+                        source_pdf=None, full=False):
+    """PDF → 파싱 → DB 적재를 단계별 generator와 제한된 큐로 연결해 스트리밍으로 처리합니다.
+
+    이전 적재 때 저장한 페이지 해시와 같은 페이지는 텍스트 추출/파싱을 건너뛰고(full=True면 전체 처리),
+    내용 해시가 바뀐 과목 행만 DB에 씁니다.
+    """
+    source_pdf = source_pdf or os.path.basename(pdf_path)
+    known_page_hashes = {}
+    if not full:
+        try:
+            conn = mysql.connector.connect(**DB_CONFIG)
+            try:
+                cursor = conn.cursor()
+                create_courses_table(cursor)
+                cursor.close()
+                known_page_hashes = load_page_hashes(conn, source_pdf)
+            finally:
+                conn.close()
+        except mysql.connector.Error as err:
+            print(f"MySQL 오류: {err}")
+            return None
+    state = IngestState(source_pdf, known_page_hashes)
+
+    if workers > 1:
+        pages = iter_pdf_pages_parallel(pdf_path, workers=workers, known_hashes=known_page_hashes, state=state)
+    else:
+        pages = iter_pdf_pages(pdf_path, known_hashes=known_page_hashes, state=state)
+    stop = threading.Event()
+    pages = buffered_stage(state.track_pages(pages), queue_size, stop)
+    matches = buffered_stage(iter_course_matches(pages), queue_size, stop)
+    records = buffered_stage((normalize_course_record(data) for data in matches), queue_size, stop)
+    try:
+        return setup_database_and_insert_courses(records, batch_size=batch_size, state=state)
+    finally:
+        stop.set()   # 적재가 중간에 실패해도 앞 단계 스레드가 큐에 막혀 남지 않도록
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="과목 PDF를 파싱하여 courses 테이블에 반영합니다.")
+    parser.add_argument('--pdf', default=PDF_PATH, help="과목 목록 PDF 경로")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="페이지 추출 프로세스 수 (1이면 순차 추출)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="배치당 삽입/커밋할 과목 수")
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help="파이프라인 단계 사이 큐의 최대 길이")
+    parser.add_argument('--source', default=None, help="페이지 해시를 저장할 PDF 식별자 (기본값: 파일명)")
+    parser.add_argument('--full', action='store_true', help="저장된 페이지 해시를 무시하고 전체 페이지를 다시 파싱")
+    return parser.parse_args()
+
 if __name__ == '__main__':
-    print("--- 1. PDF에서 텍스트 추출 시작 ---")
-    all_pages_text = extract_text_from_pdf(PDF_PATH)
-    
-    if all_pages_text:
-        print("\n--- 2. 텍스트에서 과목 정보 파싱 시작 ---")
-        parsed_courses = parse_course_data(all_pages_text)
-        
-        if parsed_courses:
-            print("\n--- 3. MySQL에 데이터 삽입 시작 ---")
-            setup_database_and_insert_courses(parsed_courses)
-            print("\n--- 모든 작업 완료 ---")
\ No newline at end of file
+    args = parse_args()
+
+    print("--- PDF 추출 → 파싱 → MySQL 적재 (스트리밍) 시작 ---")
+    run_ingest_pipeline(args.pdf, workers=args.workers, batch_size=args.batch_size, queue_size=args.queue_size,
+                        source_pdf=args.source, full=args.full)
+    print("\n--- 모든 작업 완료 ---")
\ No newline at end of file
@@ -0,0 +1,74 @@
+# 파일명: academic_snapshot.py
+
+import hashlib
+import threading
+import time
+from collections import defaultdict
+
+from db_utils import get_student_enrollments
+
+FAILED_GRADES = ('F', 'W', 'NP')
+SNAPSHOT_TTL_SECONDS = 60   # 이 시간(초)이 지나면 다음 조회 때 수강 내역을 다시 읽음 (다른 경로로 바뀐 내역 반영)
+
+def normalize_course_name(course_name):
+    """과목명 비교용 정규화 (공백 제거)."""
+    return course_name.replace(" ", "")
+
+
+class AcademicSnapshot:
+    """한 학생의 수강 내역을 한 번만 조회해 두고, 분석/추천 단계에서 함께 쓰는 스냅샷."""
+
+    def __init__(self, student_id, enrollments):
+        self.student_id = student_id
+        self.enrollments = tuple(enrollments)
+        self.loaded_at = time.monotonic()
+        # 수강 내역 내용 해시 (내용이 같으면 다시 조회해도 같은 값 → 분석 결과 캐시 키로 사용)
+        self.fingerprint = hashlib.sha1(
+            repr([sorted(e.items()) for e in self.enrollments]).encode('utf-8')).hexdigest()
+        self.taken_course_names = frozenset(e['course_name'] for e in self.enrollments)
+        self.taken_course_names_normalized = frozenset(
+            normalize_course_name(name) for name in self.taken_course_names)
+
+        credits_by_classification = defaultdict(int)
+        total_completed_credits = 0
+        for e in self.enrollments:
+            if e.get('credits') and e.get('grade') not in FAILED_GRADES:
+                total_completed_credits += e['credits']
+                if e.get('course_classification'):
+                    credits_by_classification[e['course_classification']] += e['credits']
+        self.completed_credits_by_classification = dict(credits_by_classification)
+        self.total_completed_credits = total_completed_credits
+
+    def credits_for(self, classification):
+        """이수 구분별 이수 학점을 반환합니다 (없으면 0)."""
+        return self.completed_credits_by_classification.get(classification, 0)
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+def get_academic_snapshot(student_id, max_age=SNAPSHOT_TTL_SECONDS):
+    """학생의 스냅샷을 반환합니다. 캐시에 없거나 TTL이 지났을 때만 수강 내역을 DB에서 조회합니다.
+
+    조회에 실패하면 캐시하지 않고, 이전 스냅샷이 있으면 그것을, 없으면 빈 스냅샷을 돌려줍니다.
+    """
+    with _snapshots_lock:
+        snapshot = _snapshots.get(student_id)
+    if snapshot is not None and time.monotonic() - snapshot.loaded_at < max_age:
+        return snapshot
+    enrollments = get_student_enrollments(student_id)
+    if enrollments is None:
+        print(f"수강 내역을 불러오지 못했습니다 (학번 {student_id}).")
+        return snapshot if snapshot is not None else AcademicSnapshot(student_id, [])
+    snapshot = AcademicSnapshot(student_id, enrollments)
+    with _snapshots_lock:
+        _snapshots[student_id] = snapshot
+    return snapshot
+
+def invalidate_academic_snapshot(student_id=None):
+    """수강 내역이 바뀌었을 때 호출합니다. student_id가 없으면 전체 캐시를 비웁니다."""
+    with _snapshots_lock:
+        if student_id is None:
+            _snapshots.clear()
+        else:
+            _snapshots.pop(student_id, None)
@@ -0,0 +1,92 @@
+# 파일명: answer_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# --- 설정 ---
+SIMILARITY_THRESHOLD = 0.92   # 질의 임베딩 코사인 유사도가 이 이상이면 같은 질문으로 간주
+ANSWER_TTL_SECONDS = 3600     # 저장한 답변의 유효 시간(초)
+MAX_CACHED_ANSWERS = 256      # 최대 보관 답변 수 (초과 시 가장 오래 안 쓴 것부터 삭제)
+
+
+class SemanticAnswerCache:
+    """비슷한 질문이 같은 청크 집합을 검색했을 때 이전 답변을 그대로 돌려주는 RAG 답변 캐시.
+
+    FAISS 인덱스 버전이 바뀌면 저장된 답변을 모두 버립니다.
+    """
+
+    def __init__(self, similarity_threshold=SIMILARITY_THRESHOLD, ttl_seconds=ANSWER_TTL_SECONDS,
+                 max_entries=MAX_CACHED_ANSWERS):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.index_version = None
+        self._entries = OrderedDict()   # entry_id -> (정규화된 질의 벡터, chunk_ids, 답변, 저장 시각)
+        self._by_chunks = {}            # chunk_ids -> {entry_id, ...}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _remove(self, entry_id):
+        _, chunk_ids, _, _ = self._entries.pop(entry_id)
+        ids = self._by_chunks.get(chunk_ids)
+        if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+                del self._by_chunks[chunk_ids]
+
+    def _check_version(self, index_version):
+        if index_version != self.index_version:
+            self._entries.clear()
+            self._by_chunks.clear()
+            self.index_version = index_version
+
+    def lookup(self, query_vector, chunk_ids, index_version=None):
+        """같은 청크 집합을 검색한 이전 질문 중 충분히 비슷한 것이 있으면 그 답변을, 없으면 None을 반환합니다."""
+        chunk_ids = frozenset(chunk_ids)
+        query = self._normalize(query_vector)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(index_version)
+            best_id, best_score = None, self.similarity_threshold
+            for entry_id in list(self._by_chunks.get(chunk_ids, ())):
+                vector, _, _, stored_at = self._entries[entry_id]
+                if now - stored_at > self.ttl_seconds:
+                    self._remove(entry_id)
+                    continue
+                score = float(np.dot(query, vector))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id][2]
+
+    def store(self, query_vector, chunk_ids, answer, index_version=None):
+        """생성한 답변을 저장합니다."""
+        chunk_ids = frozenset(chunk_ids)
+        with self._lock:
+            self._check_version(index_version)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (self._normalize(query_vector), chunk_ids, answer, time.monotonic())
+            self._by_chunks.setdefault(chunk_ids, set()).add(entry_id)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
@@ -6,29 +6,66 @@ from collections import defaultdict
 import pandas as pd
 
 # --- 필요한 모듈 임포트 (RAG/OCR 관련 모두 제거) ---
-from langchain_community.llms import Ollama
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from db_utils import authenticate_student, get_student_enrollments
+from rag_service import ADVISOR_PROMPT, SERVICE_URL, connect_rag_backend
+from db_utils import authenticate_student
 from academic_advisor import analyze_graduation_progress, suggest_courses
+from academic_snapshot import get_academic_snapshot, invalidate_academic_snapshot
+from course_catalog import get_course_catalog
+from course_planner import format_plan_for_report, plan_courses
+from rule_engine import get_rule_set
 
 # --- 설정 ---
-LLM_MODEL = "gemma3:12b"
+# LLM 모델은 rag_service.py에서 설정합니다.
+RAG_SERVICE_URL = SERVICE_URL  # `python rag_service.py`로 띄운 서비스 주소 (없으면 이 프로세스에서 직접 로드)
 
-# --- Streamlit 캐싱: LLM 모델 로딩 ---
+# --- Streamlit 캐싱: LLM 백엔드 연결 ---
 @st.cache_resource
 def load_llm():
-    """LLM 모델을 로드하고 캐시에 저장합니다."""
+    """LLM 백엔드(RAG 서비스 또는 프로세스 내 클라이언트)에 연결하고 캐시에 저장합니다.
+
+    연결 확인은 상태 조회(health)로만 하며, 시험용 답변 생성은 하지 않습니다.
+    """
     try:
-        llm = Ollama(model=LLM_MODEL)
-        llm.invoke("test") # 간단한 호출로 연결 테스트
-        print("LLM 모델 로딩 성공.")
-        return llm
+        backend = connect_rag_backend(RAG_SERVICE_URL)
+        health = backend.health()
+        if not health.get('llm_available'):
+            st.error(f"Ollama에서 LLM 모델({health.get('llm_model')})을 찾을 수 없습니다.")
+            st.info("Ollama 서버가 실행 중인지, 모델이 다운로드되었는지 확인해주세요.")
+            return None
+        print("LLM 백엔드 연결 성공.")
+        return backend
     except Exception as e:
         st.error(f"LLM 모델 로딩 중 오류 발생: {e}")
         st.info("Ollama 서버가 실행 중인지, 모델이 다운로드되었는지 확인해주세요.")
         return None
 
+# --- LLM 답변을 받는 대로 화면에 그리는 함수 ---
+def stream_response(container, stream, request_start):
+    """답변 조각이 도착할 때마다 container를 갱신하고, (전체 답변, 응답 지표)를 반환합니다.
+
+    응답 지표: ttft(첫 토큰까지 걸린 초), tokens(스트림 조각 수 ≈ 토큰 수), tokens_per_sec, total(초)
+    """
+    pieces = []
+    first_token_time = None
+    for piece in stream:
+        if first_token_time is None:
+            first_token_time = time.perf_counter()
+        pieces.append(piece)
+        container.markdown("".join(pieces) + "▌")
+    end_time = time.perf_counter()
+    full_response = "".join(pieces)
+    container.markdown(full_response)
+
+    metrics = {'ttft': (first_token_time or end_time) - request_start, 'tokens': len(pieces),
+               'total': end_time - request_start, 'tokens_per_sec': 0.0}
+    if first_token_time is not None and end_time > first_token_time:
+        metrics['tokens_per_sec'] = len(pieces) / (end_time - first_token_time)
+    return full_response, metrics
+
+def format_metrics(metrics):
+    return (f"첫 토큰 {metrics['ttft']:.2f}초 · {metrics['tokens']}토큰 · "
+            f"{metrics['tokens_per_sec']:.1f} tokens/sec · 총 {metrics['total']:.1f}초")
+
 # --- 분석 결과를 LLM 프롬프트용 텍스트로 변환하는 함수 ---
 def format_report_for_llm(student_name, analysis, suggestions):
     """분석 및 추천 결과를 LLM이 이해하기 좋은 텍스트로 변환합니다."""
@@ -73,10 +110,34 @@ def format_report_for_llm(student_name, analysis, suggestions):
                 report += "- 추천할 개설 과목을 찾지 못했습니다.\n"
             for course in courses:
                 credits = f" ({int(course['credits'])}학점)" if course.get('credits') is not None else ""
-                report += f"- {course['course_name']}{credits}\n"
+                lecture_time = f" [{course['lecture_time']}]" if course.get('lecture_time') else ""
+                report += f"- {course['course_name']}{credits}{lecture_time}\n"
                 
     return report
 
+# --- 세션별 분석 결과 캐시 ---
+def get_advising_report(student_info):
+    """분석/추천/학기별 계획/리포트를 세션에 저장해 두고, 수강 내역이나 개설 과목이 바뀌었을 때만 다시 계산합니다.
+
+    캐시 키: (학번, 수강 내역 해시, 카탈로그 버전, 졸업요건 규칙 파일 상태)
+    """
+    snapshot = get_academic_snapshot(student_info['student_id'])
+    catalog = get_course_catalog()
+    key = (student_info['student_id'], snapshot.fingerprint, catalog.version, get_rule_set().signature)
+    cached = st.session_state.get("advising_cache")
+    if cached and cached["key"] == key:
+        return cached["report"]
+
+    with st.spinner("학업 현황을 분석 중입니다..."):
+        analysis = analyze_graduation_progress(student_info, snapshot)
+        suggestions = suggest_courses(student_info, analysis, snapshot)
+        plan = plan_courses(student_info, analysis, snapshot, catalog)
+        report = format_report_for_llm(student_info['student_name'], analysis, suggestions)
+        report += format_plan_for_report(plan)
+    st.session_state.advising_cache = {"key": key, "analysis": analysis, "suggestions": suggestions,
+                                       "plan": plan, "report": report}
+    return report
+
 # --- 메인 애플리케이션 ---
 def main():
     st.set_page_config(page_title="AI 학업 조교 챗봇", page_icon="🎓", layout="wide")
@@ -117,6 +178,7 @@ def main():
         st.sidebar.markdown(f"**학번:** {st.session_state.student_info['student_id']}")
         st.sidebar.markdown(f"**학과:** {st.session_state.student_info['department_major']}")
         if st.sidebar.button("로그아웃", use_container_width=True, type="primary"):
+            invalidate_academic_snapshot(st.session_state.student_info['student_id'])
             st.session_state.clear()
             st.rerun()
 
@@ -124,6 +186,8 @@ def main():
         for message in st.session_state.messages:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
+                if message.get("metrics"):
+                    st.caption(format_metrics(message["metrics"]))
 
         # 사용자 입력 처리
         if prompt := st.chat_input("질문을 입력하세요..."):
@@ -133,33 +197,19 @@ def main():
 
             with st.chat_message("assistant"):
                 response_container = st.empty()
-                
+                request_start = time.perf_counter()
+
                 # RAG 기능이 없으므로, 모든 질문을 졸업요건 분석으로 처리
-                with st.spinner("학업 현황 분석 및 답변을 생성 중입니다..."):
-                    analysis = analyze_graduation_progress(st.session_state.student_info)
-                    suggestions = suggest_courses(st.session_state.student_info, analysis)
-                    report_for_llm = format_report_for_llm(st.session_state.student_info['student_name'], analysis, suggestions)
-
-                    advisor_prompt = ChatPromptTemplate.from_template(
-                        """당신은 대학교의 친절하고 유능한 AI 학업 조교입니다.
-                        아래에 주어진 학생의 '학업 분석 및 추천 리포트'를 바탕으로 학생의 질문에 답변해주세요.
-                        먼저, 학생의 현재 학점 현황(총학점, 부족한 영역)을 요약해서 설명해주세요.
-                        그 다음, 리포트에 있는 '세부 졸업요건 충족 현황'을 바탕으로 학생이 놓치고 있는 중요한 규칙이 있다면 강조해서 설명해주세요.
-                        마지막으로 '다음 학기 추천 과목 목록'을 카테고리별로 명확하게 제시하며, 왜 이 과목들을 들어야 하는지 간단히 설명하고 격려하며 대화를 마무리해주세요.
-                        
-                        --- 학업 분석 및 추천 리포트 ---
-                        {report}
-                        --------------------------------
-                        
-                        이제 위 리포트를 바탕으로 학생에게 자연스럽게 설명해주세요."""
-                    )
-                    advisor_chain = advisor_prompt | llm | StrOutputParser()
-                    stream = advisor_chain.stream({"report": report_for_llm})
-                
-                full_response = "".join(list(stream))
-                response_container.markdown(full_response)
+                # (같은 세션의 후속 질문은 저장해 둔 리포트를 그대로 써서 바로 LLM으로 보냄)
+                report_for_llm = get_advising_report(st.session_state.student_info)
+
+                # 답변은 생성되는 대로 바로 표시 (전체 생성을 기다리지 않음)
+                stream = llm.generate(ADVISOR_PROMPT.format(report=report_for_llm))
+                full_response, metrics = stream_response(response_container, stream, request_start)
+                st.caption(format_metrics(metrics))
+                print(f"[응답 지표] {format_metrics(metrics)}")
                 
-            st.session_state.messages.append({"role": "assistant", "content": full_response})
+            st.session_state.messages.append({"role": "assistant", "content": full_response, "metrics": metrics})
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+# 파일명: batch_audit.py
+# 학과/입학연도 단위 일괄 졸업 심사
+# - 수강 내역은 학번 순 한 번의 쿼리로 스트리밍하고 itertools.groupby로 학생별로 묶음
+# - 학생 묶음을 프로세스 풀에 나눠 컴파일된 졸업요건(rule_engine)으로 평가
+# - 결과는 CSV 또는 graduation_audit 요약 테이블에 저장
+# 사용 예: python batch_audit.py --department 인공지능소프트웨어학과 --cohort 2021 --csv audit_2021.csv
+
+import argparse
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import groupby, islice
+from operator import itemgetter
+
+from db_utils import get_students, iter_all_enrollments, pooled_connection
+from academic_snapshot import AcademicSnapshot
+from rule_engine import get_requirements_for_student
+
+# --- 설정 ---
+DEFAULT_WORKERS = os.cpu_count() or 1
+STUDENTS_PER_TASK = 200    # 프로세스 하나에 한 번에 넘기는 학생 수
+UPSERT_BATCH_SIZE = 500
+AUDIT_COLUMNS = ['student_id', 'student_name', 'department', 'total_completed', 'total_missing',
+                 'missing_by_classification', 'missing_required_courses', 'unsatisfied_rules', 'graduation_ready']
+
+AUDIT_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS graduation_audit (
+    student_id VARCHAR(20) PRIMARY KEY,
+    student_name VARCHAR(100),
+    department VARCHAR(100),
+    total_completed INT,
+    total_missing INT,
+    missing_by_classification VARCHAR(255),
+    missing_required_courses TEXT,
+    unsatisfied_rules TEXT,
+    graduation_ready BOOLEAN NOT NULL DEFAULT FALSE,
+    audited_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+)
+"""
+AUDIT_UPSERT_SQL = (
+    f"INSERT INTO graduation_audit ({', '.join(AUDIT_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(AUDIT_COLUMNS))}) "
+    "ON DUPLICATE KEY UPDATE "
+    + ", ".join(f"{column} = VALUES({column})" for column in AUDIT_COLUMNS[1:])
+    + ", audited_at = CURRENT_TIMESTAMP"
+)
+
+
+def iter_student_transcripts(students, enrollments):
+    """학번 순 학생 목록과 학번 순 수강 내역을 병합해 (student, [수강 내역...])을 내보냅니다.
+
+    수강 내역이 없는 학생도 빈 목록으로 내보냅니다.
+    """
+    grouped = groupby(enrollments, key=itemgetter('student_id'))
+    current = next(grouped, None)
+    for student in students:
+        student_id = student['student_id']
+        # 학생 목록에 없는 학번(필터 밖)의 수강 내역은 건너뜀
+        while current is not None and current[0] < student_id:
+            current = next(grouped, None)
+        if current is not None and current[0] == student_id:
+            yield student, list(current[1])
+            current = next(grouped, None)
+        else:
+            yield student, []
+
+def audit_student(student, enrollments):
+    """학생 한 명의 졸업요건을 평가해 요약 행(dict)을 만듭니다."""
+    row = {'student_id': student['student_id'], 'student_name': student.get('student_name'),
+           'department': student.get('department_major')}
+    compiled = get_requirements_for_student(student)
+    if compiled is None:
+        row.update({'total_completed': None, 'total_missing': None, 'missing_by_classification': '',
+                    'missing_required_courses': '',
+                    'unsatisfied_rules': f"'{row['department']}'의 졸업 요건 정보가 정의되지 않았습니다.",
+                    'graduation_ready': False})
+        return row
+
+    analysis = compiled.evaluate_snapshot(AcademicSnapshot(student['student_id'], enrollments))
+    missing_areas = [f"{area['classification']}:{area['missing']}"
+                     for area in analysis['by_classification'] if area['missing'] > 0]
+    unsatisfied = [detail['name'] for detail in analysis['detailed_analysis'] if not detail['is_satisfied']]
+    row.update({
+        'total_completed': analysis['summary']['total_completed'],
+        'total_missing': int(analysis['summary']['total_missing']),
+        'missing_by_classification': ";".join(missing_areas),
+        'missing_required_courses': ";".join(analysis['missing_required_courses']),
+        'unsatisfied_rules': ";".join(unsatisfied),
+        'graduation_ready': (analysis['summary']['total_missing'] <= 0 and not missing_areas
+                             and not analysis['missing_required_courses'] and not unsatisfied),
+    })
+    return row
+
+def _audit_chunk(transcripts):
+    """프로세스 풀 작업 단위: [(student, enrollments), ...] -> [요약 행, ...]"""
+    return [audit_student(student, enrollments) for student, enrollments in transcripts]
+
+def _chunks(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_audit(transcripts, workers=DEFAULT_WORKERS, students_per_task=STUDENTS_PER_TASK):
+    """학생 묶음을 프로세스 풀에서 평가하고 요약 행을 학번 순서 그대로 내보냅니다.
+
+    동시에 진행 중인 작업은 workers * 2개로 제한해, 수강 내역 스트리밍이 평가보다 앞서 나가며
+    메모리에 쌓이지 않도록 합니다.
+    """
+    chunks = _chunks(transcripts, students_per_task)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _audit_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_audit_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_audit_csv(rows, csv_path):
+    """요약 행을 CSV로 저장합니다 (엑셀에서 한글이 깨지지 않도록 utf-8-sig). 저장한 행 수를 반환."""
+    count = 0
+    with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=AUDIT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+@contextmanager
+def audit_table_upserter():
+    """graduation_audit 테이블에 행 묶음을 upsert하고 커밋하는 함수를 빌려줍니다 (연결 실패 시 None)."""
+    with pooled_connection() as conn:
+        if not conn:
+            yield None
+            return
+        cursor = conn.cursor()
+        try:
+            cursor.execute(AUDIT_TABLE_SQL)
+
+            def upsert(batch):
+                cursor.executemany(AUDIT_UPSERT_SQL, [tuple(row[c] for c in AUDIT_COLUMNS) for row in batch])
+                conn.commit()
+
+            yield upsert
+        finally:
+            cursor.close()
+
+def write_audit_table(rows, batch_size=UPSERT_BATCH_SIZE):
+    """요약 행을 graduation_audit 테이블에 batch_size개씩 upsert합니다. 저장한 행 수를 반환."""
+    count = 0
+    with audit_table_upserter() as upsert:
+        if upsert is None:
+            return 0
+        for batch in _chunks(rows, batch_size):
+            upsert(batch)
+            count += len(batch)
+    return count
+
+def _tee_to_table(rows, upsert, batch_size=UPSERT_BATCH_SIZE):
+    """CSV로 쓰는 행을 그대로 내보내면서, batch_size개가 모일 때마다 테이블에도 upsert합니다."""
+    batch = []
+    for row in rows:
+        yield row
+        batch.append(row)
+        if len(batch) >= batch_size:
+            upsert(batch)
+            batch = []
+    if batch:
+        upsert(batch)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="학과/입학연도 단위로 전체 학생의 졸업요건을 일괄 심사합니다.")
+    parser.add_argument('--department', help="대상 학과 (없으면 전체 학과)")
+    parser.add_argument('--cohort', help="입학연도 (학번 앞 4자리, 예: 2021)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="평가에 쓸 프로세스 수")
+    parser.add_argument('--students-per-task', type=int, default=STUDENTS_PER_TASK)
+    parser.add_argument('--csv', help="결과를 저장할 CSV 경로")
+    parser.add_argument('--table', action='store_true', help="결과를 graduation_audit 테이블에 저장")
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    if not args.csv and not args.table:
+        args.csv = "graduation_audit.csv"
+
+    start_time = time.perf_counter()
+    students = get_students(args.department, args.cohort)
+    print(f"심사 대상 학생: {len(students)}명 (프로세스 {args.workers}개)")
+    transcripts = iter_student_transcripts(students, iter_all_enrollments(args.department, args.cohort))
+    rows = run_audit(transcripts, args.workers, args.students_per_task)
+
+    if args.csv and args.table:
+        with audit_table_upserter() as upsert:
+            if upsert is not None:
+                rows = _tee_to_table(rows, upsert)
+            count = write_audit_csv(rows, args.csv)
+        print(f"CSV 저장 완료: {args.csv} ({count}행)")
+        print(f"graduation_audit 테이블 저장 완료: {count if upsert is not None else 0}행")
+    elif args.csv:
+        count = write_audit_csv(rows, args.csv)
+        print(f"CSV 저장 완료: {args.csv} ({count}행)")
+    else:
+        count = write_audit_table(rows)
+        print(f"graduation_audit 테이블 저장 완료: {count}행")
+
+    elapsed = time.perf_counter() - start_time
+    if count:
+        print(f"심사 완료: {count}명, {elapsed:.2f}초, {count / elapsed:.1f} students/sec")
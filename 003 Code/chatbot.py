@@ -1,20 +1,15 @@
 # 파일명: chatbot.py (RAG 기능 통합 버전)
 
-import os
-from langchain_community.llms import Ollama
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from rag_service import ADVISOR_PROMPT, RAG_PROMPT, SERVICE_URL, connect_rag_backend
 
 from db_utils import authenticate_student
 from academic_advisor import analyze_graduation_progress, suggest_courses
+from academic_snapshot import get_academic_snapshot
+from course_planner import format_plan_for_report, plan_courses
 
 # --- 설정 (자신의 환경에 맞게 수정) ---
-LLM_MODEL = "gemma3:12b" 
-EMBEDDING_MODEL = "nomic-embed-text" # 임베딩에 사용할 모델
-FAISS_INDEX_PATH = "faiss_course_index"  # RAG 인덱스가 저장된 폴더
+# LLM/임베딩 모델과 인덱스 경로는 rag_service.py에서 설정합니다.
+RAG_SERVICE_URL = SERVICE_URL  # `python rag_service.py`로 띄운 서비스 주소 (없으면 이 프로세스에서 직접 로드)
 # ----------------------------------------
 
 def format_report_for_llm(student_name, analysis, suggestions):
@@ -43,7 +38,8 @@ def format_report_for_llm(student_name, analysis, suggestions):
                 report += "- 추천할 개설 과목을 찾지 못했습니다.\n"
             for course in courses:
                 credits = f" ({int(course['credits'])}학점)" if course.get('credits') is not None else ""
-                report += f"- {course['course_name']}{credits}\n"
+                lecture_time = f" [{course['lecture_time']}]" if course.get('lecture_time') else ""
+                report += f"- {course['course_name']}{credits}{lecture_time}\n"
     return report
 
 def run_chatbot():
@@ -51,24 +47,22 @@ def run_chatbot():
     print("AI 학업 조교 챗봇 (RAG 탑재 버전)에 오신 것을 환영합니다!")
     print("="*50)
     
-    # --- LLM 및 RAG 구성 요소 로딩 ---
+    # --- LLM 및 RAG 구성 요소 연결 ---
+    # 서비스가 떠 있으면 이미 로드된 모델/인덱스를 공유하고, 없으면 이 프로세스에서 직접 로드
     try:
-        llm = Ollama(model=LLM_MODEL)
-        embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
-        print(f"✅ LLM ({LLM_MODEL}) 및 임베딩 모델 ({EMBEDDING_MODEL})에 성공적으로 연결되었습니다.")
+        backend = connect_rag_backend(RAG_SERVICE_URL)
+        health = backend.health()
     except Exception as e:
         print(f"❌ LLM 또는 임베딩 모델 연결 실패: {e}\nOllama가 실행 중인지, 모델들이 다운로드되었는지 확인해주세요.")
         return
+    if not health.get('llm_available'):
+        print(f"⚠️ Ollama에서 LLM ({health.get('llm_model')})을 찾을 수 없습니다. Ollama가 실행 중인지, 모델이 다운로드되었는지 확인해주세요.")
 
-    if not os.path.exists(FAISS_INDEX_PATH):
-        print(f"❌ RAG 인덱스 파일을 찾을 수 없습니다. '{FAISS_INDEX_PATH}'")
+    if health.get('index_version') is None:
+        print("❌ RAG 인덱스 파일을 찾을 수 없습니다.")
         print("먼저 `rag_setup.py` 스크립트를 실행하여 인덱스를 생성해주세요.")
         return
-        
-    print("RAG 인덱스 로딩 중...")
-    vector_store = FAISS.load_local(FAISS_INDEX_PATH, embeddings, allow_dangerous_deserialization=True)
-    retriever = vector_store.as_retriever()
-    print("✅ RAG 인덱스 로딩 완료.")
+    print(f"✅ RAG 인덱스 준비 완료. (버전 {health.get('index_version')})")
     # ---------------------------------
 
     student_info = None
@@ -83,24 +77,11 @@ def run_chatbot():
         else:
             print("\n❌ 학생 정보가 일치하지 않습니다. 다시 시도해주세요.")
 
-    # RAG 체인 생성
-    rag_prompt = ChatPromptTemplate.from_template(
-        """당신은 과목 정보를 상세히 설명해주는 AI 조교입니다.
-        아래에 주어진 '참고 자료'를 바탕으로 사용자의 '질문'에 대해 아는 만큼만 상세하게 답변해주세요.
-        만약 참고 자료에 없는 내용이라면, "해당 과목에 대한 상세 정보를 PDF에서 찾을 수 없습니다."라고 솔직하게 답변하세요.
-
-        [참고 자료]
-        {context}
-
-        [질문]
-        {question}
-        """
-    )
-    rag_chain = {"context": retriever, "question": RunnablePassthrough()} | rag_prompt | llm | StrOutputParser()
-    
     while True:
         query = input(f"\n[{student_info['student_name']}님] >> ")
         if query.lower() in ['exit', 'quit', '종료', '그만']:
+            stats = backend.stats()
+            print(f"\n[답변 캐시] 적중 {stats['hits']}회 / 미적중 {stats['misses']}회 (적중률 {stats['hit_rate']:.0%})")
             print("\n[AI 조교] 챗봇을 종료합니다. 언제든 다시 찾아주세요!")
             break
 
@@ -108,24 +89,35 @@ def run_chatbot():
         if any(keyword in query for keyword in ['졸업', '요건', '학점', '추천']):
             # 1. 졸업 요건 분석 기능
             print("\n[AI 조교] ⏳ 학업 현황을 분석하고 맞춤형 조언을 생성 중입니다...")
-            analysis = analyze_graduation_progress(student_info)
-            suggestions = suggest_courses(student_info, analysis)
+            snapshot = get_academic_snapshot(student_info['student_id'])
+            analysis = analyze_graduation_progress(student_info, snapshot)
+            suggestions = suggest_courses(student_info, analysis, snapshot)
             report_for_llm = format_report_for_llm(student_info['student_name'], analysis, suggestions)
-            
-            # 졸업 요건 분석용 프롬프트는 기존과 동일
-            advisor_prompt = ChatPromptTemplate.from_template(...) # 이전 답변의 프롬프트 복사
-            advisor_chain = advisor_prompt | llm | StrOutputParser()
+            report_for_llm += format_plan_for_report(plan_courses(student_info, analysis, snapshot))
             
             print("\n[AI 조교] ", end="")
-            for chunk in advisor_chain.stream({"report": report_for_llm}):
+            for chunk in backend.generate(ADVISOR_PROMPT.format(report=report_for_llm)):
                 print(chunk, end="", flush=True)
             print()
             
         else:
             # 2. RAG를 이용한 과목 정보 검색 기능 (기본값)
             print("\n[AI 조교] ⏳ 과목 정보를 PDF에서 검색 중입니다...")
+            # 과목명이 그대로 있으면 과목명 색인, 아니면 하이브리드 검색 (인덱스가 갱신되면 자동으로 다시 읽음)
+            try:
+                result = backend.retrieve(query)
+            except Exception as e:
+                print(f"\n[AI 조교] 검색 중 오류가 발생했습니다: {e}")
+                continue
+            if result['timings']:
+                print(f"[검색 시간] {result['timings']}")
+
             print("\n[AI 조교] ", end="")
-            for chunk in rag_chain.stream(query):
+            if result['answer'] is not None:
+                print(result['answer'])
+                continue
+            prompt = RAG_PROMPT.format(context=result['context'], question=query)
+            for chunk in backend.generate(prompt, result['cache_token']):
                 print(chunk, end="", flush=True)
             print()
 
@@ -0,0 +1,104 @@
+# 파일명: course_catalog.py
+
+import threading
+import time
+from collections import defaultdict
+
+from db_utils import get_open_courses
+from academic_snapshot import normalize_course_name
+from lecture_time import hex_to_mask
+
+# --- 설정 ---
+CATALOG_TTL_SECONDS = 300   # 이 시간(초)이 지나면 다음 조회 때 courses 테이블을 다시 읽음
+
+
+class CourseCatalog:
+    """폐강되지 않은 개설 과목을 메모리에 올려 두고 학과/이수구분/과목명으로 색인한 카탈로그.
+
+    각 분반의 'time_mask'는 정수 비트마스크입니다 (lecture_time.py, 시간 정보가 없으면 0).
+    """
+
+    def __init__(self, courses, version):
+        self.courses = tuple(courses)      # courses.id 순서 유지
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+        by_department = defaultdict(list)
+        by_classification = defaultdict(list)
+        by_department_classification = defaultdict(list)
+        by_name = defaultdict(list)
+        by_exact_name = defaultdict(list)
+        self.position = {}                 # lecture_number -> 카탈로그 내 순서
+        for position, course in enumerate(self.courses):
+            self.position[course['lecture_number']] = position
+            by_department[course.get('department')].append(course)
+            by_classification[course.get('course_classification')].append(course)
+            by_department_classification[(course.get('department'), course.get('course_classification'))].append(course)
+            by_name[normalize_course_name(course['course_name'])].append(course)
+            by_exact_name[course['course_name']].append(course)
+        self.by_department = {k: tuple(v) for k, v in by_department.items()}
+        self.by_classification = {k: tuple(v) for k, v in by_classification.items()}
+        self.by_department_classification = {k: tuple(v) for k, v in by_department_classification.items()}
+        self.by_name = {k: tuple(v) for k, v in by_name.items()}              # 공백 제거한 과목명 기준
+        self.by_exact_name = {k: tuple(v) for k, v in by_exact_name.items()}  # 과목명 그대로
+
+    def sections_named(self, course_names, taken_course_names=(), preferred_department=None, normalized=False):
+        """과목명 목록에 해당하는 개설 분반을 색인으로 찾습니다 (이미 들은 과목 제외).
+
+        순서는 preferred_department 학과 분반이 먼저, 그 안에서는 카탈로그 순서입니다.
+        normalized=True면 공백을 무시하고 과목명을 비교합니다.
+        """
+        if normalized:
+            index, keys = self.by_name, {normalize_course_name(name) for name in course_names}
+        else:
+            index, keys = self.by_exact_name, set(course_names)
+        sections = [c for key in keys for c in index.get(key, ()) if c['course_name'] not in taken_course_names]
+        sections.sort(key=lambda c: (c.get('department') != preferred_department, self.position[c['lecture_number']]))
+        return sections
+
+    def sections_in_classification(self, classification, department=None):
+        """이수구분(과 학과)에 해당하는 개설 분반을 카탈로그 순서로 반환합니다."""
+        if department is None:
+            return self.by_classification.get(classification, ())
+        return self.by_department_classification.get((department, classification), ())
+
+
+def _with_time_mask(course):
+    """DB의 16진수 time_mask를 정수로 바꿉니다 (분반끼리 비트 연산으로 시간 충돌 확인)."""
+    course['time_mask'] = hex_to_mask(course.get('time_mask'))
+    return course
+
+
+_catalog = None
+_catalog_version = 0
+_catalog_lock = threading.Lock()
+
+def get_course_catalog(max_age=CATALOG_TTL_SECONDS):
+    """메모리 카탈로그를 반환합니다. 처음 호출되거나 TTL이 지났을 때만 DB에서 다시 읽습니다.
+
+    다시 읽은 내용이 이전과 같으면 version을 유지하므로, version으로 결과를 캐시해도 됩니다.
+    조회에 실패하면 캐시하지 않고 이전 카탈로그(없으면 빈 카탈로그)를 돌려주며, 다음 호출 때 다시 시도합니다.
+    """
+    global _catalog, _catalog_version
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - catalog.loaded_at < max_age:
+        return catalog
+    with _catalog_lock:
+        catalog = _catalog
+        if catalog is None or time.monotonic() - catalog.loaded_at >= max_age:
+            rows = get_open_courses()
+            if rows is None:
+                print("개설 과목을 불러오지 못했습니다. 이전 카탈로그를 사용합니다.")
+                return catalog if catalog is not None else CourseCatalog((), _catalog_version)
+            courses = tuple(_with_time_mask(course) for course in rows)
+            if catalog is None or courses != catalog.courses:
+                _catalog_version += 1
+            catalog = CourseCatalog(courses, _catalog_version)
+            _catalog = catalog
+    return catalog
+
+def invalidate_course_catalog():
+    """courses 테이블이 바뀌었음을 알립니다. 다음 조회 때 카탈로그를 다시 읽습니다."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
@@ -0,0 +1,121 @@
+# 파일명: course_lookup.py
+
+import json
+import os
+import re
+
+from academic_snapshot import normalize_course_name
+
+COURSE_LOOKUP_FILE = "course_lookup.json"  # FAISS 인덱스 폴더 안에 함께 저장
+MIN_KEY_LENGTH = 3  # 너무 짧은 키는 다른 단어에 섞여 잘못 매칭되므로 제외
+# 한글 과목명 바로 뒤에 붙어도 과목명이 끝난 것으로 보는 조사/단어 ('기계학습은', '기계학습수업')
+FOLLOWING_WORDS = ('은', '는', '이', '가', '을', '를', '의', '에', '와', '과', '도', '만', '로', '으로',
+                   '랑', '이랑', '하고', '에서', '에는', '에게', '부터', '까지', '이란', '란', '이라는', '라는',
+                   '이요', '요', '수업', '과목', '강의')
+
+# 교과목 개요 문서의 과목 항목: "- **AISW310011 소프트웨어원리 (Principles of Software) 3-3-0**"
+COURSE_ENTRY_PATTERN = re.compile(
+    r"^\s*- \*\*(?P<code>[A-Z]{2,}\d{3,}[A-Z0-9]*)\s+(?P<name>[^(*\n]+?)\s*(?:\((?P<english>[^)\n]*)\))?[\s\d-]*\*\*",
+    re.MULTILINE
+)
+
+def lookup_key(text):
+    """과목명/과목코드 비교용 키 (공백 제거 + 소문자)."""
+    return normalize_course_name(text).lower()
+
+def _char_class(char):
+    if '가' <= char <= '힣':
+        return 'hangul'
+    if char.isascii() and char.isalnum():
+        return 'alnum'
+    return None
+
+def _compact_with_breaks(query):
+    """질문을 공백 없는 비교용 문자열로 바꾸고, 각 위치 앞이 단어 경계인지 표시합니다.
+
+    경계: 문자열 시작, 원래 공백이 있던 자리, 문자 종류가 바뀌는 자리 (한글↔영숫자↔기호).
+    breaks[i]는 text[i] 앞, breaks[len(text)]는 끝.
+    """
+    chars, breaks = [], []
+    spaced = True
+    for char in query.lower():
+        if char.isspace():
+            spaced = True
+            continue
+        breaks.append(spaced or not chars or _char_class(chars[-1]) != _char_class(char)
+                      or _char_class(char) is None)
+        chars.append(char)
+        spaced = False
+    breaks.append(True)
+    return "".join(chars), breaks
+
+def build_course_lookup(chunks_by_id):
+    """청크에 들어 있는 과목 항목을 찾아 {과목명/코드 키: [chunk_id, ...]} 색인을 만듭니다."""
+    lookup = {}
+    for chunk_id, chunk in chunks_by_id.items():
+        for match in COURSE_ENTRY_PATTERN.finditer(chunk.page_content):
+            for value in (match.group('code'), match.group('name'), match.group('english')):
+                if not value:
+                    continue
+                key = lookup_key(value)
+                if len(key) < MIN_KEY_LENGTH:
+                    continue
+                chunk_ids = lookup.setdefault(key, [])
+                if chunk_id not in chunk_ids:
+                    chunk_ids.append(chunk_id)
+    return lookup
+
+def save_course_lookup(lookup, index_path):
+    with open(os.path.join(index_path, COURSE_LOOKUP_FILE), 'w', encoding='utf-8') as f:
+        json.dump(lookup, f, ensure_ascii=False, indent=1)
+
+
+class CourseLookup:
+    """질문에 과목명이나 과목코드가 그대로 들어 있으면, 임베딩/벡터 검색 없이 해당 청크를 바로 찾아 줍니다."""
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+        # 긴 키부터 확인해 '자연어처리개념과응용'이 '자연어처리'보다 먼저 잡히게 함
+        self._keys = sorted(lookup, key=len, reverse=True)
+
+    @classmethod
+    def load(cls, index_path):
+        """인덱스 폴더의 색인을 읽습니다. 없으면 빈 색인."""
+        try:
+            with open(os.path.join(index_path, COURSE_LOOKUP_FILE), encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls({})
+
+    def _word_at(self, text, breaks, key, start):
+        """text[start:]의 key가 다른 단어의 일부가 아닌지 ('고급기계학습'의 '기계학습'은 제외)."""
+        end = start + len(key)
+        if not breaks[start] or breaks[end]:
+            return breaks[start]
+        if _char_class(key[-1]) != 'hangul':
+            return False   # 과목코드/영문명은 앞뒤가 모두 경계여야 함
+        # 한글 과목명 뒤에 조사 등이 붙은 경우 ('기계학습은', '기계학습에서')
+        return any(text.startswith(word, end) and breaks[end + len(word)] for word in FOLLOWING_WORDS)
+
+    def match(self, query):
+        """질문에 포함된 과목 키를 찾아 해당 chunk_id 목록을 반환합니다 (없으면 빈 리스트).
+
+        키는 단어 경계에서 시작해 끝나는 경우만 인정하고, 긴 키에 이미 잡힌 부분은 짧은 키로 다시 잡지 않습니다.
+        """
+        text, breaks = _compact_with_breaks(query)
+        matched_keys = []
+        covered = [False] * len(text)
+        for key in self._keys:
+            start = text.find(key)
+            while start != -1:
+                if not any(covered[start:start + len(key)]) and self._word_at(text, breaks, key, start):
+                    covered[start:start + len(key)] = [True] * len(key)
+                    if key not in matched_keys:
+                        matched_keys.append(key)
+                start = text.find(key, start + 1)
+        chunk_ids = []
+        for key in matched_keys:
+            for chunk_id in self.lookup[key]:
+                if chunk_id not in chunk_ids:
+                    chunk_ids.append(chunk_id)
+        return chunk_ids
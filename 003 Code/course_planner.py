@@ -0,0 +1,506 @@
+# 파일명: course_planner.py
+# 졸업까지의 학기별 수강 계획 (최소 학기 수)
+# - 입력: 졸업요건 분석 결과(analyze_graduation_progress) + 개설 과목 카탈로그
+# - 교육과정 학기 배치(1-1 ~ 4-2, rag_corpus/01_교육과정_및_졸업요건.md)를 따름:
+#   배치된 과목은 해당 학기(1학기/2학기)에만, 배치 학년 이후에 수강
+# - 택1(take_one_or_more)/영역(area_based) 요건의 과목 선택은 분기한정 + 메모이제이션으로,
+#   한 과목이 여러 요건과 이수구분 학점을 함께 채우도록 고름
+# - 학기 배정은 학기별 최대 학점 안에서 분기한정으로 가장 적은 학기 수를 찾음
+# 가정: 지금 카탈로그(최신 PDF)의 과목이 교육과정 배치 학기마다 다시 개설된다고 봄
+
+import datetime
+import math
+import os
+import re
+import time
+
+from academic_snapshot import get_academic_snapshot, normalize_course_name
+from course_catalog import get_course_catalog
+from requirements_rule import parse_admission_year
+from rule_engine import get_requirements_for_student
+
+# --- 설정 ---
+CURRICULUM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rag_corpus", "01_교육과정_및_졸업요건.md")
+MAX_CREDITS_PER_SEMESTER = 18
+MAX_PLAN_SEMESTERS = 12          # 이 학기 수 안에 끝나는 계획이 없으면 계획 실패로 봄
+PLAN_SEARCH_NODE_LIMIT = 20000   # 학기 수 하나당 배정 탐색 노드 상한 (넘으면 한 학기 늘려서 탐색)
+
+TERM_HEADING = re.compile(r'^###\s*(\d)-(\d)\s*학기')
+ROMAN_NUMERALS = str.maketrans({'Ⅰ': 'I', 'Ⅱ': 'II', 'Ⅲ': 'III', 'Ⅳ': 'IV'})
+
+
+def curriculum_key(course_name):
+    """교육과정 문서와 카탈로그의 과목명 표기 차이(공백, 로마 숫자, 괄호 부제)를 없앤 비교용 키."""
+    return normalize_course_name(re.sub(r'\(.*?\)', '', course_name)).translate(ROMAN_NUMERALS)
+
+def parse_curriculum_placement(text):
+    """교육과정 문서의 '### 1-1 학기' 절 아래 과목 목록을 {과목 키: (학년, 학기)}로 읽습니다."""
+    placement = {}
+    term = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('#'):
+            match = TERM_HEADING.match(line)
+            term = (int(match.group(1)), int(match.group(2))) if match else None
+        elif term and line.startswith('- ') and not line.endswith('택1'):
+            placement.setdefault(curriculum_key(line[2:]), term)
+    return placement
+
+_placement_cache = {}
+
+def get_curriculum_placement(path=CURRICULUM_FILE):
+    """교육과정 학기 배치를 반환합니다. 문서가 바뀌었을 때만 다시 읽습니다."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        print(f"교육과정 문서가 없어 학기 배치 없이 계획합니다: {path}")
+        return {}
+    cached = _placement_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, encoding='utf-8') as f:
+            cached = (mtime_ns, parse_curriculum_placement(f.read()))
+        _placement_cache[path] = cached
+    return cached[1]
+
+
+def default_start_term(student_id, today=None):
+    """오늘 날짜와 입학연도(학번 앞 4자리)로 계획을 시작할 다음 학기 (학년, 학기)를 정합니다.
+
+    1학기: 3~8월, 2학기: 9~다음 해 2월로 보고, 지금 학기의 다음 학기부터 계획합니다.
+    """
+    today = today or datetime.date.today()
+    admission_year = parse_admission_year(student_id)
+    if admission_year is None:
+        return (1, 1)
+    if 3 <= today.month <= 8:
+        academic_year, semester = today.year, 2
+    else:
+        academic_year, semester = (today.year + 1 if today.month >= 9 else today.year), 1
+    return (max(1, academic_year - admission_year + 1), semester)
+
+def term_at(start_term, offset):
+    """start_term에서 offset 학기 뒤의 (학년, 학기)."""
+    index = (start_term[0] - 1) * 2 + (start_term[1] - 1) + offset
+    return (index // 2 + 1, index % 2 + 1)
+
+def term_label(term):
+    return f"{term[0]}-{term[1]}"
+
+
+class PlanItem:
+    """계획에 넣을 과목 하나 (대표 분반, 채우는 요건들, 학기 배치)."""
+    __slots__ = ('name', 'credits', 'classification', 'placement', 'section', 'reasons')
+
+    def __init__(self, section, placement, reason):
+        self.name = section['course_name']
+        self.credits = section.get('credits') or 0
+        self.classification = section.get('course_classification')
+        self.placement = placement
+        self.section = section
+        self.reasons = [reason]
+
+    def allowed_terms(self, start_term, num_terms):
+        """num_terms 학기 중 이 과목을 들을 수 있는 학기 번호들."""
+        if self.placement is None:
+            return tuple(range(num_terms))
+        year, semester = self.placement
+        return tuple(t for t in range(num_terms)
+                     if term_at(start_term, t)[1] == semester and term_at(start_term, t)[0] >= year)
+
+
+def _placement_capacity_ok(items, start_term, num_terms, max_credits):
+    """학기 배치가 있는 과목들이 num_terms 학기 안에 들어갈 수 있는지 빠르게 확인합니다 (필요조건).
+
+    (학년 y 이후의 s학기에만 들을 수 있는 과목들의 학점 합) <= (학년 y 이후 s학기 수) * 학기별 최대 학점
+    """
+    terms = [term_at(start_term, t) for t in range(num_terms)]
+    for semester in (1, 2):
+        placed = [item for item in items if item.placement is not None and item.placement[1] == semester]
+        for year in {item.placement[0] for item in placed}:
+            load = sum(item.credits for item in placed if item.placement[0] >= year)
+            capacity = max_credits * sum(1 for term in terms if term[1] == semester and term[0] >= year)
+            if load > capacity:
+                return False
+    return True
+
+def schedule_items(items, start_term, max_credits, min_terms=1, max_terms=MAX_PLAN_SEMESTERS,
+                   node_limit=PLAN_SEARCH_NODE_LIMIT):
+    """과목들을 학기별 최대 학점 안에서 가장 적은 학기에 배정합니다.
+
+    학기 수 N을 하한부터 늘려 가며, N마다 분기한정으로 배정을 찾습니다
+    (선택지가 적은 과목부터, 이미 실패한 (과목 번호, 학기별 학점) 상태는 다시 보지 않음).
+    반환: ([(학기 번호, item), ...], 탐색 노드 수). 배정할 수 없으면 (None, 노드 수).
+    """
+    total = sum(item.credits for item in items)
+    lower = max(min_terms, math.ceil(total / max_credits) if max_credits else 1, 1)
+    nodes = 0
+    for num_terms in range(lower, max_terms + 1):
+        allowed = [item.allowed_terms(start_term, num_terms) for item in items]
+        if any(not terms for terms in allowed):
+            continue
+        if not _placement_capacity_ok(items, start_term, num_terms, max_credits):
+            continue
+
+        order = sorted(range(len(items)), key=lambda i: (len(allowed[i]), -items[i].credits))
+        remaining = [0] * (len(order) + 1)
+        for position in range(len(order) - 1, -1, -1):
+            remaining[position] = remaining[position + 1] + items[order[position]].credits
+        loads = [0] * num_terms
+        assignment = [None] * len(items)
+        failed = set()
+        budget = [node_limit]
+
+        def assign(position):
+            if position == len(order):
+                return True
+            state = (position, tuple(loads))
+            if state in failed or budget[0] <= 0:
+                return False
+            budget[0] -= 1
+            if max_credits * num_terms - sum(loads) < remaining[position]:
+                failed.add(state)
+                return False
+            i = order[position]
+            credits = items[i].credits
+            tried_loads = set()
+            for t in allowed[i]:
+                if loads[t] + credits > max_credits:
+                    continue
+                if items[i].placement is None:
+                    # 배치가 없는 과목에게는 학점이 같은 학기끼리 차이가 없음
+                    if loads[t] in tried_loads:
+                        continue
+                    tried_loads.add(loads[t])
+                loads[t] += credits
+                assignment[i] = t
+                if assign(position + 1):
+                    return True
+                loads[t] -= credits
+            failed.add(state)
+            return False
+
+        found = assign(0)
+        nodes += node_limit - budget[0]
+        if found:
+            return [(assignment[i], items[i]) for i in range(len(items))], nodes
+    return None, nodes
+
+
+class CoursePlanner:
+    """학생 한 명의 계획 문제: 고정 과목, 택1/영역 선택 그룹, 이수구분 학점 부족분."""
+
+    def __init__(self, student_info, analysis, snapshot, catalog, compiled, start_term, max_credits, placement):
+        self.department = student_info['department_major']
+        self.snapshot = snapshot
+        self.catalog = catalog
+        self.start_term = start_term
+        self.max_credits = max_credits
+        self.placement = placement
+        self.taken = snapshot.taken_course_names
+        self.taken_keys = {curriculum_key(name) for name in self.taken}
+        self.unplanned = []
+        self._sections = {}
+        self._fillers = {}
+        self._schedules = {}
+        self.nodes = 0
+
+        # 고정 과목: 필수 과목 + take_all 요건의 미이수 과목
+        self.fixed = {}
+        for name in analysis['missing_required_courses']:
+            self._add_fixed(name, "필수 과목")
+        rules = compiled.source.get('detailed_requirements', {})
+        self.groups = []      # (이유, 선택 가능한 과목명 tuple, 건너뛰기 허용 그룹 번호 또는 None)
+        self.skip_budget = []
+        for detail in analysis.get('detailed_analysis', []):
+            if detail.get('is_satisfied'):
+                continue
+            rule = rules.get(detail['name'], {})
+            if detail.get('missing_items'):
+                for name in detail['missing_items']:
+                    self._add_fixed(name, detail['name'])
+            elif rule.get('type') == 'take_one_or_more':
+                self._add_group(detail['name'], rule.get('courses', []), None)
+            elif rule.get('type') == 'area_based' and detail.get('missing_areas'):
+                areas = rule.get('areas', {})
+                needed = rule['num_areas_required'] - (len(areas) - len(detail['missing_areas']))
+                skip_slot = None
+                if needed < len(detail['missing_areas']):
+                    skip_slot = len(self.skip_budget)
+                    self.skip_budget.append(len(detail['missing_areas']) - needed)
+                for area in detail['missing_areas']:
+                    self._add_group(f"필수 영역: {area}", areas.get(area, []), skip_slot)
+        self._drop_interchangeable_options()
+        # 선택지가 적은 그룹부터 분기
+        self.groups.sort(key=lambda group: len(group[1]))
+
+        # 학점 부족분: 이수구분별, credit_sum 요건, 총 학점
+        self.class_deficits = {area['classification']: area['missing']
+                               for area in analysis['by_classification'] if area['missing'] > 0}
+        self.credit_sum_rules = []
+        for detail in analysis.get('detailed_analysis', []):
+            rule = rules.get(detail['name'], {})
+            if not detail.get('is_satisfied') and rule.get('type') == 'credit_sum':
+                current = sum(snapshot.credits_for(c) for c in rule['classifications'])
+                self.credit_sum_rules.append((detail['name'], tuple(rule['classifications']),
+                                              rule['required_credits'] - current))
+        self.total_missing = analysis['summary']['total_missing']
+
+    # --- 과목 정보 ---
+    def section_for(self, name):
+        """과목명의 대표 분반 (소속 학과 분반 먼저). 개설되지 않았거나 이미 들었으면 None."""
+        if name not in self._sections:
+            sections = self.catalog.sections_named([name], self.taken, self.department, normalized=True)
+            self._sections[name] = sections[0] if sections else None
+        return self._sections[name]
+
+    def make_item(self, section, reason):
+        return PlanItem(section, self.placement.get(curriculum_key(section['course_name'])), reason)
+
+    def earliest_term(self, section):
+        placement = self.placement.get(curriculum_key(section['course_name']))
+        if placement is None:
+            return 0
+        return next(t for t in range(MAX_PLAN_SEMESTERS + 2)
+                    if term_at(self.start_term, t)[1] == placement[1] and term_at(self.start_term, t)[0] >= placement[0])
+
+    def _add_fixed(self, name, reason):
+        section = self.section_for(name)
+        if section is None:
+            self.unplanned.append(f"{name}: 개설 과목 목록에 없어 계획에 넣지 못했습니다.")
+        elif section['course_name'] in self.fixed:
+            self.fixed[section['course_name']].reasons.append(reason)
+        else:
+            self.fixed[section['course_name']] = self.make_item(section, reason)
+
+    def _add_group(self, reason, course_names, skip_slot):
+        options = []
+        for name in course_names:
+            section = self.section_for(name)
+            if section is not None and section['course_name'] not in options:
+                options.append(section['course_name'])
+        if not options and skip_slot is None:
+            self.unplanned.append(f"{reason}: 개설된 선택 과목이 없어 계획에 넣지 못했습니다.")
+            return
+        # 학점이 작은 과목, 빨리 들을 수 있는 과목 순으로 먼저 시도
+        options.sort(key=lambda name: (self.section_for(name).get('credits') or 0,
+                                       self.earliest_term(self.section_for(name))))
+        self.groups.append((reason, tuple(options), skip_slot))
+
+    def _drop_interchangeable_options(self):
+        """한 그룹 안에서 다른 요건에 쓰이지 않고 학점/이수구분/학기 배치가 같은 선택지는 하나만 남깁니다.
+
+        이런 과목끼리는 어느 것을 골라도 계획의 학기 수와 학점이 같으므로 탐색할 필요가 없습니다.
+        """
+        uses = {}
+        for _, options, _ in self.groups:
+            for name in options:
+                uses[name] = uses.get(name, 0) + 1
+        groups = []
+        for reason, options, skip_slot in self.groups:
+            kept, signatures = [], set()
+            for name in options:
+                section = self.section_for(name)
+                signature = (section.get('credits') or 0, section.get('course_classification'),
+                             self.placement.get(curriculum_key(name)))
+                if uses[name] == 1 and name not in self.fixed:
+                    if signature in signatures:
+                        continue
+                    signatures.add(signature)
+                kept.append(name)
+            groups.append((reason, tuple(kept), skip_slot))
+        self.groups = groups
+
+    # --- 학점 보충 ---
+    def credit_need(self, chosen_credits_by_class, chosen_total):
+        """선택한 과목들 외에 더 채워야 하는 학점 (이수구분 부족분 → credit_sum 요건 → 총 학점 순)."""
+        class_fill = {c: max(0, deficit - chosen_credits_by_class.get(c, 0))
+                      for c, deficit in self.class_deficits.items()}
+        need = sum(class_fill.values())
+        for _, classifications, deficit in self.credit_sum_rules:
+            covered = sum(chosen_credits_by_class.get(c, 0) + class_fill.get(c, 0) for c in classifications)
+            need += max(0, deficit - covered)
+        return need + max(0, self.total_missing - chosen_total - need)
+
+    def filler_candidates(self, classification):
+        """보충용 과목 후보 (과목명당 분반 하나, 소속 학과 → 빨리 들을 수 있는 과목 → 학점 큰 과목 순)."""
+        if classification not in self._fillers:
+            seen = {}
+            sources = (self.catalog.sections_in_classification(classification) if classification
+                       else self.catalog.by_department.get(self.department, ()))
+            for section in sources:
+                name = section['course_name']
+                if name not in seen and curriculum_key(name) not in self.taken_keys and section.get('credits'):
+                    seen[name] = self.section_for(name) or section
+            self._fillers[classification] = sorted(
+                seen.values(), key=lambda s: (s.get('department') != self.department, self.earliest_term(s),
+                                              -(s.get('credits') or 0), self.catalog.position[s['lecture_number']]))
+        return self._fillers[classification]
+
+    def fill_credits(self, items):
+        """이수구분/credit_sum/총 학점 부족분을 보충 과목으로 채워 items에 더합니다."""
+        chosen = {curriculum_key(item.name) for item in items}
+        by_class = {}
+        for item in items:
+            by_class[item.classification] = by_class.get(item.classification, 0) + item.credits
+
+        def take(classification, deficit, reason):
+            """부족한 학점만큼 과목을 더하고, 채우지 못한 학점을 반환합니다."""
+            for section in self.filler_candidates(classification):
+                if deficit <= 0:
+                    break
+                if curriculum_key(section['course_name']) in chosen:
+                    continue
+                item = self.make_item(section, reason)
+                items.append(item)
+                chosen.add(curriculum_key(item.name))
+                by_class[item.classification] = by_class.get(item.classification, 0) + item.credits
+                deficit -= item.credits
+            return deficit
+
+        def report(reason, deficit):
+            if deficit > 0:
+                self.unplanned.append(f"{reason}: 개설 과목이 부족해 {deficit:g}학점을 계획하지 못했습니다.")
+
+        for classification, deficit in self.class_deficits.items():
+            reason = f"{classification} 학점 보충"
+            report(reason, take(classification, deficit - by_class.get(classification, 0), reason))
+        for name, classifications, deficit in self.credit_sum_rules:
+            reason = f"{name} 보충"
+            remaining = deficit - sum(by_class.get(c, 0) for c in classifications)
+            for classification in classifications:
+                if remaining <= 0:
+                    break
+                remaining = take(classification, remaining, reason)
+            report(reason, remaining)
+        remaining = self.total_missing - sum(item.credits for item in items)
+        if remaining > 0:
+            report("졸업 학점 보충", take(None, remaining, "졸업 학점 보충"))
+        return items
+
+    # --- 탐색 ---
+    def evaluate(self, chosen_names):
+        """선택 과목 조합 하나로 보충 과목을 채우고 학기 배정까지 한 결과 (조합별로 한 번만 계산)."""
+        key = frozenset(chosen_names)
+        if key not in self._schedules:
+            unplanned_before = len(self.unplanned)
+            items = list(self.fixed.values()) + [chosen_names[name] for name in chosen_names
+                                                 if name not in self.fixed]
+            items = self.fill_credits(items)
+            min_terms = 1 + max((self.earliest_term(item.section) for item in items), default=-1)
+            assignment, nodes = schedule_items(items, self.start_term, self.max_credits, max(1, min_terms))
+            self.nodes += nodes
+            unplanned = self.unplanned[unplanned_before:]
+            del self.unplanned[unplanned_before:]
+            self._schedules[key] = (assignment, items, unplanned)
+        return self._schedules[key]
+
+    def solve(self):
+        """택1/영역 선택을 분기한정으로 고르고, (학기 수, 총 학점)이 가장 작은 계획을 반환합니다."""
+        best = {'score': (MAX_PLAN_SEMESTERS + 1, math.inf), 'result': None}
+        visited = set()
+        fixed_by_class = {}
+        for item in self.fixed.values():
+            fixed_by_class[item.classification] = fixed_by_class.get(item.classification, 0) + item.credits
+        fixed_total = sum(item.credits for item in self.fixed.values())
+        fixed_earliest = max((self.earliest_term(item.section) for item in self.fixed.values()), default=0)
+
+        def search(index, chosen, by_class, total, skips, earliest):
+            state = (index, frozenset(chosen), skips)
+            if state in visited:
+                return
+            visited.add(state)
+            # 하한: 지금까지 고른 과목 + 남은 보충 학점, 가장 늦게 열리는 고른 과목의 학기
+            credits_lower = total + self.credit_need(by_class, total)
+            terms_lower = max(math.ceil(credits_lower / self.max_credits) if self.max_credits else 1, earliest + 1)
+            if (terms_lower, credits_lower) >= best['score']:
+                return
+            if index == len(self.groups):
+                assignment, items, unplanned = self.evaluate(chosen)
+                if assignment is None:
+                    return
+                score = (1 + max((t for t, _ in assignment), default=-1), sum(item.credits for item in items))
+                if score < best['score']:
+                    best['score'] = score
+                    best['result'] = (assignment, items, unplanned, dict(chosen))
+                return
+            reason, options, skip_slot = self.groups[index]
+            satisfied = [name for name in options if name in chosen or name in self.fixed]
+            if satisfied:
+                # 이미 고른 과목이 이 요건도 채움 (한 과목으로 여러 요건 충족)
+                target = chosen.get(satisfied[0]) or self.fixed[satisfied[0]]
+                if reason not in target.reasons:
+                    target.reasons.append(reason)
+                search(index + 1, chosen, by_class, total, skips, earliest)
+                return
+            for name in options:
+                section = self.section_for(name)
+                item = self.make_item(section, reason)
+                next_by_class = dict(by_class)
+                next_by_class[item.classification] = next_by_class.get(item.classification, 0) + item.credits
+                search(index + 1, {**chosen, name: item}, next_by_class, total + item.credits, skips,
+                       max(earliest, self.earliest_term(section)))
+            if skip_slot is not None and skips[skip_slot] > 0:
+                search(index + 1, chosen, by_class, total,
+                       skips[:skip_slot] + (skips[skip_slot] - 1,) + skips[skip_slot + 1:], earliest)
+
+        search(0, {}, fixed_by_class, fixed_total, tuple(self.skip_budget), fixed_earliest)
+        return best['result']
+
+
+def plan_courses(student_info, analysis, snapshot=None, catalog=None, start_term=None,
+                 max_credits=MAX_CREDITS_PER_SEMESTER):
+    """졸업까지의 학기별 수강 계획을 만듭니다.
+
+    반환: {'start_term', 'semesters': [{'term', 'credits', 'courses': [분반 dict + 'reason']}],
+           'num_semesters'(시작 학기부터 마지막 학기까지, 빈 학기 포함), 'total_credits', 'unplanned',
+           'elapsed_ms', 'search_nodes'} 또는 {'error': ...}
+    """
+    if "error" in analysis:
+        return {"error": analysis["error"]}
+    started = time.perf_counter()
+    compiled = get_requirements_for_student(student_info)
+    if compiled is None:
+        return {"error": f"'{student_info['department_major']}'의 졸업 요건 정보가 정의되지 않았습니다."}
+    if snapshot is None:
+        snapshot = get_academic_snapshot(student_info['student_id'])
+    if catalog is None:
+        catalog = get_course_catalog()
+    if start_term is None:
+        start_term = default_start_term(student_info['student_id'])
+
+    planner = CoursePlanner(student_info, analysis, snapshot, catalog, compiled, start_term, max_credits,
+                            get_curriculum_placement())
+    result = planner.solve()
+    plan = {'start_term': term_label(start_term), 'semesters': [], 'num_semesters': 0, 'total_credits': 0,
+            'unplanned': list(planner.unplanned), 'search_nodes': planner.nodes}
+    if result is None:
+        plan['error'] = f"학기당 {max_credits}학점으로 {MAX_PLAN_SEMESTERS}학기 안에 끝나는 계획을 찾지 못했습니다."
+    else:
+        assignment, items, unplanned, _ = result
+        plan['unplanned'].extend(unplanned)
+        semesters = {}
+        for t, item in sorted(assignment, key=lambda pair: (pair[0], catalog.position[pair[1].section['lecture_number']])):
+            semesters.setdefault(t, []).append(dict(item.section, reason=", ".join(item.reasons)))
+        for t in sorted(semesters):
+            courses = semesters[t]
+            plan['semesters'].append({'term': term_label(term_at(start_term, t)),
+                                      'credits': sum(c.get('credits') or 0 for c in courses), 'courses': courses})
+        plan['num_semesters'] = 1 + max((t for t, _ in assignment), default=-1)
+        plan['total_credits'] = sum(item.credits for item in items)
+    plan['elapsed_ms'] = (time.perf_counter() - started) * 1000
+    return plan
+
+def format_plan_for_report(plan):
+    """학기별 계획을 LLM 보고서용 텍스트로 변환합니다."""
+    if plan.get('error') and not plan.get('semesters'):
+        return f"\n--- 졸업까지의 학기별 수강 계획 ---\n{plan['error']}\n"
+    report = f"\n--- 졸업까지의 학기별 수강 계획 ({plan['start_term']}학기부터, {plan['num_semesters']}학기) ---\n"
+    if not plan['semesters']:
+        report += "추가로 들어야 할 과목이 없습니다.\n"
+    for semester in plan['semesters']:
+        report += f"\n**[{semester['term']}학기, {semester['credits']:g}학점]**\n"
+        for course in semester['courses']:
+            report += f"- {course['course_name']} ({course.get('credits') or 0:g}학점, {course['reason']})\n"
+    for note in plan['unplanned']:
+        report += f"- ⚠️ {note}\n"
+    return report
@@ -1,5 +1,9 @@
 # 파일명: db_utils.py (최종 수정본)
 
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
 
 # --- DB 설정 ---
@@ -11,8 +15,193 @@ DB_CONFIG = {
     'port': 3306
 }
 
+# --- 커넥션 풀 설정 ---
+POOL_SIZE = 5                  # 프로세스 전체에서 공유하는 최대 커넥션 수
+POOL_ACQUIRE_TIMEOUT = 10      # 커넥션 대여 대기 최대 시간(초)
+POOL_HEALTH_CHECK_IDLE = 30    # 이 시간(초) 이상 쉬었던 커넥션은 대여 전에 ping으로 점검
+
+
+class ConnectionPool:
+    """mysql.connector 커넥션을 재사용하는 프로세스 전역 커넥션 풀."""
+
+    def __init__(self, db_config, size=POOL_SIZE, acquire_timeout=POOL_ACQUIRE_TIMEOUT,
+                 health_check_idle=POOL_HEALTH_CHECK_IDLE):
+        self.db_config = db_config
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_idle = health_check_idle
+        self._idle = []                  # (conn, 마지막 반납 시각) 스택. 가장 최근 반납한 것부터 재사용
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)   # 반납/폐기 시 대기자에게 알림
+        self._created = 0
+        self._checked_out = 0
+        self._stats = {
+            'acquires': 0, 'connects': 0, 'health_checks': 0, 'discarded': 0,
+            'timeouts': 0, 'total_wait': 0.0, 'max_wait': 0.0,
+        }
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.db_config)
+        with self._lock:
+            self._stats['connects'] += 1
+        return conn
+
+    def _is_healthy(self, conn, idle_since):
+        """오래 쉬었던 커넥션만 ping 하여 끊긴 커넥션을 걸러냅니다."""
+        if time.monotonic() - idle_since < self.health_check_idle:
+            return True
+        try:
+            conn.ping(reconnect=True, attempts=1, delay=0)
+            with self._lock:
+                self._stats['health_checks'] += 1
+            return conn.is_connected()
+        except mysql.connector.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+        with self._available:
+            self._created -= 1
+            self._stats['discarded'] += 1
+            self._available.notify()
+
+    def _take_idle(self, deadline):
+        """대기 중인 커넥션을 꺼냅니다. 새로 만들 자리가 있으면 예약하고 None을 반환합니다.
+        둘 다 없으면 반납/폐기 알림을 기다립니다 (폐기로 자리가 나도 깨어나 새로 만듦)."""
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise mysql.connector.errors.PoolError(
+                        f"커넥션 풀이 가득 찼습니다 (size={self.size}, {self.acquire_timeout}초 대기 초과)")
+                self._available.wait(remaining)
+
+    def acquire(self):
+        """풀에서 커넥션을 빌립니다. 여유가 없으면 반납될 때까지 대기합니다."""
+        start = time.monotonic()
+        deadline = start + self.acquire_timeout
+        while True:
+            idle = self._take_idle(deadline)
+            if idle is None:
+                try:
+                    conn = self._connect()
+                except mysql.connector.Error:
+                    with self._available:
+                        self._created -= 1
+                        self._available.notify()
+                    raise
+                break
+            conn, idle_since = idle
+            if self._is_healthy(conn, idle_since):
+                break
+            self._discard(conn)
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._checked_out += 1
+            self._stats['acquires'] += 1
+            self._stats['total_wait'] += waited
+            self._stats['max_wait'] = max(self._stats['max_wait'], waited)
+        return conn
+
+    def release(self, conn):
+        """커넥션을 풀에 반납합니다. 끊긴 커넥션은 폐기합니다."""
+        with self._lock:
+            self._checked_out -= 1
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            healthy = conn.is_connected()
+        except mysql.connector.Error:
+            healthy = False
+        if healthy:
+            with self._available:
+                self._idle.append((conn, time.monotonic()))
+                self._available.notify()
+        else:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """`with pool.connection() as conn:` 형태로 커넥션을 빌리고 자동 반납합니다."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def metrics(self):
+        """풀 상태 지표(대여 중 커넥션 수, 평균/최대 대기 시간 등)를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['created'] = self._created
+            stats['checked_out'] = self._checked_out
+            stats['idle'] = len(self._idle)
+        stats['avg_wait'] = stats['total_wait'] / stats['acquires'] if stats['acquires'] else 0.0
+        return stats
+
+    def close_all(self):
+        """대기 중인 커넥션을 모두 닫습니다 (대여 중인 커넥션은 반납 시 정리)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_connection_pool():
+    """프로세스 전역 커넥션 풀을 (최초 호출 시 생성하여) 반환합니다."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, size=POOL_SIZE)
+    return _pool
+
+def configure_connection_pool(size=POOL_SIZE, acquire_timeout=POOL_ACQUIRE_TIMEOUT,
+                              health_check_idle=POOL_HEALTH_CHECK_IDLE):
+    """커넥션 풀 크기 등을 변경합니다. 기존 풀의 대기 커넥션은 닫습니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool = ConnectionPool(DB_CONFIG, size=size, acquire_timeout=acquire_timeout,
+                               health_check_idle=health_check_idle)
+    return _pool
+
+def get_pool_metrics():
+    """전역 커넥션 풀의 지표를 반환합니다."""
+    return get_connection_pool().metrics()
+
+@contextmanager
+def pooled_connection():
+    """풀에서 커넥션을 빌려주는 컨텍스트 매니저. 연결 실패 시 None을 돌려줍니다."""
+    pool = get_connection_pool()
+    try:
+        conn = pool.acquire()
+    except mysql.connector.Error as err:
+        print(f"DB 연결 오류: {err}")
+        yield None
+        return
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
 def get_db_connection():
-    """DB 커넥션을 생성하고 반환합니다."""
+    """DB 커넥션을 생성하고 반환합니다 (풀을 거치지 않는 단독 커넥션)."""
     try:
         return mysql.connector.connect(**DB_CONFIG)
     except mysql.connector.Error as err:
@@ -22,61 +211,124 @@ def get_db_connection():
 # ★★★ 원래의 간단한 인증 함수만 사용 ★★★
 def authenticate_student(student_id, student_name):
     """학생 ID와 이름으로 학생 정보를 조회하여 인증합니다."""
-    conn = get_db_connection()
-    if not conn: return None
-    
-    try:
+    with pooled_connection() as conn:
+        if not conn: return None
         cursor = conn.cursor(dictionary=True)
-        query = "SELECT * FROM students WHERE student_id = %s AND student_name = %s"
-        cursor.execute(query, (student_id, student_name))
-        student_info = cursor.fetchone()
-        return student_info
-    finally:
-        if conn and conn.is_connected():
+        try:
+            query = "SELECT * FROM students WHERE student_id = %s AND student_name = %s"
+            cursor.execute(query, (student_id, student_name))
+            student_info = cursor.fetchone()
+            return student_info
+        finally:
             cursor.close()
-            conn.close()
 
 def get_student_enrollments(student_id):
-    """특정 학생의 전체 수강 내역을 조회합니다 (P/F 포함, F/W 제외)."""
-    conn = get_db_connection()
-    if not conn: return []
-        
-    try:
+    """특정 학생의 전체 수강 내역을 조회합니다 (P/F 포함, F/W 제외).
+
+    연결/조회에 실패하면 None을 반환합니다 (수강 내역이 없는 학생의 []와 구분).
+    """
+    with pooled_connection() as conn:
+        if not conn: return None
         cursor = conn.cursor(dictionary=True)
-        query = "SELECT * FROM enrollments WHERE student_id = %s AND grade NOT IN ('F', 'W', 'NP')"
-        cursor.execute(query, (student_id,))
-        enrollments = cursor.fetchall()
-        return enrollments
-    finally:
-        if conn and conn.is_connected():
+        try:
+            query = "SELECT * FROM enrollments WHERE student_id = %s AND grade NOT IN ('F', 'W', 'NP')"
+            cursor.execute(query, (student_id,))
+            enrollments = cursor.fetchall()
+            return enrollments
+        except mysql.connector.Error as err:
+            print(f"수강 내역 조회 오류: {err}")
+            return None
+        finally:
             cursor.close()
-            conn.close()
 
-def get_available_courses(taken_course_names, target_departments=None):
-    """수강 가능한 과목 목록을 조회합니다."""
-    conn = get_db_connection()
-    if not conn: return []
+# 적재 스크립트(1_parse_pdf_to_db.py)가 나중에 추가한 courses 컬럼. 아직 적재를 다시 돌리지 않은 DB에는 없을 수 있음
+OPTIONAL_COURSE_COLUMNS = ('is_listed', 'lecture_time', 'time_mask')
 
-    try:
+def _existing_course_columns(cursor):
+    """courses 테이블에 있는 선택 컬럼들을 확인합니다."""
+    cursor.execute(
+        "SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'courses'",
+        (DB_CONFIG['database'],))
+    return {row['COLUMN_NAME'] for row in cursor.fetchall()} & set(OPTIONAL_COURSE_COLUMNS)
+
+def get_open_courses():
+    """폐강되지 않고 최신 PDF에 있는 전체 개설 과목을 조회합니다 (course_catalog의 메모리 색인용).
+
+    적재 스크립트가 추가하는 컬럼이 아직 없는 DB에서는 해당 조건/컬럼 없이 조회합니다
+    (is_listed가 없으면 전체 과목, 강의 시간이 없으면 NULL).
+    연결/조회에 실패하면 None을 반환합니다 (개설 과목이 없는 []와 구분).
+    """
+    with pooled_connection() as conn:
+        if not conn: return None
         cursor = conn.cursor(dictionary=True)
-        
-        base_query = "SELECT course_name, course_classification, credits, lecture_number, department FROM courses WHERE is_폐강 = FALSE"
-        params = []
-
-        if target_departments:
-            dept_placeholders = ','.join(['%s'] * len(target_departments))
-            base_query += f" AND department IN ({dept_placeholders})"
-            params.extend(target_departments)
-
-        if taken_course_names:
-            taken_placeholders = ','.join(['%s'] * len(taken_course_names))
-            base_query += f" AND course_name NOT IN ({taken_placeholders})"
-            params.extend(list(taken_course_names))
-            
-        cursor.execute(base_query, tuple(params))
-        courses = cursor.fetchall()
-        return courses
-    finally:
-        if conn and conn.is_connected():
+        try:
+            columns = _existing_course_columns(cursor)
+            time_columns = ", ".join(column if column in columns else f"NULL AS {column}"
+                                     for column in ('lecture_time', 'time_mask'))
+            listed = " AND is_listed = TRUE" if 'is_listed' in columns else ""
+            query = ("SELECT course_name, course_classification, credits, lecture_number, department, "
+                     f"{time_columns} FROM courses WHERE is_폐강 = FALSE{listed} ORDER BY id")
+            cursor.execute(query)
+            return cursor.fetchall()
+        except mysql.connector.Error as err:
+            print(f"개설 과목 조회 오류: {err}")
+            return None
+        finally:
             cursor.close()
-            conn.close()
\ No newline at end of file
+
+def _student_filter(department=None, cohort=None, alias=''):
+    """학과/입학연도(학번 앞 4자리) 조건을 WHERE 절과 파라미터로 만듭니다."""
+    conditions, params = [], []
+    if department:
+        conditions.append(f"{alias}department_major = %s")
+        params.append(department)
+    if cohort:
+        conditions.append(f"{alias}student_id LIKE %s")
+        params.append(f"{cohort}%")
+    return conditions, params
+
+def get_students(department=None, cohort=None):
+    """일괄 졸업 심사용 학생 목록을 학번 순으로 조회합니다."""
+    with pooled_connection() as conn:
+        if not conn: return []
+        cursor = conn.cursor(dictionary=True)
+        try:
+            conditions, params = _student_filter(department, cohort)
+            query = "SELECT student_id, student_name, department_major FROM students"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            cursor.execute(query + " ORDER BY student_id", params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+def iter_all_enrollments(department=None, cohort=None, fetch_size=1000):
+    """대상 학생 전체의 수강 내역을 학번 순 한 번의 쿼리로 읽어 한 행씩 내보냅니다 (F/W/NP 제외).
+
+    결과를 한꺼번에 메모리에 올리지 않도록 fetch_size 행씩 가져옵니다.
+    끝까지 읽기 전에 멈추면(소비하는 쪽 실패 등) 읽지 않은 결과가 남은 커넥션을 닫아 풀에서 폐기되게 합니다.
+    """
+    with pooled_connection() as conn:
+        if not conn: return
+        cursor = conn.cursor(dictionary=True)
+        finished = False
+        try:
+            conditions, params = _student_filter(department, cohort, alias='s.')
+            conditions.insert(0, "e.grade NOT IN ('F', 'W', 'NP')")
+            query = ("SELECT e.student_id, e.course_name, e.credits, e.grade, e.course_classification "
+                     "FROM enrollments e JOIN students s ON s.student_id = e.student_id "
+                     "WHERE " + " AND ".join(conditions) + " ORDER BY e.student_id")
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield from rows
+            finished = True
+        finally:
+            try:
+                if not finished:
+                    conn.close()   # 반납 시 is_connected()가 False라 풀에서 폐기됨
+                cursor.close()
+            except mysql.connector.Error:
+                pass
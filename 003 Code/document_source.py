@@ -0,0 +1,90 @@
+# 파일명: document_source.py
+# RAG 코퍼스 폴더(rag_corpus/)의 문서를 파일 단위로 하나씩 읽어 주는 모듈
+# - 지원 형식: .md, .txt, .pdf
+# - 파일별 mtime/크기/내용 해시를 manifest에 남겨, 바뀐 파일만 다시 읽고 분할하도록 함
+
+import hashlib
+import os
+import PyPDF2
+
+# --- 설정 ---
+CORPUS_DIR = "rag_corpus"
+SUPPORTED_EXTENSIONS = ('.md', '.txt', '.pdf')
+
+
+class SourceDocument:
+    """코퍼스 파일 하나의 상태. 바뀌지 않은 파일은 text를 읽지 않습니다(None)."""
+
+    def __init__(self, name, mtime_ns, size, content_hash=None, text=None, changed=True):
+        self.name = name                  # 코퍼스 폴더 기준 상대 경로 (manifest 키)
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.content_hash = content_hash
+        self.text = text
+        self.changed = changed
+
+    def to_manifest(self, chunk_ids):
+        """manifest의 files 항목으로 저장할 값"""
+        return {'mtime_ns': self.mtime_ns, 'size': self.size,
+                'hash': self.content_hash, 'chunk_ids': sorted(chunk_ids)}
+
+
+def read_document_text(path):
+    """파일 형식에 맞게 본문 텍스트를 읽습니다. PDF는 페이지별 텍스트를 빈 줄로 이어 붙입니다."""
+    if path.lower().endswith('.pdf'):
+        with open(path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            return "\n\n".join((page.extract_text() or "") for page in reader.pages)
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def text_content_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def scan_corpus(corpus_dir=CORPUS_DIR):
+    """코퍼스 폴더의 지원 파일을 (상대 경로, 절대 경로) 목록으로 반환합니다. 이름순 정렬."""
+    found = []
+    for root, _, files in os.walk(corpus_dir):
+        for file_name in files:
+            if file_name.lower().endswith(SUPPORTED_EXTENSIONS):
+                path = os.path.join(root, file_name)
+                found.append((os.path.relpath(path, corpus_dir).replace(os.sep, '/'), path))
+    return sorted(found)
+
+
+class DocumentSource:
+    """코퍼스 폴더를 한 파일씩 읽어 SourceDocument로 내보냅니다.
+
+    previous_files(이전 manifest의 files)와 mtime/크기가 같으면 파일을 열지 않고,
+    달라졌더라도 내용 해시가 같으면 변경 없음으로 처리합니다.
+    """
+
+    def __init__(self, corpus_dir=CORPUS_DIR, previous_files=None):
+        self.corpus_dir = corpus_dir
+        self.previous_files = previous_files or {}
+
+    def iter_documents(self):
+        for name, path in scan_corpus(self.corpus_dir):
+            stat = os.stat(path)
+            previous = self.previous_files.get(name)
+            if previous and previous.get('mtime_ns') == stat.st_mtime_ns and previous.get('size') == stat.st_size:
+                yield SourceDocument(name, stat.st_mtime_ns, stat.st_size, previous.get('hash'), changed=False)
+                continue
+            try:
+                text = read_document_text(path)
+            except Exception as e:
+                print(f"코퍼스 파일을 읽지 못해 건너뜁니다 ({name}): {e}")
+                continue
+            content_hash = text_content_hash(text)
+            if previous and previous.get('hash') == content_hash:
+                # 수정 시각만 바뀐 경우 (다시 저장, 복사 등)
+                yield SourceDocument(name, stat.st_mtime_ns, stat.st_size, content_hash, changed=False)
+                continue
+            yield SourceDocument(name, stat.st_mtime_ns, stat.st_size, content_hash, text=text)
+
+    def iter_texts(self):
+        """변경 여부와 상관없이 모든 문서 본문을 하나씩 읽어 반환합니다 (청킹 비교 등)."""
+        for _, path in scan_corpus(self.corpus_dir):
+            yield read_document_text(path)
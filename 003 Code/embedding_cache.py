@@ -0,0 +1,288 @@
+# 파일명: embedding_cache.py
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+from langchain_community.embeddings import OllamaEmbeddings
+from langchain_core.embeddings import Embeddings
+
+# --- 설정 ---
+EMBEDDING_CACHE_DIR = "embedding_cache"
+DEFAULT_MAX_ENTRIES = 20000   # 모델별 최대 보관 벡터 수 (초과 시 가장 오래 안 쓴 것부터 교체)
+INITIAL_CAPACITY = 256        # 벡터 파일의 처음 크기(행 수). 부족하면 두 배씩 늘림
+FLUSH_BATCH_SIZE = 32         # 질의 임베딩: 디스크에 쓰지 않은 새 벡터가 이만큼 쌓이면 기록
+FLUSH_INTERVAL = 30.0         # 또는 마지막 기록 후 이 시간(초)이 지나면 기록 (문서 임베딩은 CachedEmbeddings.flush)
+KEY_BYTES = 20                # 행마다 함께 저장하는 키(sha1) 길이
+
+def normalize_text(text):
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 정리)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+@contextmanager
+def _file_lock(path):
+    """프로세스 간 배타 잠금 (rag_setup, rag_service, Streamlit 워커가 같은 캐시 폴더를 공유)."""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingCache:
+    """(모델명, 정규화 텍스트 해시) → float32 벡터를 디스크에 보관하는 LRU 캐시.
+
+    모델별 폴더에 행 단위 memmap 파일 세 개를 둡니다: `vectors.f32`(벡터), `keys.bin`(행의 키 sha1),
+    `stamps.bin`(마지막 사용 시각, LRU 교체용). `index.json`에는 차원/용량/사용 행 수/세대 번호만 적으므로
+    기록 비용은 새로 쓴 행 수에만 비례합니다. key → 행 번호는 열 때(그리고 다른 프로세스가 기록해
+    세대 번호가 바뀌었을 때) keys.bin에서 다시 만듭니다.
+    여러 프로세스가 같은 폴더를 쓰므로 행 배정과 기록은 `index.lock` 파일 잠금 안에서 하고,
+    읽을 때는 행에 저장된 키를 확인해 다른 프로세스가 그 행을 교체했으면 미적중으로 처리합니다.
+    """
+
+    def __init__(self, model_name, cache_dir=EMBEDDING_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dir = os.path.join(cache_dir, re.sub(r"[^\w.-]", "_", model_name))
+        self._vectors_path = os.path.join(self.dir, "vectors.f32")
+        self._keys_path = os.path.join(self.dir, "keys.bin")
+        self._stamps_path = os.path.join(self.dir, "stamps.bin")
+        self._header_path = os.path.join(self.dir, "index.json")
+        self._lock_path = os.path.join(self.dir, "index.lock")
+        self._lock = threading.Lock()
+        self._slots = {}              # key -> 행 번호 (마지막으로 읽은 디스크 상태 기준)
+        self._pending = OrderedDict() # 아직 디스크에 쓰지 않은 key -> 벡터(np.float32)
+        self._touched = set()         # 마지막 기록 이후 조회한 키 (기록 때 사용 시각 갱신)
+        self._dim = None
+        self._capacity = 0
+        self._count = 0               # 사용 중인 행 수 (0..count-1)
+        self._generation = None       # 마지막으로 읽은/쓴 index.json 세대 번호
+        self._vectors = self._keys = self._stamps = None
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(self._header_path):
+            with self._lock, _file_lock(self._lock_path):
+                self._sync()
+
+    def _sync(self):
+        """(파일 잠금 안에서) 다른 프로세스가 기록했으면 memmap 크기와 key → 행 번호를 디스크에 맞춥니다."""
+        try:
+            with open(self._header_path, encoding='utf-8') as f:
+                header = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if header['generation'] == self._generation:
+            return
+        self._dim = header['dim']
+        if header['capacity'] != self._capacity:
+            self._map(header['capacity'])
+        self._count = min(header['count'], self._capacity)
+        self._generation = header['generation']
+        raw = self._keys[:self._count].tobytes()
+        empty = bytes(KEY_BYTES)
+        self._slots = {}
+        for slot in range(self._count):
+            key = raw[slot * KEY_BYTES:(slot + 1) * KEY_BYTES]
+            if key != empty:
+                self._slots[key.hex()] = slot
+
+    def _map(self, capacity):
+        """벡터/키/사용 시각 파일을 capacity행 크기로 (필요하면 늘려서) memmap 합니다."""
+        os.makedirs(self.dir, exist_ok=True)
+        files = ((self._vectors_path, self._dim * 4), (self._keys_path, KEY_BYTES), (self._stamps_path, 8))
+        for path, row_bytes in files:
+            with open(path, 'ab') as f:
+                if f.tell() < capacity * row_bytes:
+                    f.truncate(capacity * row_bytes)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._keys.flush()
+            self._stamps.flush()
+        self._capacity = capacity
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self._dim))
+        self._keys = np.memmap(self._keys_path, dtype=np.uint8, mode='r+', shape=(capacity, KEY_BYTES))
+        self._stamps = np.memmap(self._stamps_path, dtype=np.int64, mode='r+', shape=(capacity,))
+
+    def _ensure_capacity(self, rows):
+        """파일들을 최소 rows행이 들어가도록 늘립니다."""
+        if rows <= self._capacity:
+            return
+        new_capacity = max(INITIAL_CAPACITY, self._capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+        self._map(min(new_capacity, self.max_entries))
+
+    def _holds(self, slot, key):
+        return slot < self._capacity and self._keys[slot].tobytes() == bytes.fromhex(key)
+
+    def key_for(self, text, kind):
+        """kind는 'document' / 'query' (모델이 문서와 질의를 다르게 임베딩할 수 있음)."""
+        raw = f"{self.model_name}\0{kind}\0{normalize_text(text)}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            vector = self._pending.get(key)
+            if vector is not None:
+                self.hits += 1
+                return vector.tolist()
+            slot = self._slots.get(key)
+            if slot is not None:
+                # 행에 저장된 키를 벡터 앞뒤로 확인 (다른 프로세스가 교체 중이거나 교체한 행이면 미적중)
+                if self._holds(slot, key):
+                    vector = np.array(self._vectors[slot]).tolist()
+                    if self._holds(slot, key):
+                        self._touched.add(key)
+                        self.hits += 1
+                        return vector
+                del self._slots[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, vector):
+        with self._lock:
+            if self._dim is None:
+                self._dim = len(vector)
+            elif len(vector) != self._dim:
+                raise ValueError(f"임베딩 차원이 캐시와 다릅니다: {len(vector)} != {self._dim}")
+            self._pending[key] = np.asarray(vector, dtype=np.float32)
+
+    def should_flush(self):
+        """새 벡터가 FLUSH_BATCH_SIZE개 쌓였거나 마지막 기록 후 FLUSH_INTERVAL초가 지났는지."""
+        return bool(self._pending) and (len(self._pending) >= FLUSH_BATCH_SIZE
+                                        or time.monotonic() - self._last_flush >= FLUSH_INTERVAL)
+
+    def flush(self):
+        """모아 둔 새 벡터와 사용 시각을 디스크에 기록합니다 (파일 잠금 안에서 최신 상태 기준으로 행 배정)."""
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            os.makedirs(self.dir, exist_ok=True)
+            with _file_lock(self._lock_path):
+                self._sync()
+                now = time.time_ns()
+                for key in self._touched:
+                    slot = self._slots.get(key)
+                    if slot is not None and self._holds(slot, key):
+                        self._stamps[slot] = now
+                new = [(key, vector) for key, vector in self._pending.items() if key not in self._slots]
+                if new:
+                    if self._dim is None:
+                        self._dim = len(new[0][1])
+                    for _, vector in new:
+                        if len(vector) != self._dim:
+                            raise ValueError(f"임베딩 차원이 캐시와 다릅니다: {len(vector)} != {self._dim}")
+                    new = new[-self.max_entries:]
+                    appended = min(len(new), self.max_entries - self._count)
+                    evicted = len(new) - appended
+                    slots = []
+                    if evicted:
+                        # 가장 오래 안 쓴 행부터 교체
+                        stamps = np.asarray(self._stamps[:self._count])
+                        victims = np.argpartition(stamps, evicted - 1)[:evicted] if evicted < self._count \
+                            else np.arange(self._count)
+                        for slot in victims.tolist():
+                            self._slots.pop(self._keys[slot].tobytes().hex(), None)
+                            slots.append(slot)
+                    if appended:
+                        self._ensure_capacity(self._count + appended)
+                        slots.extend(range(self._count, self._count + appended))
+                        self._count += appended
+                    for (key, vector), slot in zip(new, slots):
+                        self._keys[slot] = 0                     # 쓰는 동안에는 어떤 키와도 맞지 않게
+                        self._vectors[slot] = vector
+                        self._keys[slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+                        self._stamps[slot] = now
+                        self._slots[key] = slot
+                if self._vectors is not None:
+                    self._vectors.flush()
+                    self._keys.flush()
+                    self._stamps.flush()
+                if new:
+                    self._generation = (self._generation or 0) + 1
+                    tmp_path = f"{self._header_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump({'dim': self._dim, 'capacity': self._capacity, 'count': self._count,
+                                   'generation': self._generation}, f)
+                    os.replace(tmp_path, self._header_path)
+            self._pending.clear()
+            self._touched.clear()
+            self._last_flush = time.monotonic()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'entries': len(self._slots) + len(self._pending), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 모델을 감싸, 이미 계산한 임베딩은 디스크 캐시에서 돌려주는 Embeddings."""
+
+    def __init__(self, base_embeddings, model_name, cache=None):
+        self.base = base_embeddings
+        self.model_name = model_name
+        self.cache = cache or EmbeddingCache(model_name)
+        atexit.register(self.cache.flush)
+
+    def flush(self):
+        """쌓아 둔 새 임베딩을 디스크 캐시에 기록합니다 (문서 임베딩은 호출한 쪽이 작업이 끝날 때 한 번 호출)."""
+        self.cache.flush()
+
+    def embed_documents(self, texts):
+        results = [None] * len(texts)
+        missing = {}   # key -> 처음 나온 위치 목록 (같은 텍스트는 한 번만 계산)
+        for i, text in enumerate(texts):
+            key = self.cache.key_for(text, 'document')
+            vector = self.cache.get(key)
+            if vector is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                results[i] = vector
+        if missing:
+            keys = list(missing)
+            vectors = self.base.embed_documents([texts[missing[key][0]] for key in keys])
+            for key, vector in zip(keys, vectors):
+                self.cache.put(key, vector)
+                for i in missing[key]:
+                    results[i] = vector
+        return results
+
+    def embed_query(self, text):
+        key = self.cache.key_for(text, 'query')
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.base.embed_query(text)
+            self.cache.put(key, vector)
+            if self.cache.should_flush():
+                self.cache.flush()
+        return vector
+
+
+def get_cached_embeddings(model_name, cache_dir=EMBEDDING_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+    """Ollama 임베딩 모델을 디스크 캐시로 감싸서 반환합니다."""
+    return CachedEmbeddings(OllamaEmbeddings(model=model_name), model_name,
+                            EmbeddingCache(model_name, cache_dir, max_entries))
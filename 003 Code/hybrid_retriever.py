@@ -0,0 +1,115 @@
+# 파일명: hybrid_retriever.py
+
+import time
+
+import faiss
+import numpy as np
+
+from metadata_filter import detect_query_filter
+
+# --- 설정 ---
+RETRIEVER_K = 4           # 최종적으로 프롬프트에 넣을 문서 조각 수
+FETCH_K = 20              # 융합 전에 각 검색기에서 가져올 후보 수
+VECTOR_WEIGHT = 0.5       # 벡터(의미) 검색 가중치
+LEXICAL_WEIGHT = 0.5      # BM25(어휘) 검색 가중치
+RRF_K = 60                # Reciprocal Rank Fusion 상수
+
+
+class HybridRetriever:
+    """FAISS 벡터 검색과 BM25 어휘 검색 결과를 가중 RRF로 합치는 검색기.
+
+    과목코드(AISW310011)나 정확한 과목명처럼 임베딩이 약한 질의를 BM25가 보완합니다.
+    질문에서 '교양'/'전공' 같은 의도가 보이면 해당 메타데이터의 청크만 후보로 두고 검색합니다.
+    """
+
+    def __init__(self, vector_store, lexical_index, embeddings, k=RETRIEVER_K, fetch_k=FETCH_K,
+                 vector_weight=VECTOR_WEIGHT, lexical_weight=LEXICAL_WEIGHT):
+        self.vector_store = vector_store
+        self.lexical_index = lexical_index
+        self.embeddings = embeddings
+        self.k = k
+        self.fetch_k = fetch_k
+        self.vector_weight = vector_weight
+        self.lexical_weight = lexical_weight
+        self.last_timings = {}
+        self.last_filter = None
+        self._scopes = {}    # 필터 이름 -> (FAISS 위치 배열, ID selector, BM25 문서 번호 집합) 또는 None
+
+    def _scope_for(self, query_filter):
+        """필터에 맞는 청크 위치를 한 번만 계산해 둡니다. 맞는 청크가 없으면 None (전체 검색)."""
+        if query_filter.name not in self._scopes:
+            positions, chunk_ids = [], set()
+            for position, chunk_id in self.vector_store.index_to_docstore_id.items():
+                doc = self.vector_store.docstore.search(chunk_id)
+                if not isinstance(doc, str) and query_filter.matches(doc.metadata):
+                    positions.append(position)
+                    chunk_ids.add(chunk_id)
+            scope = None
+            if positions:
+                positions = np.array(positions, dtype=np.int64)
+                allowed = self.lexical_index.doc_numbers(chunk_ids) if self.lexical_index else None
+                scope = (positions, faiss.IDSelectorBatch(positions), allowed)
+            self._scopes[query_filter.name] = scope
+        return self._scopes[query_filter.name]
+
+    def _vector_search(self, query_vector, scope):
+        """벡터 검색 후보 chunk_id 목록. scope가 있으면 FAISS 검색 단계에서 후보를 제한합니다."""
+        if hasattr(self.vector_store, 'search_chunk_ids'):
+            # mmap 형식 인덱스 (mmap_index.MmapVectorStore)
+            return self.vector_store.search_chunk_ids(query_vector, self.fetch_k, scope[0] if scope else None)
+        if scope is None:
+            hits = self.vector_store.similarity_search_with_score_by_vector(query_vector, k=self.fetch_k)
+            return [doc.metadata.get('chunk_id') for doc, _ in hits]
+        scope_positions, selector, _ = scope
+        vector = np.array([query_vector], dtype=np.float32)
+        if getattr(self.vector_store, '_normalize_L2', False):
+            faiss.normalize_L2(vector)
+        _, positions = self.vector_store.index.search(
+            vector, min(self.fetch_k, len(scope_positions)), params=faiss.SearchParameters(sel=selector))
+        return [self.vector_store.index_to_docstore_id[position] for position in positions[0] if position != -1]
+
+    def retrieve(self, query, query_vector=None):
+        """질문에 맞는 문서 조각 k개와 질의 벡터를 반환합니다. 단계별 소요 시간은 last_timings(ms)에 남깁니다."""
+        timings = {}
+        start = time.perf_counter()
+        if query_vector is None:
+            query_vector = self.embeddings.embed_query(query)
+        timings['embed'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        query_filter = detect_query_filter(query)
+        scope = self._scope_for(query_filter) if query_filter else None
+        self.last_filter = query_filter.name if scope else None
+        timings['filter'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vector_hits = self._vector_search(query_vector, scope)
+        timings['vector'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        allowed = scope[2] if scope else None
+        lexical_hits = self.lexical_index.search(query, k=self.fetch_k, allowed=allowed) if self.lexical_index else []
+        timings['lexical'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = {}
+        for rank, chunk_id in enumerate(vector_hits):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + self.vector_weight / (RRF_K + rank + 1)
+        for rank, (chunk_id, _) in enumerate(lexical_hits):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + self.lexical_weight / (RRF_K + rank + 1)
+        results = []
+        for chunk_id in sorted(scores, key=scores.get, reverse=True):
+            doc = self.vector_store.docstore.search(chunk_id)
+            if isinstance(doc, str):   # docstore에 없는 ID
+                continue
+            results.append(doc)
+            if len(results) >= self.k:
+                break
+        timings['fuse'] = time.perf_counter() - start
+
+        self.last_timings = {stage: seconds * 1000 for stage, seconds in timings.items()}
+        return results, query_vector
+
+    def format_timings(self):
+        timings = ", ".join(f"{stage} {ms:.1f}ms" for stage, ms in self.last_timings.items())
+        return f"{timings} (검색 범위: {self.last_filter or '전체'})"
@@ -0,0 +1,51 @@
+# 파일명: lecture_time.py
+# 강의 시간(요일/교시) <-> 비트마스크 변환
+# - 요일 7개 × 교시 PERIODS_PER_DAY개를 정수 하나의 비트로 표현: 비트 번호 = 요일 * PERIODS_PER_DAY + (교시 - 1)
+# - 두 분반이 겹치는지는 (mask_a & mask_b) != 0 한 번으로 판정
+# - DB(courses.time_mask)에는 16진수 문자열로 저장하고, 카탈로그에 올릴 때 정수로 바꿈
+
+import re
+
+DAYS = "월화수목금토일"
+PERIODS_PER_DAY = 16   # 야간 교시까지 포함 (7 × 16 = 112비트)
+
+# "월1,2,3", "화 5-7", "수1~3", "목(2,3)" 형태. 과목명 중간의 글자(예: '수학1')와 섞이지 않도록 앞이 한글/영숫자가 아닐 때만 매칭
+LECTURE_TIME_PATTERN = re.compile(
+    r"(?<![가-힣A-Za-z0-9])(?P<day>[월화수목금토일])\s*[(\[]?\s*"
+    r"(?P<periods>\d{1,2}(?:\s*[-~,]\s*\d{1,2})*)\s*[)\]]?"
+)
+
+
+def _iter_periods(periods_text):
+    """'1,2,5-7' -> 1, 2, 5, 6, 7"""
+    for part in re.split(r'\s*,\s*', periods_text):
+        bounds = re.split(r'\s*[-~]\s*', part)
+        start, end = int(bounds[0]), int(bounds[-1])
+        yield from range(start, end + 1)
+
+def parse_lecture_time(text):
+    """텍스트에 들어 있는 요일/교시를 모두 찾아 비트마스크로 만듭니다. 시간이 없으면 0 (예: 온라인, 시간 미정)."""
+    mask = 0
+    for match in LECTURE_TIME_PATTERN.finditer(text or ""):
+        day = DAYS.index(match.group('day'))
+        for period in _iter_periods(match.group('periods')):
+            if 1 <= period <= PERIODS_PER_DAY:
+                mask |= 1 << (day * PERIODS_PER_DAY + period - 1)
+    return mask
+
+def format_lecture_time(mask):
+    """비트마스크 -> '월1,2,3 수4' (요일 순, 교시 오름차순). 0이면 빈 문자열."""
+    parts = []
+    for day, day_name in enumerate(DAYS):
+        day_bits = (mask >> (day * PERIODS_PER_DAY)) & ((1 << PERIODS_PER_DAY) - 1)
+        if day_bits:
+            periods = [str(p + 1) for p in range(PERIODS_PER_DAY) if day_bits >> p & 1]
+            parts.append(f"{day_name}{','.join(periods)}")
+    return " ".join(parts)
+
+def mask_to_hex(mask):
+    return format(mask, 'x') if mask else ""
+
+def hex_to_mask(value):
+    """DB의 16진수 문자열 -> 정수 마스크 (없으면 0)."""
+    return int(value, 16) if value else 0
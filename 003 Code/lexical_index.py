@@ -0,0 +1,82 @@
+# 파일명: lexical_index.py
+
+import json
+import math
+import os
+import re
+from collections import Counter
+
+LEXICAL_INDEX_FILE = "lexical_index.json"  # FAISS 인덱스 폴더 안에 함께 저장
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+def tokenize(text):
+    """BM25용 토큰화. 영문/숫자는 단어 단위(과목코드 AISW310011 등), 한글은 단어 + 글자 2-gram.
+
+    한글은 조사/띄어쓰기 차이('기계학습이', '기계 학습')가 많아 2-gram으로 부분 일치를 잡습니다.
+    """
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(word)
+        if '가' <= word[0] <= '힣' and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class LexicalIndex:
+    """청크 단위 BM25 역색인."""
+
+    def __init__(self, chunk_ids, doc_lengths, postings):
+        self.chunk_ids = chunk_ids            # 문서 번호 -> chunk_id
+        self.doc_lengths = doc_lengths
+        self.postings = postings              # term -> [[문서 번호, tf], ...]
+        self.avg_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+        n = len(chunk_ids)
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in postings.items()}
+
+    @classmethod
+    def build(cls, chunks_by_id):
+        chunk_ids, doc_lengths, postings = [], [], {}
+        for doc_no, (chunk_id, chunk) in enumerate(chunks_by_id.items()):
+            counts = Counter(tokenize(chunk.page_content))
+            chunk_ids.append(chunk_id)
+            doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append([doc_no, tf])
+        return cls(chunk_ids, doc_lengths, postings)
+
+    def save(self, index_path):
+        with open(os.path.join(index_path, LEXICAL_INDEX_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'chunk_ids': self.chunk_ids, 'doc_lengths': self.doc_lengths,
+                       'postings': self.postings}, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, index_path):
+        """인덱스 폴더의 BM25 색인을 읽습니다. 없으면 None."""
+        try:
+            with open(os.path.join(index_path, LEXICAL_INDEX_FILE), encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return cls(data['chunk_ids'], data['doc_lengths'], data['postings'])
+
+    def doc_numbers(self, chunk_ids):
+        """chunk_id 집합을 search의 allowed로 넘길 문서 번호 집합으로 바꿉니다."""
+        return {doc_no for doc_no, chunk_id in enumerate(self.chunk_ids) if chunk_id in chunk_ids}
+
+    def search(self, query, k=4, allowed=None):
+        """BM25 점수 상위 k개의 (chunk_id, score)를 반환합니다. allowed(문서 번호 집합)가 있으면 그 안에서만."""
+        scores = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_no, tf in self.postings[term]:
+                if allowed is not None and doc_no not in allowed:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_no] / self.avg_length)
+                scores[doc_no] = scores.get(doc_no, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.chunk_ids[doc_no], score) for doc_no, score in top]
@@ -0,0 +1,103 @@
+# 파일명: markdown_chunker.py
+
+import re
+
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+MAX_CHUNK_CHARS = 1200   # 한 섹션이 이보다 길면 문단/리스트 단위로 더 나눔
+CHARS_PER_TOKEN = 2.5    # 토큰 수 어림값 계산용 (한글 위주 텍스트 기준 대략치)
+
+DOCUMENT_TITLE_PATTERN = re.compile(r"^문서\s*\d+\s*:\s*(?P<title>.+)$")
+HEADING_PATTERN = re.compile(r"^(?P<marks>#{1,6})\s+(?P<text>.+)$")
+COURSE_ENTRY_START = re.compile(r"^- \*\*(?P<code>[A-Z]{2,}\d{3,}[A-Z0-9]*)\s")
+YEAR_PATTERN = re.compile(r"(20\d{2}(?:-20\d{2})?)학년도")
+SEMESTER_PATTERN = re.compile(r"([1-4]-[12])\s*학기")
+
+def _find_in(pattern, texts):
+    """texts를 뒤(가장 깊은 제목)부터 찾아 처음 일치하는 값을 반환합니다."""
+    for text in reversed(texts):
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return None
+
+def _split_oversized(body, max_chars):
+    if len(body) <= max_chars:
+        return [body]
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=max_chars, chunk_overlap=0, separators=["\n\n", "\n- ", "\n", " "])
+    return splitter.split_text(body)
+
+def split_structured_document(text, max_chars=MAX_CHUNK_CHARS):
+    """마크다운 구조(#/##/### 제목, '- **코드 과목명' 과목 항목)를 따라 문서를 청크로 나눕니다.
+
+    청크 사이에 겹치는 부분은 없고, 대신 각 청크 첫 줄에 '[제목 > 소제목]' 경로를 붙여
+    검색과 답변에 필요한 맥락을 유지합니다. 메타데이터: document, section, year, semester, course_code
+    """
+    lines = text.strip().splitlines()
+    document = ""
+    if lines:
+        title_match = DOCUMENT_TITLE_PATTERN.match(lines[0])
+        if title_match:
+            document = title_match.group('title').strip()
+            lines = lines[1:]
+
+    chunks = []
+    headings = []      # [(level, 제목), ...]
+    buffer = []
+    course_code = None
+
+    def flush():
+        body = "\n".join(buffer).strip()
+        buffer.clear()
+        if not body:
+            return
+        path = [heading for _, heading in headings]
+        metadata = {'document': document, 'section': " > ".join(path)}
+        year = _find_in(YEAR_PATTERN, [document] + path)
+        semester = _find_in(SEMESTER_PATTERN, path)
+        if year:
+            metadata['year'] = year
+        if semester:
+            metadata['semester'] = semester
+        if course_code:
+            metadata['course_code'] = course_code
+        header = " > ".join(path) or document
+        for piece in _split_oversized(body, max_chars):
+            chunks.append(Document(page_content=f"[{header}]\n{piece}", metadata=dict(metadata)))
+
+    for line in lines:
+        if line.strip() == '---':
+            continue
+        heading_match = HEADING_PATTERN.match(line)
+        if heading_match:
+            flush()
+            course_code = None
+            level = len(heading_match.group('marks'))
+            headings = [h for h in headings if h[0] < level]
+            headings.append((level, heading_match.group('text').replace('**', '').strip()))
+            continue
+        course_match = COURSE_ENTRY_START.match(line)
+        if course_match:
+            flush()
+            course_code = course_match.group('code')
+        elif course_code and line and not line[0].isspace():
+            # 들여쓰기 없는 새 줄이 나오면 과목 항목이 끝난 것
+            flush()
+            course_code = None
+        buffer.append(line)
+    flush()
+    return chunks
+
+def chunk_statistics(chunks):
+    """청크 수, 글자 수, 어림 토큰 수 통계를 반환합니다."""
+    lengths = [len(chunk.page_content) for chunk in chunks]
+    total = sum(lengths)
+    return {
+        'chunks': len(lengths),
+        'total_chars': total,
+        'avg_chars': total / len(lengths) if lengths else 0.0,
+        'max_chars': max(lengths, default=0),
+        'approx_tokens': int(total / CHARS_PER_TOKEN),
+    }
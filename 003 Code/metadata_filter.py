@@ -0,0 +1,82 @@
+# 파일명: metadata_filter.py
+# 청크 메타데이터(문서 종류, 학년도, 학과, 이수구분)와 질문 의도 기반 검색 범위 필터
+
+import re
+
+from markdown_chunker import DOCUMENT_TITLE_PATTERN, YEAR_PATTERN
+
+# 메타데이터 규칙이 바뀌면 올려서 기존 인덱스를 다시 만들게 함 (manifest에 저장)
+CHUNK_METADATA_VERSION = 1
+
+# 문서 제목 키워드 -> 문서 종류 (앞에서부터 먼저 맞는 것 사용)
+DOC_TYPE_RULES = [
+    ('교과목 개요', 'course_overview'),
+    ('교양', 'liberal_arts'),
+    ('교육과정', 'curriculum'),
+]
+LIBERAL_ARTS_CLASSIFICATIONS = ('기초교양', '핵심교양', '일반교양', '공학기초')
+MAJOR_CLASSIFICATIONS = ('기본전공', '심화전공')
+DEPARTMENT_PATTERN = re.compile(r"(\S+학과)")
+
+
+def document_title(text):
+    """문서 첫 줄('문서 N: 제목')에서 제목을 꺼냅니다. 없으면 빈 문자열."""
+    first_line = text.lstrip().split("\n", 1)[0]
+    match = DOCUMENT_TITLE_PATTERN.match(first_line)
+    return match.group('title').strip() if match else ""
+
+
+def chunk_filter_metadata(title, chunk):
+    """검색 필터에 쓰는 메타데이터(doc_type, department, classifications, year)를 만듭니다."""
+    doc_type = next((name for keyword, name in DOC_TYPE_RULES if keyword in title), 'general')
+    metadata = {'doc_type': doc_type}
+    department = DEPARTMENT_PATTERN.search(title)
+    if department:
+        metadata['department'] = department.group(1)
+
+    text = chunk.page_content
+    classifications = [name for name in LIBERAL_ARTS_CLASSIFICATIONS + MAJOR_CLASSIFICATIONS if name in text]
+    if '교양' in text and not any(name in LIBERAL_ARTS_CLASSIFICATIONS for name in classifications):
+        # 학기별 교육과정의 '교양 (필수)' 항목처럼 세부 구분 없이 교양만 적힌 경우
+        classifications.append('교양')
+    metadata['classifications'] = classifications
+
+    if 'year' not in chunk.metadata:
+        year = YEAR_PATTERN.search(title)
+        if year:
+            metadata['year'] = year.group(1)
+    return metadata
+
+
+class MetadataFilter:
+    """질문 의도로 정한 검색 범위. doc_types에 속하거나 classifications가 하나라도 겹치는 청크만 통과."""
+
+    def __init__(self, name, doc_types=(), classifications=()):
+        self.name = name
+        self.doc_types = frozenset(doc_types)
+        self.classifications = frozenset(classifications)
+
+    def matches(self, metadata):
+        if metadata.get('doc_type') in self.doc_types:
+            return True
+        return not self.classifications.isdisjoint(metadata.get('classifications', ()))
+
+
+def detect_query_filter(query):
+    """질문 키워드로 검색 범위를 정합니다. 의도가 없거나 교양/전공이 섞이면 None (전체 검색).
+
+    - '핵심교양', '심화전공'처럼 이수구분을 직접 말하면 그 구분만
+    - '교양'만 있으면 교양 문서 + 교양 항목, '전공'만 있으면 교과목 개요 + 전공 항목
+    """
+    compact = query.replace(" ", "")
+    named = [name for name in LIBERAL_ARTS_CLASSIFICATIONS + MAJOR_CLASSIFICATIONS if name in compact]
+    if named:
+        return MetadataFilter("/".join(named), classifications=named)
+    wants_liberal_arts = '교양' in compact
+    wants_major = '전공' in compact
+    if wants_liberal_arts and not wants_major:
+        return MetadataFilter('교양', doc_types=['liberal_arts'],
+                              classifications=LIBERAL_ARTS_CLASSIFICATIONS + ('교양',))
+    if wants_major and not wants_liberal_arts:
+        return MetadataFilter('전공', doc_types=['course_overview'], classifications=MAJOR_CLASSIFICATIONS)
+    return None
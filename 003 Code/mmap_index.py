@@ -0,0 +1,164 @@
+# 파일명: mmap_index.py
+# 메모리 매핑(mmap)으로 여는 RAG 인덱스 형식
+# - 벡터: vectors.npy (float32/float16) 또는 IVF-PQ FAISS 파일 → 필요한 페이지만 읽고, 여러 프로세스가 OS 페이지 캐시를 공유
+# - docstore: SQLite 파일 (pickle 전체를 메모리에 풀지 않고, 필요한 청크만 조회)
+# FAISS.load_local은 프로세스마다 인덱스와 docstore 전체를 메모리에 올리므로, Streamlit 워커가 여러 개이거나
+# 메모리가 작은 서버에서는 이 형식을 사용합니다 (rag_service.py의 INDEX_FORMAT = "mmap").
+
+import json
+import math
+import os
+import sqlite3
+import threading
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+MMAP_META_FILE = "mmap_meta.json"
+MMAP_VECTORS_FILE = "vectors.npy"
+MMAP_IVFPQ_FILE = "vectors.ivfpq.faiss"
+MMAP_DOCSTORE_FILE = "docstore.sqlite"
+MMAP_FORMATS = ("float32", "float16", "ivfpq")
+DEFAULT_MMAP_FORMAT = "float16"   # 임베딩 검색 순위에는 float16 정밀도로도 충분, 파일 크기는 절반
+IVFPQ_MIN_VECTORS = 10000         # IVF/PQ 학습에 필요한 최소 벡터 수 (적으면 float16으로 저장)
+IVFPQ_NPROBE = 8                  # 검색 시 살펴볼 IVF 클러스터 수
+SEARCH_BLOCK_ROWS = 4096          # 전수 검색 때 한 번에 float32로 올려 거리를 계산하는 행 수 (메모리 상한)
+
+
+def _ivfpq_factory(dim, count):
+    nlist = max(1, int(math.sqrt(count)))
+    subquantizers = next(m for m in (dim // 8, dim // 4, dim // 2, dim, 1) if m and dim % m == 0)
+    return f"IVF{nlist},PQ{subquantizers}"
+
+
+def export_mmap_index(vector_store, index_path, vector_format=DEFAULT_MMAP_FORMAT):
+    """langchain FAISS 벡터 저장소를 mmap 형식(벡터 파일 + SQLite docstore)으로 index_path에 씁니다.
+
+    FAISS 위치 번호(position)를 그대로 유지하므로 index_to_docstore_id와 같은 번호 체계를 씁니다.
+    """
+    if vector_format not in MMAP_FORMATS:
+        raise ValueError(f"알 수 없는 mmap 형식: {vector_format}")
+    count = vector_store.index.ntotal
+    vectors = vector_store.index.reconstruct_n(0, count) if count else np.zeros((0, vector_store.index.d), np.float32)
+    if vector_format == "ivfpq" and count < IVFPQ_MIN_VECTORS:
+        print(f"벡터가 {count}개라 IVF-PQ 학습에 부족합니다. float16 형식으로 저장합니다.")
+        vector_format = "float16"
+
+    if vector_format == "ivfpq":
+        index = faiss.index_factory(vectors.shape[1], _ivfpq_factory(vectors.shape[1], count))
+        index.train(vectors)
+        index.add(vectors)
+        faiss.write_index(index, os.path.join(index_path, MMAP_IVFPQ_FILE))
+    else:
+        np.save(os.path.join(index_path, MMAP_VECTORS_FILE), vectors.astype(vector_format))
+
+    docstore_path = os.path.join(index_path, MMAP_DOCSTORE_FILE)
+    if os.path.exists(docstore_path):
+        os.remove(docstore_path)
+    conn = sqlite3.connect(docstore_path)
+    try:
+        conn.execute("CREATE TABLE chunks (position INTEGER PRIMARY KEY, chunk_id TEXT NOT NULL UNIQUE, "
+                     "page_content TEXT NOT NULL, metadata TEXT NOT NULL)")
+        rows = []
+        for position, chunk_id in sorted(vector_store.index_to_docstore_id.items()):
+            doc = vector_store.docstore.search(chunk_id)
+            rows.append((position, chunk_id, doc.page_content, json.dumps(doc.metadata, ensure_ascii=False)))
+        conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+    with open(os.path.join(index_path, MMAP_META_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'format': vector_format, 'count': count, 'dim': int(vectors.shape[1]),
+                   'normalize_L2': bool(getattr(vector_store, '_normalize_L2', False))}, f, indent=2)
+    return vector_format
+
+
+class SqliteDocstore:
+    """InMemoryDocstore처럼 search(chunk_id)로 Document를 돌려주는 읽기 전용 SQLite docstore."""
+
+    def __init__(self, path):
+        # 읽기 전용으로 열고, Streamlit 등 여러 스레드에서 함께 쓰므로 잠금으로 보호
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def search(self, chunk_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_content, metadata FROM chunks WHERE chunk_id = ?", (chunk_id,)).fetchone()
+        if row is None:
+            return f"ID {chunk_id} not found."
+        return Document(page_content=row[0], metadata=json.loads(row[1]))
+
+    def position_map(self):
+        """FAISS 위치 번호 -> chunk_id (ID만 읽으므로 본문은 메모리에 올리지 않음)"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT position, chunk_id FROM chunks"))
+
+    def close(self):
+        self._conn.close()
+
+
+class MmapVectorStore:
+    """mmap 형식 인덱스를 읽어 HybridRetriever가 쓰는 만큼의 FAISS 인터페이스를 제공합니다."""
+
+    def __init__(self, index_path, meta):
+        self.format = meta['format']
+        self._normalize_L2 = meta.get('normalize_L2', False)
+        self.docstore = SqliteDocstore(os.path.join(index_path, MMAP_DOCSTORE_FILE))
+        self.index_to_docstore_id = self.docstore.position_map()
+        if self.format == "ivfpq":
+            self.index = faiss.read_index(os.path.join(index_path, MMAP_IVFPQ_FILE),
+                                          faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            self.vectors = None
+        else:
+            self.index = None
+            self.vectors = np.load(os.path.join(index_path, MMAP_VECTORS_FILE), mmap_mode='r')
+
+    @classmethod
+    def load(cls, index_path):
+        """인덱스 폴더에 mmap 형식 파일이 있으면 읽고, 없으면 None."""
+        try:
+            with open(os.path.join(index_path, MMAP_META_FILE), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return cls(index_path, meta)
+
+    def search_chunk_ids(self, query_vector, k, positions=None):
+        """질의 벡터와 가까운(L2) 청크 ID k개. positions(np.int64 배열)가 있으면 그 위치들 중에서만 찾습니다."""
+        query = np.array([query_vector], dtype=np.float32)
+        if self._normalize_L2:
+            faiss.normalize_L2(query)
+        if self.index is not None:
+            params = faiss.SearchParametersIVF(nprobe=IVFPQ_NPROBE)
+            selector = faiss.IDSelectorBatch(positions) if positions is not None else None
+            if selector is not None:
+                params.sel = selector
+            _, found = self.index.search(query, k, params=params)
+            return [self.index_to_docstore_id[int(p)] for p in found[0] if p != -1]
+
+        # 전수 검색: SEARCH_BLOCK_ROWS행씩만 float32로 올려 거리를 계산하고 상위 k개만 유지
+        # (전체를 한 번에 변환하면 mmap/float16으로 줄인 메모리만큼 다시 복사본이 생김)
+        total = len(self.vectors) if positions is None else len(positions)
+        best_positions = np.empty(0, dtype=np.int64)
+        best_distances = np.empty(0, dtype=np.float32)
+        for start in range(0, total, SEARCH_BLOCK_ROWS):
+            if positions is None:
+                block_positions = np.arange(start, min(start + SEARCH_BLOCK_ROWS, total), dtype=np.int64)
+                block = np.asarray(self.vectors[start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+            else:
+                block_positions = np.asarray(positions[start:start + SEARCH_BLOCK_ROWS], dtype=np.int64)
+                block = np.asarray(self.vectors[block_positions], dtype=np.float32)
+            distances = ((block - query) ** 2).sum(axis=1)
+            best_positions = np.concatenate([best_positions, block_positions])
+            best_distances = np.concatenate([best_distances, distances])
+            if len(best_distances) > k:
+                keep = np.argpartition(best_distances, k - 1)[:k]
+                best_positions, best_distances = best_positions[keep], best_distances[keep]
+        order = np.argsort(best_distances)
+        return [self.index_to_docstore_id[int(p)] for p in best_positions[order]]
+
+    def similarity_search_with_score_by_vector(self, query_vector, k=4):
+        return [(self.docstore.search(chunk_id), None) for chunk_id in self.search_chunk_ids(query_vector, k)]
@@ -0,0 +1,337 @@
+# 파일명: rag_service.py
+# 검색기(FAISS/BM25), 임베딩 클라이언트, LLM 클라이언트를 한 번만 띄워 두고
+# chatbot.py와 app.py가 HTTP로 검색/생성을 요청하는 로컬 서비스
+# 실행: python rag_service.py
+# (서비스가 떠 있지 않으면 각 프런트엔드가 RagService를 프로세스 안에서 직접 사용)
+
+import argparse
+import codecs
+import itertools
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_community.llms import Ollama
+from langchain_community.vectorstores import FAISS
+from langchain_core.prompts import ChatPromptTemplate
+from embedding_cache import get_cached_embeddings
+from answer_cache import SemanticAnswerCache
+from course_lookup import CourseLookup
+from lexical_index import LexicalIndex
+from hybrid_retriever import HybridRetriever
+from mmap_index import MmapVectorStore
+from rag_setup import load_index_manifest, resolve_index_dir
+
+# --- 설정 (자신의 환경에 맞게 수정) ---
+LLM_MODEL = "gemma3:12b"
+EMBEDDING_MODEL = "nomic-embed-text"
+FAISS_INDEX_PATH = "faiss_course_index"  # RAG 인덱스가 저장된 폴더
+INDEX_FORMAT = "faiss"  # "faiss": 전체를 메모리에 로드, "mmap": 벡터/docstore를 디스크에서 필요한 만큼만 읽음 (저사양 서버용)
+OLLAMA_BASE_URL = "http://localhost:11434"
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_URL = f"http://{SERVICE_HOST}:{SERVICE_PORT}"
+HEALTH_TIMEOUT = 2        # 상태 확인 요청 제한 시간(초)
+GENERATE_TIMEOUT = 300    # 생성 요청 제한 시간(초)
+MAX_PENDING_ANSWERS = 256 # 답변 캐시에 저장 대기 중인 검색 결과 수
+# ----------------------------------------
+
+RAG_PROMPT = ChatPromptTemplate.from_template(
+    """당신은 과목 정보를 상세히 설명해주는 AI 조교입니다.
+        아래에 주어진 '참고 자료'를 바탕으로 사용자의 '질문'에 대해 아는 만큼만 상세하게 답변해주세요.
+        만약 참고 자료에 없는 내용이라면, "해당 과목에 대한 상세 정보를 PDF에서 찾을 수 없습니다."라고 솔직하게 답변하세요.
+
+        [참고 자료]
+        {context}
+
+        [질문]
+        {question}
+        """
+)
+
+ADVISOR_PROMPT = ChatPromptTemplate.from_template(
+    """당신은 대학교의 친절하고 유능한 AI 학업 조교입니다.
+                        아래에 주어진 학생의 '학업 분석 및 추천 리포트'를 바탕으로 학생의 질문에 답변해주세요.
+                        먼저, 학생의 현재 학점 현황(총학점, 부족한 영역)을 요약해서 설명해주세요.
+                        그 다음, 리포트에 있는 '세부 졸업요건 충족 현황'을 바탕으로 학생이 놓치고 있는 중요한 규칙이 있다면 강조해서 설명해주세요.
+                        마지막으로 '다음 학기 추천 과목 목록'을 카테고리별로 명확하게 제시하며, 왜 이 과목들을 들어야 하는지 간단히 설명하고 격려하며 대화를 마무리해주세요.
+                        
+                        --- 학업 분석 및 추천 리포트 ---
+                        {report}
+                        --------------------------------
+                        
+                        이제 위 리포트를 바탕으로 학생에게 자연스럽게 설명해주세요."""
+)
+
+def format_docs(docs):
+    """검색된 문서 조각을 프롬프트의 {context}에 넣을 텍스트로 합칩니다."""
+    return "\n\n".join(doc.page_content for doc in docs)
+
+def get_index_version(index_path=FAISS_INDEX_PATH):
+    """rag_setup이 기록한 인덱스 버전 (manifest가 없으면 None)."""
+    manifest = load_index_manifest(index_path)
+    return manifest.get('version') if manifest else None
+
+def load_retriever(embeddings, index_path=FAISS_INDEX_PATH, index_format=INDEX_FORMAT):
+    """FAISS 인덱스와 BM25 색인을 읽어 하이브리드 검색기를 만듭니다 (CURRENT가 가리키는 버전 폴더에서)."""
+    index_path = resolve_index_dir(index_path)
+    vector_store = None
+    if index_format == "mmap":
+        vector_store = MmapVectorStore.load(index_path)
+        if vector_store is None:
+            print("⚠️ mmap 형식 인덱스가 없어 FAISS 인덱스를 메모리에 로드합니다. `rag_setup.py`를 다시 실행해주세요.")
+    if vector_store is None:
+        vector_store = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+    lexical_index = LexicalIndex.load(index_path)
+    if lexical_index is None:
+        print("⚠️ BM25 색인이 없어 벡터 검색만 사용합니다. `rag_setup.py`를 다시 실행해주세요.")
+    return HybridRetriever(vector_store, lexical_index, embeddings)
+
+
+class RagService:
+    """검색기, 임베딩, LLM 클라이언트를 한 번만 만들어 두고 검색/생성 요청을 처리합니다.
+
+    서비스 프로세스(python rag_service.py) 안에서 쓰이고, 서비스가 없을 때는 프런트엔드가 직접 만들어 씁니다.
+    인덱스는 첫 검색 때 읽으며, rag_setup으로 버전이 바뀌면 다시 읽습니다.
+    """
+
+    def __init__(self, index_path=FAISS_INDEX_PATH, llm_model=LLM_MODEL, embedding_model=EMBEDDING_MODEL):
+        self.index_path = index_path
+        self.llm_model = llm_model
+        self.llm = Ollama(model=llm_model)
+        self.embeddings = get_cached_embeddings(embedding_model)  # 반복되는 질문은 임베딩을 다시 계산하지 않음
+        self.answer_cache = SemanticAnswerCache()
+        self.retriever = None
+        self.course_lookup = None
+        self.index_version = None
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()   # cache_token -> (질의 벡터, chunk_ids, 인덱스 버전)
+        self._tokens = itertools.count(1)
+
+    def _current_index(self):
+        # 버전 폴더를 한 번만 구해 그 폴더에서 버전 확인과 로딩을 모두 함 (도중에 CURRENT가 바뀌어도 섞이지 않음)
+        index_dir = resolve_index_dir(self.index_path)
+        latest_version = get_index_version(index_dir)
+        with self._lock:
+            if self.retriever is None or latest_version != self.index_version:
+                if not os.path.exists(index_dir):
+                    raise FileNotFoundError(f"RAG 인덱스 파일을 찾을 수 없습니다. '{index_dir}'")
+                print(f"RAG 인덱스 로딩 중... (버전 {latest_version})")
+                self.retriever = load_retriever(self.embeddings, index_dir)
+                self.course_lookup = CourseLookup.load(index_dir)
+                self.index_version = latest_version
+            return self.retriever, self.course_lookup, self.index_version
+
+    def health(self):
+        """상태 확인. LLM 생성은 하지 않고 Ollama 모델 목록(/api/tags)만 조회합니다."""
+        status = {'status': 'ok', 'llm_model': self.llm_model,
+                  'index_version': get_index_version(self.index_path),
+                  'index_loaded': self.retriever is not None}
+        try:
+            with urllib.request.urlopen(f"{OLLAMA_BASE_URL}/api/tags", timeout=HEALTH_TIMEOUT) as response:
+                models = [model.get('name', '') for model in json.load(response).get('models', [])]
+            status['ollama'] = True
+            status['llm_available'] = any(name == self.llm_model or name.split(':')[0] == self.llm_model
+                                          for name in models)
+        except (urllib.error.URLError, OSError, ValueError):
+            status['ollama'] = False
+            status['llm_available'] = False
+        if not status['llm_available']:
+            status['status'] = 'degraded'
+        return status
+
+    def retrieve(self, query):
+        """질문에 맞는 참고 자료를 찾습니다.
+
+        반환: {'context', 'source'('lookup'/'hybrid'), 'timings', 'answer'(답변 캐시 적중 시), 'cache_token'}
+        cache_token을 generate에 넘기면 생성된 답변이 답변 캐시에 저장됩니다.
+        """
+        retriever, course_lookup, index_version = self._current_index()
+        # 과목명/과목코드가 그대로(단어 경계에 맞게) 들어 있는 질문은 임베딩과 벡터 검색 없이 해당 청크를 바로 사용
+        # (docstore.search는 없는 ID에 대해 문자열을 돌려주므로 걸러냄)
+        matched_docs = [doc for doc in map(retriever.vector_store.docstore.search, course_lookup.match(query))
+                        if not isinstance(doc, str)]
+        if matched_docs:
+            return {'context': format_docs(matched_docs), 'source': 'lookup', 'timings': '',
+                    'answer': None, 'cache_token': None}
+
+        docs, query_vector = retriever.retrieve(query)
+        chunk_ids = [doc.metadata.get('chunk_id') for doc in docs]
+        result = {'context': format_docs(docs), 'source': 'hybrid', 'timings': retriever.format_timings(),
+                  'answer': self.answer_cache.lookup(query_vector, chunk_ids, index_version), 'cache_token': None}
+        if result['answer'] is None:
+            token = str(next(self._tokens))
+            with self._lock:
+                self._pending[token] = (query_vector, chunk_ids, index_version)
+                while len(self._pending) > MAX_PENDING_ANSWERS:
+                    self._pending.popitem(last=False)
+            result['cache_token'] = token
+        return result
+
+    def generate(self, prompt, cache_token=None):
+        """프롬프트에 대한 LLM 답변을 조각 단위로 내보냅니다. cache_token이 있으면 완성된 답변을 캐시에 저장."""
+        pieces = []
+        for piece in self.llm.stream(prompt):
+            pieces.append(piece)
+            yield piece
+        if cache_token:
+            with self._lock:
+                pending = self._pending.pop(cache_token, None)
+            if pending:
+                query_vector, chunk_ids, index_version = pending
+                self.answer_cache.store(query_vector, chunk_ids, "".join(pieces), index_version)
+
+    def stats(self):
+        return self.answer_cache.stats()
+
+
+class RagServiceClient:
+    """rag_service.py 프로세스에 요청하는 클라이언트. RagService와 같은 메서드를 제공합니다."""
+
+    def __init__(self, base_url=SERVICE_URL):
+        self.base_url = base_url.rstrip('/')
+
+    def _open(self, path, payload=None, timeout=HEALTH_TIMEOUT):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data,
+                                         headers={'Content-Type': 'application/json; charset=utf-8'},
+                                         method='POST' if data is not None else 'GET')
+        return urllib.request.urlopen(request, timeout=timeout)
+
+    def _json(self, path, payload=None, timeout=HEALTH_TIMEOUT):
+        with self._open(path, payload, timeout) as response:
+            return json.load(response)
+
+    def health(self):
+        return self._json('/health')
+
+    def retrieve(self, query):
+        return self._json('/retrieve', {'query': query}, timeout=GENERATE_TIMEOUT)
+
+    def generate(self, prompt, cache_token=None):
+        # 서버가 보내는 청크를 도착하는 대로 내보냄 (UTF-8 글자가 청크 경계에서 잘려도 이어 붙여 디코딩)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        with self._open('/generate', {'prompt': prompt, 'cache_token': cache_token}, GENERATE_TIMEOUT) as response:
+            while True:
+                data = response.read1(8192)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
+
+    def stats(self):
+        return self._json('/stats')
+
+
+def connect_rag_backend(service_url=SERVICE_URL):
+    """RAG 서비스가 떠 있으면 클라이언트를, 아니면 이 프로세스에서 직접 쓰는 RagService를 반환합니다."""
+    client = RagServiceClient(service_url)
+    try:
+        client.health()
+        print(f"✅ RAG 서비스에 연결되었습니다. ({service_url})")
+        return client
+    except (urllib.error.URLError, OSError, ValueError):
+        print("ℹ️ RAG 서비스가 실행 중이 아니어서 이 프로세스에서 직접 모델과 인덱스를 사용합니다.")
+    return RagService()
+
+
+class RagRequestHandler(BaseHTTPRequestHandler):
+    """GET /health, GET /stats, POST /retrieve, POST /generate (답변은 chunked로 스트리밍)"""
+    protocol_version = "HTTP/1.1"
+    service = None   # serve()에서 RagService 인스턴스를 지정
+
+    def log_message(self, format, *args):
+        pass   # 요청마다 로그를 찍지 않음
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.service.health())
+        elif self.path == '/stats':
+            self._send_json(200, self.service.stats())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+        except ValueError:
+            self._send_json(400, {'error': 'invalid json'})
+            return
+        if self.path == '/retrieve':
+            try:
+                self._send_json(200, self.service.retrieve(payload.get('query', '')))
+            except Exception as e:
+                print(f"검색 중 오류 발생: {e}")
+                self._send_json(500, {'error': str(e)})
+        elif self.path == '/generate':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for piece in self.service.generate(payload.get('prompt', ''), payload.get('cache_token')):
+                    data = piece.encode('utf-8')
+                    if data:
+                        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+                        self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 먼저 연결을 끊음 (종료 조각도 보낼 수 없음)
+                self.close_connection = True
+                return
+            except Exception as e:
+                # 이미 응답을 시작했으므로 상태 코드는 바꿀 수 없고, 스트림을 닫기만 함
+                print(f"답변 생성 중 오류 발생: {e}")
+            try:
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+
+def serve(host=SERVICE_HOST, port=SERVICE_PORT, index_path=FAISS_INDEX_PATH):
+    service = RagService(index_path)
+    try:
+        service._current_index()   # 첫 요청이 느리지 않도록 인덱스를 미리 읽음
+    except FileNotFoundError as e:
+        print(f"⚠️ {e} (인덱스가 생기면 첫 검색 때 읽습니다)")
+    RagRequestHandler.service = service
+    server = ThreadingHTTPServer((host, port), RagRequestHandler)
+    print(f"RAG 서비스 시작: http://{host}:{port} (LLM {service.llm_model})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nRAG 서비스를 종료합니다.")
+    finally:
+        server.server_close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="검색기/LLM을 한 번만 로드해 두는 로컬 RAG 서비스")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--index', default=FAISS_INDEX_PATH, help="RAG 인덱스 폴더")
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    serve(args.host, args.port, args.index)
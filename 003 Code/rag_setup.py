@@ -1,533 +1,92 @@
 # 파일명: rag_setup.py (리스트 분할 기능 추가 버전)
 
+import argparse
+import hashlib
+import json
 import os
+import re
 import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import OllamaEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from embedding_cache import get_cached_embeddings
+from course_lookup import COURSE_LOOKUP_FILE, build_course_lookup, save_course_lookup
+from lexical_index import LEXICAL_INDEX_FILE, LexicalIndex
+from markdown_chunker import chunk_statistics, split_structured_document
+from document_source import CORPUS_DIR, DocumentSource
+from metadata_filter import CHUNK_METADATA_VERSION, chunk_filter_metadata, document_title
+from mmap_index import DEFAULT_MMAP_FORMAT, MMAP_FORMATS, export_mmap_index
 
 # --- 설정 ---
 FAISS_INDEX_PATH = "faiss_course_index"
-
-# --- RAG에 사용할 텍스트 데이터 ---
-# 여기에 제공해주신 모든 텍스트를 복사해서 붙여넣습니다.
-RAG_TEXT_CONTENTS = [
-    """문서 1: 한밭대학교 인공지능소프트웨어학과 교육과정 및 졸업요건
-# 한밭대학교 인공지능소프트웨어학과 졸업 요건 (2024-2025학년도 기준)
-
-## **핵심 졸업 요건 요약**
-
-- **졸업에 필요한 총 이수 학점:** **130학점**
-- **교양 과정 필수 이수 학점:** 총 **33학점**
-    - 기초교양: 4과목, 9학점 (글쓰기(2학점), 발표와토론(2학점), 대학영어(2학점), 코딩(3학점)은 전교생 필수)
-        - 글쓰기 선택: 창의글쓰기, 공학글쓰기 중 택1
-        - 코딩 선택: C프로그래밍, Java프로그래밍, Python프로그래밍, Scratch프로그래밍, 비주얼베이직 중 택1
-    - 핵심교양: 3과목, 9학점 (소통과인성, 분석과판단, 도전과미래 각 영역별 1과목씩 총 3과목 선택 필수, 각 3학점)
-    - 일반교양: 나머지 학점 (영역별 이수 학점 6학점 이내 제한)
-- **전공 과정 필수 이수 학점:** 총 **72학점**
-    - 기본전공: 51학점
-    - 심화전공: 21학점 (캡스톤디자인II 필수 포함)
-- **대학특화 과정 필수 이수 학점:** 총 **11학점** (진로설계1, 진로설계2, 진로설계3, 진로설계4, 공학설계입문, 기업가정신과창업, 캡스톤디자인I)
-- **자유선택 학점:** **14학점**
-- **비교과 과정 이수 요건:** **70 UNIT** 이상 (H-CAN 한밭 핵심역량 관리시스템 통해 관리)
-- **기타 졸업 요건:** 졸업 작품 제출 또는 졸업 논문 제출 중 택1 (세부 사항 추후 공지)
-
----
-
-# 한밭대학교 인공지능소프트웨어학과 교육과정 (2024-2025학년도)
-
-## 1학년 (1st Year)
-
-### 1-1 학기
-
-**대학특화 (필수):**
-- 진로설계1
-- 공학설계입문
-
-**기본전공:**
-- 인공지능과 선형대수학
-
-**교양 (필수):**
-- Python 프로그래밍
-- 글쓰기 택1
-- 미분적분학1
-- 도전과 미래 택1
-
-### 1-2 학기
-
-**기본전공:**
-- 인공지능과 이산수학
-- 소프트웨어개론
-- Python응용
-- C언어프로그래밍
-
-**교양 (필수):**
-- 발표와 토론
-- 대학영어
-- 소통과 인성 택1
-
-## 2학년 (2nd Year)
-
-### 2-1 학기
-
-**대학특화 (필수):**
-- 진로설계2
-
-**기본전공:**
-- 인공지능과 확률및통계
-- 데이터사이언스개론
-- 데이터구조
-- 신호및시스템
-- 고급C언어프로그래밍
-
-**교양 (필수):**
-- 분석과 판단 택1
-
-### 2-2 학기
-
-**기본전공:**
-- 인공지능수학응용
-- 베이지안 통계
-- 고급데이터마이닝
-- 알고리즘기초
-- 디지털신호응용
-- 오픈소스SW프로그래밍
-- 프로그래밍언어개념과응용
-
-## 3학년 (3rd Year)
-
-### 3-1 학기
-
-**대학특화 (필수):**
-- 진로설계3
-
-**기본전공:**
-- 기계학습
-- 이동로봇시스템
-- 컴퓨터비전개론
-- 데이터베이스원리와응용
-- 소프트웨어원리
-- 데이터통신과네트워크
-
-### 3-2 학기
-
-**대학특화 (필수):**
-- 기업가정신과창업
-
-**기본전공:**
-- 빅데이터처리플랫폼
-- 운영체제
-
-**심화전공:**
-- 강화학습
-- 고급컴퓨터비전
-- 심층신경망
-- 디지털통신
-- 클라우드컴퓨팅
-
-## 4학년 (4th Year)
-
-### 4-1 학기
-
-**대학특화 (필수):**
-- 진로설계4
-- 캡스톤디자인I
-
-**기본전공:**
-- 모바일컴퓨팅개념과응용
-
-**심화전공:**
-- 인공지능융합세미나
-- 자율주행시스템
-- 딥러닝프로그래밍
-- 자연어처리
-- 인공지능프레임워크
-- 디지털통신응용
-- 지능형네트워크
-
-### 4-2 학기
-
-**심화전공:**
-- 캡스톤디자인II (필수)
-- 3D딥러닝
-- 인공지능프로그래밍응용
-- 자연어처리개념과응용
-- IoT프로그래밍
-
-## 주요 교육 트랙 및 흐름
-
-### AI 기초 수학 및 프로그래밍 (1-2학년)
-- 수학적 기반: 선형대수학, 이산수학, 확률및통계, AI수학응용
-- 프로그래밍: Python, C언어 기초 및 응용
-- SW 기초: 소프트웨어개론, 데이터구조, 알고리즘
-
-### 데이터 사이언스 및 AI 핵심 (2-3학년)
-- 데이터 분석 역량: 데이터사이언스개론, 고급데이터마이닝, 베이지안 통계
-- AI 핵심 분야: 기계학습, 컴퓨터비전개론, 이동로봇시스템
-
-### AI 심화 및 응용 시스템 (3-4학년)
-- AI 심화: 강화학습, 고급컴퓨터비전, 심층신경망, 딥러닝프로그래밍, 자연어처리
-- 응용 시스템 구축: 자율주행시스템, 빅데이터처리플랫폼, 클라우드컴퓨팅, IoT프로그래밍
-- 시스템 소프트웨어: 데이터통신, 네트워크, 운영체제
-
-### 실무 역량 강화 (전학년, 특히 4학년)
-- 진로 탐색 및 경력 개발: 진로설계 (1-4)
-- 문제 해결 및 프로젝트 경험: 공학설계입문, 캡스톤디자인 (I, II)
-- 창업 마인드 함양: 기업가정신과창업
-
-## 이전 교육과정과의 비교 (2022, 2023학년도 대비)
-
-### 2024-2025학년도 신규/변경 강조 과목
-- 1학년: "Python응용" 신설 또는 명칭 변경.
-- 2학년: "베이지안 통계", "프로그래밍언어개념과응용" 명확화.
-- 3학년: "이동로봇시스템" 기본전공으로 명시.
-- 4학년: "3D딥러닝", "인공지능프로그래밍응용" 심화전공으로 구체화.
-- 전반적 경향: AI 관련 수학/통계 과목 초반 강화, 심화 전공 선택지 다양화.
-
-### 공통점
-- 대학특화 과목 지속 유지: 진로설계, 공학설계입문, 캡스톤디자인.
-- 핵심 AI 트랙 유지: 프로그래밍(Python, C), 데이터구조, 알고리즘, 기계학습, 딥러닝, 자연어처리 (배치 학기/세부 내용 변동 가능).
-""",
-    """문서 2: 한밭대학교 인공지능소프트웨어학과 교과목 개요
-# 한밭대학교 인공지능소프트웨어학과 교과목 개요 (2024-2025학년도)
-
-## 문서 개요
-본 문서는 한밭대학교 인공지능소프트웨어학과의 2024-2025학년도 주요 교과목에 대한 개요를 제공합니다. 각 교과목은 교과목 코드, 국문 및 영문 교과목명, 학점(총학점-이론-실습), 그리고 간략한 교과목 설명을 포함합니다.
-(참고: 학점 표기 방식은 "총학점-이론-실습"입니다. 예: 3-2-2는 총 3학점, 이론 2시간, 실습 2시간을 의미합니다. 3-3-0은 총 3학점, 이론 3시간, 실습 0시간을 의미합니다.)
-
-## 2024-2025학년도 주요 교과목 개요
-
-- **PROJ1112 공학설계입문 (Introduction to Engineering Design) 3-2-2**
-  - 공학자가 갖추어야 할 기본소양과 창의적 설계능력을 기르기 위한 교과목. 특정 주제 또는 자유로운 주제로 아이디어를 도출하고 구체화하는 과정과 SW 도구를 사용하여 구현하는 과정을 학습한다.
-
-- **AISW110005 인공지능과 선형대수학 (Linear Algebra for Artificial Intelligence) 3-3-0**
-  - 기계학습 및 인공지능을 공부하기 위한 선형대수학의 기본 개념을 학습한다.
-
-- **AISW110006 인공지능과 이산수학 (Discrete Mathematics for Artificial Intelligence) 3-3-0**
-  - 컴퓨터공학의 기초가 되는 이산수학에 관해 학습한다.
-
-- **AISW110008 소프트웨어개론 (Introduction to Software) 3-3-0**
-  - 인공지능 소프트웨어 개발을 위해 필요한 기본적인 소프트웨어/하드웨어/인프라 개념과 소프트웨어 서비스, 필요성, 중요성 및 활용 방법, 적용 분야를 학습한다.
-
-- **AISW110007 Python응용 (Python Applications) 3-2-2**
-  - 인공지능에 활용하기 위한 Python의 다양한 고급 기능들에 대해 배우고, 다양한 실전 프로그램 작성 방법을 학습한다.
-
-- **AISW1101 C언어프로그래밍 (C Language Programming) 3-2-2**
-  - C언어에 대하여 살펴보고 프로그래밍을 작성하는 방법을 학습한다.
-
-- **AISW210013 인공지능과 확률및통계 (Probability and Statistics for Artificial Intelligence) 3-3-0**
-  - 기계학습의 기초가 되는 확률 및 통계 이론에 관해 학습한다.
-
-- **AISW2105 데이터사이언스개론 (Introduction to Data Science) 3-2-2**
-  - 데이터사이언스 개념, 데이터 분석, 시각화 데이터 활용 방법, 적용 분야들에 대하여 살펴본다.
-
-- **AISW2103 데이터구조 (Data Structure) 3-2-2**
-  - 각종 자료구조를 컴퓨터 내부에서 표현하는 방법과 이와 관련된 알고리즘에 대한 이론 및 응용문제들을 학습한다.
-
-- **AISW2107 신호및시스템 (Signals and Systems) 3-3-0**
-  - 신호 및 시계열 데이터, 인공지능 시스템을 이해하기 위한 신호와 시스템의 해석방법을 학습한다.
-
-- **AISW2102 고급C언어프로그래밍 (Advanced C Language Programming) 3-2-2**
-  - C언어 프로그래밍을 작성하는 방법과 이와 관련된 다양한 프로그램 작성 방법을 학습한다.
-
-- **AISW2110 인공지능수학응용 (Mathematics Application for AI) 3-3-0**
-  - 인공지능 기법 이해와 응용에 필요한 선형대수, 확률 및 통계의 기초적인 이론을 학습한다.
-
-- **AISW210012 베이지안 통계 (Bayesian Statistics) 3-3-0**
-  - 베이지안 통계의 기초 개념에 관해 학습한다. 다양한 사전분포와 그로부터 유도되는 사후분포에 관해 학습한다.
-
-- **AISW210015 고급데이터마이닝 (Advanced Data Mining) 3-2-2**
-  - 데이터 모델링 기법을 활용하여 복잡한 데이터에서 유용한 정보를 추출하고 예측 모델을 개발하는 과정을 학습한다.
-
-- **AISW2108 알고리즘기초 (Fundamentals to Algorithm) 3-2-2**
-  - 문제의 정의와 알고리즘에 대하여 이해하고 알고리즘 분석의 방법론에 대하여 학습한다.
-
-- **AISW2106 디지털신호응용 (Digital Signal Application) 3-3-0**
-  - 음성, 오디오, 텍스트, 영상, 동영상 등 디지털 신호에서 정보의 추출, 전달, 저장, 제어를 학습한다.
-
-- **AISW2109 오픈소스SW프로그래밍 (Open Source SW Programming) 3-2-2**
-  - 오픈소스 정의, 개발 방법론, 버전컨트롤, 버그 트래커, 빌드, 문서화 등을 비롯한 오픈소스 SW 플랫폼과 서비스 개발 방법을 학습한다.
-
-- **AISW210014 프로그래밍언어개념과응용 (Programming Language and Applications) 3-2-2**
-  - 컴퓨터 프로그래밍의 종류와 각 프로그래밍의 특성을 살펴보고 효율적인 프로그래밍 스킬을 배운다.
-
-- **AISW310011 기계학습 (Machine Learning) 3-3-0**
-  - 데이터로부터 모델을 학습하고 결과를 추론할 수 있는 기계학습의 방법론에 관해 학습한다.
-
-- **AISW310008 이동로봇시스템 (Mobile Robotic Systems) 3-3-0**
-  - 자율주행 로봇/자동차에 사용되는 다양한 센서 및 구조적 모델에 대해 살펴보고, 자율주행의 기초가 되는 알고리즘에 대해 학습한다.
-
-- **AISW310010 컴퓨터비전개론 (Introduction to computer vision) 3-2-2**
-  - 컴퓨터비전 분야의 기초 개념과 기술을 소개하며, 영상 데이터를 처리하고 분석하는 방법을 학습한다.
-
-- **AISW310009 데이터베이스원리와응용 (Database principles and Application) 3-2-2**
-  - 데이터베이스 관리 시스템(DBMS)의 기본개념과 데이터베이스 설계, 쿼리 작성, 데이터 조작 등을 다루는 방법과 데이터베이스 애플리케이션을 개발하는 능력을 학습한다.
-
-- **AISW3104 소프트웨어원리 (Software Principles) 3-3-0**
-  - 소프트웨어를 작성하기 위한 개발 방법론, 요구분석 및 설계 기법, 품질 등에 대한 원리 및 개념을 학습한다.
-
-- **AISW3101 데이터통신과네트워크 (Data Communications and Computer Networks) 3-3-0**
-  - 네트워크 및 데이터통신의 전송 절차 원리를 해석하고 각종 전송에 따른 프로토콜의 절차를 학습한다.
-
-- **AISW3103 빅데이터처리플랫폼 (Big Data Processing Platform) 3-2-2**
-  - 빅데이터 수집, 저장, 관리, 분석, 시각화 관련 기법과 구현을 위한 플랫폼 구축 기술을 학습한다.
-
-- **AISW310007 운영체제 (Operating Systems) 3-2-2**
-  - 컴퓨터 운영체제의 개념과 역할, 특히 프로세스 관리, 메모리 관리, 파일관리, 보조기억 관리 및 분산처리의 이해와 컴퓨터 시스템의 여러 자원을 효율적으로 관리하는 개념을 습득한다.
-
-- **AISW320007 강화학습 (Reinforcement Learning) 3-2-2**
-  - 강화학습의 기본 개념과 강화학습으로 해결할 수 있는 다양한 문제에 관해 학습한다.
-
-- **AISW320013 고급컴퓨터비전 (Advanced Computer Vision) 3-2-2**
-  - 3차원 공간에서의 이미지 처리 및 분석에 대해 학습하고, 이를 기반으로 자율주행, 로봇, 가상/증강현실 등 다양한 응용 분야에서 사용되는 심화 컴퓨터비전 기술에 대해 학습한다.
-
-- **AISW3203 심층신경망 (Deep Neural Networks) 3-2-2**
-  - 심층신경망의 기본 개념을 이해하고 활용되는 분야를 알아보고 심층신경망 개발 프레임워크를 활용하여 구현한다.
-
-- **AISW320009 디지털통신 (Digital Communication) 3-3-0**
-  - 2세대 이동통신에서부터 5세대 이동통신에서 사용된 디지털 통신방식의 특징과 이론에 대해 학습한다. 구체적으로 변복조 방식과 무선채널의 특성을 배우고 여러 사용자가 무선자원을 공유하는 방법을 학습한다.
-
-- **AISW3206 클라우드컴퓨팅 (Cloud Programming) 3-2-2**
-  - 클라우드 기반 컴퓨팅의 개념과 서비스 형태를 살펴보고 클라우드 환경에서 이루어지는 분산 컴퓨팅, 가상화, 보안, 네트워킹 등의 기술에 대해서 학습한다.
-
-- **PROJ4107 캡스톤디자인I (Capstone Design I) 3-0-6**
-  - 팀 단위 프로젝트를 수행함으로써 전공 지식을 통합하고 활용하는 능력, 설계 기법, 프로젝트 관리능력, 팀워크 및 의사 소통능력을 배양한다.
-
-- **AISW4208 캡스톤디자인II (Capstone Design II) 3-0-6**
-  - 산업체 및 전공교수가 테마를 제시하고 산업체 인사와 전공교수가 공동으로 평가하는 프로젝트를 수행하고 발표함으로써 전공지식을 통합하고 활용하는 능력, 설계기법, 과제수행능력, 팀워크 및 의사소통 능력을 배양한다. (문서에는 "캡스톤디자인ㅍ"로 오타가 있으나, 문맥상 II로 해석)
-
-- **AISW3102 모바일컴퓨팅개념과응용 (Mobile Computing and Applications) 3-2-2**
-  - 모바일 컴퓨팅 환경과 스마트폰 서비스를 이해하고 스마트폰 어플리케이션을 개발한다.
-
-- **AISW4205 인공지능융합세미나 (AI Convergence Seminar) 3-3-0**
-  - 인공지능 기법을 활용하여 다양한 분야의 프로젝트를 기획하고 구현한다.
-
-- **AISW3205 자율주행시스템 (Automated Driving System) 3-2-2**
-  - 자율주행 모바일 로봇의 구조를 살펴보고 기계학습 기반 자율주행 알고리즘을 구현한다.
-
-- **AISW4202 딥러닝프로그래밍 (Deep Learning Programming) 3-2-2**
-  - 딥러닝 개요, 종류, 기법을 살펴보고 딥러닝 프레임워크를 이용한 다양한 프로젝트를 기획 및 구현한다.
-
-- **AISW320011 자연어처리 (Natural Language Processing) 3-2-2**
-  - 자연어처리의 핵심 원리와 규칙, 통계, 기계학습 기반의 자연어처리 기술에 관해 학습한다.
-
-- **AISW420010 인공지능 프레임워크 (Artificial Intelligence Frameworks) 3-2-2**
-  - 인공지능 시스템 운영과 관련된 내용을 중점적으로 다루며, 다양한 머신러닝 프레임워크를 활용하여 모델 개발과 배포, 모델 생명 주기 관리와 모니터링 등을 학습한다.
-
-- **AISW320010 디지털통신응용 (Application of Digital Communication) 3-2-2**
-  - (교과목 코드가 인공지능 프레임워크와 중복되나, 내용상 다른 과목으로 판단됨)
-  - 디지털 통신방식의 시뮬레이션 실습과 성능평가를 수행한다. 2세대 이동통신에서부터 5세대 이동통신까지 송수신기와 무선채널에 대한 시뮬레이션 방법을 배우고 실습하며 시뮬레이션을 통해 통신시스템의 성능평가 및 분석방법에 대해 학습한다.
-
-- **AISW4207 지능형네트워크 (Intelligent Networks) 3-2-2**
-  - 네트워크 및 통신 인프라 기술을 배우고 인프라 구조, 전달망, 유무선 액세스 기술 등을 활용하여 프로젝트를 기획하고 구현한다.
-
-- **AISW420009 3D딥러닝 (Deep Learning for 3D vision) 3-2-2**
-  - 인공지능을 활용하여 문제를 해결하기 위한 프로그래밍 기술을 학습하고, 프로젝트를 통해 실제 문제를 해결하는 솔루션을 구현하는 데 필요한 기술과 경험을 획득한다.
-
-- **AISW420011 인공지능프로그래밍응용 (Applied Artificial Intelligence Programming) 3-2-2**
-  - 인공지능을 활용하여 문제를 해결하기 위한 프로그래밍 기술을 학습하고, 프로젝트를 통해 실제 문제를 해결하는 솔루션을 구현하는 데 필요한 기술과 경험을 획득한다.
-
-- **AISW4206 자연어처리개념과응용 (Natural Language Processing and Applications) 3-2-2**
-  - 자연어 처리의 기본개념을 이해하고 각 방법론들을 습득하여 컴퓨터로 자연 언어를 처리할 수 있는 방법을 학습한다.
-
-- **AISW4201 IoT프로그래밍 (IoT Programming) 3-2-2**
-  - 자동화 기술에 따른 IoT 구축과 응용 사례를 학습하고 프로젝트를 수행한다.
-
-## 2023학년도 및 2022학년도 교과목 개요와의 주요 비교 (참고용)
-
-- **전반적인 유사성:** 핵심적인 AI 교과목(선형대수학, 이산수학, 확률통계, 기계학습, 딥러닝, 컴퓨터비전, 자연어처리 등)의 명칭과 개요는 연도별로 큰 차이 없이 유사하게 유지되는 경향을 보입니다.
-- **교과목 코드 및 학점:** 교과목 코드는 AISW로 시작하는 체계를 유지하며, 학점 구조(이론-실습)도 유사합니다.
-- **세부 명칭 및 내용 변화 가능성:** 일부 교과목의 경우, 연도에 따라 세부적인 명칭이 약간씩 다르거나(예: 2023년 '컴퓨터비전' vs 2024년 '컴퓨터비전개론', '고급컴퓨터비전'), 개요 설명에서 강조하는 내용이 조금씩 차이를 보일 수 있습니다. 예를 들어, 2023년 교과목 개요에는 '인공지능 알고리즘'과 같이 좀 더 일반적인 명칭의 과목이 있었으나 2024-2025년에는 더 세분화된 과목으로 편성된 것으로 보입니다.
-- **최신 정보 우선:** 본 정리는 2024-2025학년도 교과목 개요를 기준으로 작성되었으며, 가장 최신 정보를 반영합니다.
-""",
-    """문서 4: 2025학년도 교양 교육과정
-# 2025학년도 교양 교육과정
-
-## 교양교과 편성표
-
-### 구분: 기초교양 (10학점)
-- **영역: 공통기초 (10학점)**
-  - **교과목:**
-    - 글쓰기 (창의글쓰기, 공학글쓰기 중 택1)
-    - 발표와 토론
-    - 대학영어
-    - 코딩 (C 프로그래밍, Java 프로그래밍, Python 프로그래밍, Scratch 프로그래밍, 비주얼베이직 중 택1)
-
-### 구분: 핵심교양 (16학점)
-- **영역: 소통과 인성 (6학점)**
-  - **교과목:**
-    - 문화콘텐츠스토리텔링
-    - 인권과 사회
-    - 종교와 문화
-    - 인간과 환경
-    - [계열교차 교과목] 과학기술의 탐색 (수학, 과학, 공학)
-    - [계열교차 교과목] 인간의 탐색 (철학, 역사, 문학)
-- **영역: 분석과 판단 (5학점)**
-  - **교과목:**
-    - 합리적 문제해결과 논리
-    - 인간과 윤리
-    - 통계로 보는 세상
-    - 과학기술사
-    - 심리분석
-- **영역: 도전과 미래 (5학점)**
-  - **교과목:**
-    - 한국사의 이해
-    - 인간삶과 교육
-    - 역사와 문화
-    - 세계시민과 국가
-    - 경제와 사회
-
-### 구분: 일반교양 (81학점)
-- **영역: 언어 (9학점)**
-  - **교과목:**
-    - 영어I, 영어II
-    - 일본어I, 일본어II
-    - 중국어I, 중국어II
-    - 프랑스어
-    - 스페인어
-    - 교양한문
-- **영역: 철학과 심리 (11학점)**
-  - **교과목:**
-    - 논어와 현대사회
-    - 텍스트로 배우는 동양의 지혜
-    - 텍스트로 배우는 서양의 지혜
-    - 현대사회의 인간관계론
-    - 창의적 문제해결
-    - 인공지능 윤리
-    - 인성과 공동체윤리
-    - 과학기술과 철학의 하이브리드
-    - 나눔의 교육
-    - 인간심리의 이해
-    - 공정한 인공지능
-- **영역: 문학과 예술 (13학점)**
-  - **교과목:**
-    - 고전읽기
-    - 베스트셀러읽기
-    - 문학의 이해
-    - 언어와 사회
-    - SF로 보는 미래
-    - 음악의 이해
-    - 미술의 이해
-    - 디자인과 생활
-    - 문화와 테크놀로지
-    - 오케스트라와 교향곡의 세계
-    - 오페라 산책
-    - 모빌리티×한국문학
-    - 인공지능과 리터러시
-- **영역: 역사와 사회 (19학점)**
-  - **교과목:**
-    - 지역사회의 이해
-    - 세계사의 이해
-    - 서양사의 이해
-    - 동북아시아사
-    - 한국 민속의 이해
-    - 일본문화의 이해
-    - 미국문화의 이해
-    - 중국문화의 이해
-    - 생활과 법률
-    - 국가행정의 이해
-    - 현대정치사
-    - 뉴미디어와 현대사회
-    - 여성학
-    - 동서문명의 교류
-    - 사회정책과 복지국가
-    - 현대한국사회의 쟁점
-    - 다문화사회
-    - 과학기술과 사회
-    - 한국근현대사의 이해
-- **영역: 자연과 과학 (4학점)**
-  - **교과목:**
-    - 자연과학개론
-    - 생활 속의 과학
-    - 생활 속의 수학
-    - 공간과학
-- **영역: 기술과 창업 (14학점)**
-  - **교과목:**
-    - 한국경제의 이해
-    - 세계경제의 이해
-    - 생활과 세금
-    - 알기쉬운 실용금융
-    - 기업경영의 이해
-    - 융복합경영
-    - 창업의 이해
-    - 과학기술과 지식재산
-    - 문화콘텐츠비즈니스
-    - 4차 산업혁명의 핵심기술
-    - 머신러닝과 미래기술
-    - 4차 산업혁명과 미래운송수단
-    - 양자 정보과학 및 컴퓨터
-- **영역: 소프트웨어 (6학점)**
-  - **교과목:**
-    - 컴퓨팅 사고
-    - 데이터로 표현하는 세상
-    - 기초 모바일 앱 프로그래밍
-    - 웹과 인터넷
-    - IT융합기술
-    - 빅데이터 시대의 인공지능
-- **영역: 체육 (5학점)**
-  - **교과목:**
-    - 스포츠와 건강 (탁구, 테니스, 골프, 배드민턴, 신체리듬과체형관리)
-    - 웰빙시대의 건강관리
-    - 스포츠와 비판적사고
-- **영역: 수학 (10학점)**
-  - **교과목:**
-    - 기초미분적분학
-    - 미분적분학Ⅰ, 미분적분학Ⅱ
-    - 고급미분적분학Ⅰ, 고급미분적분학Ⅱ
-    - 미분방정식
-    - 선형대수학
-    - 벡터해석
-    - 기초통계학
-    - 데이터 모델링
-
-### 구분: 공학기초 (21학점)
-- **영역: 물리 (5학점)**
-  - **교과목:**
-    - 기초물리학
-    - 물리학 및 실험Ⅰ, 물리학 및 실험Ⅱ
-    - 고급물리학 및 실험Ⅰ, 고급물리학 및 실험Ⅱ
-- **영역: 화학 (3학점)**
-  - **교과목:**
-    - 화학 및 실험Ⅰ, 화학 및 실험Ⅱ
-    - 일반화학
-- **영역: 생물 (3학점)**
-  - **교과목:**
-    - 일반생물학Ⅰ, 일반생물학Ⅱ
-    - 일반생물학
-
----
-
-**참고 사항:**
-- `()` 안의 숫자는 해당 영역 또는 구분 내의 교과목 수를 의미합니다.
-- 배경색 정보:
-  - 노란색: 노마드칼리지 (52개 교과목)
-  - 주황색: 기초과학부 (31개 교과목)
-  - 하늘색: 인문교양학부 (45개 교과목)
-
----
-
-## 교양과정 이수기준
-
-- **졸업필요학점:** 130학점의 25%인 **33학점**을 교양과정에서 이수해야 합니다.
-- **기초교양 (필수):** 4과목, 총 9학점 필수 이수
-  - **글쓰기, 발표와 토론, 대학영어, 코딩** 교과목은 전교생 필수입니다.
-  - 학점 구성: 글쓰기(2), 발표와토론(2), 대학영어(2), 코딩(3)
-  - **글쓰기 선택:** 창의글쓰기, 공학글쓰기 2과목 중 택1
-  - **코딩 선택:** C프로그래밍, Java프로그래밍, Python프로그래밍, Scratch프로그래밍, 비주얼베이직 5과목 중 택1
-- **핵심교양 (필수):** 3과목, 총 9학점 필수 이수
-  - **소통과 인성, 분석과 판단, 도전과 미래** 각 영역별 1과목 선택 필수입니다.
-  - 학점 구성: 각 영역별 선택 과목 3학점 (총 3과목, 9학점)
-- **일반교양:** 영역별 이수 학점을 **6학점 이내**로 제한합니다.
-""",
-]
-def create_and_save_rag_index():
-    """정의된 텍스트 변수로 RAG 인덱스를 생성하고 디스크에 저장합니다."""
-    documents = RAG_TEXT_CONTENTS
-    if not documents:
-        print("오류: RAG 인덱스를 생성할 텍스트가 없습니다.")
-        return
-
-    # --- ★★★ 텍스트 분할 전략 대폭 강화 ★★★ ---
+EMBEDDING_MODEL = "nomic-embed-text"
+MANIFEST_FILE = "manifest.json"  # 인덱스 폴더 안에 저장하는 버전/청크 정보
+INDEX_POINTER_FILE = "CURRENT"   # 인덱스 폴더 안의 버전 폴더(v000001 …) 중 지금 읽을 폴더 이름
+KEEP_INDEX_VERSIONS = 2          # 교체 직전에 이전 버전을 읽기 시작한 프로세스를 위해 남겨 두는 버전 폴더 수
+EMBED_BATCH_SIZE = 16     # 임베딩 요청 한 번에 보내는 청크 수
+EMBED_MAX_IN_FLIGHT = 4   # 동시에 보내는 임베딩 요청 수 (Ollama가 놀지 않도록, 너무 크면 과부하)
+CHUNKING_STRATEGY = "structured"  # "structured": 제목/과목 항목 단위, "recursive": 이전 방식 (1000자, 500자 겹침)
+MMAP_FORMAT = DEFAULT_MMAP_FORMAT  # 함께 저장할 mmap 형식 ("float32", "float16", "ivfpq", 저장 안 함: None)
+# RAG에 사용할 문서는 CORPUS_DIR(rag_corpus/) 폴더의 .md/.txt/.pdf 파일에서 읽습니다.
+
+def chunk_id_for(text):
+    """청크 내용 해시. 같은 내용의 청크는 항상 같은 docstore ID를 갖습니다."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def resolve_index_dir(index_path=FAISS_INDEX_PATH):
+    """인덱스 폴더의 CURRENT가 가리키는 버전 폴더를 반환합니다.
+
+    CURRENT가 없으면(이전 형식: 인덱스 파일이 폴더에 바로 있음, 또는 버전 폴더 자체) index_path 그대로.
+    인덱스를 읽는 쪽은 이 경로를 한 번 구해 두고 그 폴더에서만 읽어야 교체 중에도 파일이 섞이지 않습니다.
+    """
+    try:
+        with open(os.path.join(index_path, INDEX_POINTER_FILE), encoding='utf-8') as f:
+            name = f.read().strip()
+    except (FileNotFoundError, NotADirectoryError):
+        return index_path
+    return os.path.join(index_path, name) if name else index_path
+
+def load_index_manifest(index_path=FAISS_INDEX_PATH):
+    """인덱스(현재 버전 폴더)의 manifest(버전, 임베딩 모델, 청크 ID 목록, 코퍼스 파일별 상태)를 읽습니다. 없으면 None."""
+    try:
+        with open(os.path.join(resolve_index_dir(index_path), MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _publish_index_version(index_path, version_name):
+    """CURRENT를 새 버전 폴더로 바꿉니다 (os.replace 한 번이라 인덱스가 없는 구간이 없음)."""
+    pointer_path = os.path.join(index_path, INDEX_POINTER_FILE)
+    with open(pointer_path + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(version_name)
+    os.replace(pointer_path + ".tmp", pointer_path)
+
+def _prune_index_versions(index_path, current_name):
+    """최근 KEEP_INDEX_VERSIONS개를 제외한 버전 폴더와, 이전 형식으로 폴더에 바로 저장된 파일을 지웁니다."""
+    versions = sorted((name for name in os.listdir(index_path) if re.fullmatch(r"v\d+", name)), reverse=True)
+    for name in versions[KEEP_INDEX_VERSIONS:]:
+        if name != current_name:
+            shutil.rmtree(os.path.join(index_path, name), ignore_errors=True)
+    for name in os.listdir(index_path):
+        path = os.path.join(index_path, name)
+        if os.path.isfile(path) and name != INDEX_POINTER_FILE:
+            try:
+                os.remove(path)
+            except OSError:
+                pass   # 다른 프로세스가 아직 열고 있는 이전 형식 파일 (다음 갱신 때 다시 시도)
+
+def save_sidecar_indexes(chunks_by_id, index_path, only_missing=False):
+    """FAISS 옆에 함께 두는 보조 색인(과목명 색인, BM25 색인)을 저장합니다."""
+    if not (only_missing and os.path.exists(os.path.join(index_path, COURSE_LOOKUP_FILE))):
+        # 과목명/과목코드 → 청크 색인 (질문에 과목명이 그대로 있으면 벡터 검색 없이 바로 사용)
+        save_course_lookup(build_course_lookup(chunks_by_id), index_path)
+    if not (only_missing and os.path.exists(os.path.join(index_path, LEXICAL_INDEX_FILE))):
+        # 과목코드/정확한 과목명 검색을 보완하는 BM25 색인
+        LexicalIndex.build(chunks_by_id).save(index_path)
+
+def split_recursive(documents):
+    """이전 분할 방식: 글자 수 기준으로 자르고 청크끼리 절반씩 겹치게 둡니다."""
     # RecursiveCharacterTextSplitter는 구분자 목록(separators)을 받아
     # 순서대로 텍스트 분할을 시도합니다.
     # 1. "\n\n" (두 번의 줄바꿈, 문단)
@@ -535,33 +94,224 @@ def create_and_save_rag_index():
     # 3. "\n" (한 번의 줄바꿈, 일반적인 줄 나눔)
     # 4. " " (공백)
     # 이렇게 하면 각 리스트 항목(- 또는 *)이 별개의 청크로 분리될 확률이 매우 높아집니다.
-    print("새로운 전략으로 텍스트 분할 중...")
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=1000,       # 각 청크의 최대 크기
         chunk_overlap=500,     # 청크 간의 겹치는 부분
         separators=["\n\n", "\n- ", "\n* ", "\n", " "] # 분할 기준 우선순위
     )
-    
     # create_documents는 각 문서를 독립적으로 처리합니다.
-    all_chunks = []
-    for doc in documents:
-        chunks = text_splitter.create_documents([doc])
-        all_chunks.extend(chunks)
-        
-    print(f"총 {len(all_chunks)}개의 문서 조각으로 최종 분할되었습니다.")
-    # --- ★★★ 수정 끝 ★★★ ---
+    return [chunk for doc in documents for chunk in text_splitter.create_documents([doc])]
 
-    print("임베딩 모델 로딩 중 (Ollama)...")
-    embeddings = OllamaEmbeddings(model="nomic-embed-text")
+def split_documents(documents, strategy=CHUNKING_STRATEGY):
+    """문서를 청크로 나누고, 내용 해시를 chunk_id 메타데이터로 붙입니다 (중복 청크는 하나만 남김).
 
-    print("FAISS 인덱스 생성 중... (시간이 다소 걸릴 수 있습니다)")
-    vector_store = FAISS.from_documents(documents=all_chunks, embedding=embeddings)
+    검색 범위 필터용 메타데이터(문서 종류, 학과, 이수구분, 학년도)도 함께 붙입니다.
+    """
+    chunks = []
+    for doc in documents:
+        if strategy == "recursive":
+            doc_chunks = split_recursive([doc])
+        else:
+            # 마크다운 제목(##, ###)과 과목 항목(- **코드 과목명) 단위로 겹침 없이 분할
+            doc_chunks = split_structured_document(doc)
+        title = document_title(doc)
+        for chunk in doc_chunks:
+            chunk.metadata.update(chunk_filter_metadata(title, chunk))
+        chunks.extend(doc_chunks)
+
+    chunks_by_id = {}
+    for chunk in chunks:
+        chunk_id = chunk_id_for(chunk.page_content)
+        chunk.metadata['chunk_id'] = chunk_id
+        chunks_by_id.setdefault(chunk_id, chunk)
+    return chunks_by_id
+
+def compare_chunking_strategies(documents):
+    """두 분할 방식의 청크 수와 글자/어림 토큰 수를 비교해 출력합니다."""
+    print(f"{'방식':<12}{'청크 수':>8}{'총 글자':>10}{'평균 글자':>10}{'최대 글자':>10}{'어림 토큰':>10}")
+    for strategy in ("recursive", "structured"):
+        stats = chunk_statistics(list(split_documents(documents, strategy).values()))
+        print(f"{strategy:<12}{stats['chunks']:>8}{stats['total_chars']:>10}{stats['avg_chars']:>10.0f}"
+              f"{stats['max_chars']:>10}{stats['approx_tokens']:>10}")
+
+def embed_chunks_batched(embeddings, texts, batch_size=EMBED_BATCH_SIZE, max_in_flight=EMBED_MAX_IN_FLIGHT):
+    """청크를 batch_size개씩 묶어, 최대 max_in_flight개의 요청만 동시에 보내며 임베딩합니다.
+
+    진행 중인 요청이 가득 차면 하나가 끝날 때까지 다음 배치를 보내지 않습니다(backpressure).
+    반환값: texts와 같은 순서의 벡터 리스트
+    """
+    vectors = [None] * len(texts)
+    starts = iter(range(0, len(texts), batch_size))
+    pending = {}
+    done_count = 0
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        while True:
+            while len(pending) < max_in_flight:
+                start = next(starts, None)
+                if start is None:
+                    break
+                future = executor.submit(embeddings.embed_documents, texts[start:start + batch_size])
+                pending[future] = start
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                batch_vectors = future.result()
+                vectors[start:start + len(batch_vectors)] = batch_vectors
+                done_count += len(batch_vectors)
+                elapsed = time.perf_counter() - start_time
+                print(f"  임베딩 {done_count}/{len(texts)} ({done_count / elapsed:.1f} chunks/sec)")
+
+    elapsed = time.perf_counter() - start_time
+    if texts:
+        print(f"임베딩 완료: {len(texts)}개, {elapsed:.2f}초, {len(texts) / elapsed:.1f} chunks/sec "
+              f"(배치 {batch_size}, 동시 요청 {max_in_flight})")
+    return vectors
+
+def _embed_documents(embeddings, chunks, batch_size, max_in_flight):
+    """Document 목록을 임베딩해 FAISS에 넣을 (text, vector) 쌍과 메타데이터를 만듭니다."""
+    texts = [chunk.page_content for chunk in chunks]
+    vectors = embed_chunks_batched(embeddings, texts, batch_size, max_in_flight)
+    embeddings.flush()   # 새로 계산한 임베딩을 캐시에 한 번에 기록
+    return list(zip(texts, vectors)), [chunk.metadata for chunk in chunks]
+
+def create_and_save_rag_index(index_path=FAISS_INDEX_PATH, rebuild=False,
+                              batch_size=EMBED_BATCH_SIZE, max_in_flight=EMBED_MAX_IN_FLIGHT,
+                              corpus_dir=CORPUS_DIR, mmap_format=MMAP_FORMAT):
+    """코퍼스 폴더의 문서로 RAG 인덱스를 생성하고 디스크에 저장합니다.
+
+    문서는 파일 하나씩 읽으며, 이전 manifest와 mtime/해시가 같은 파일은 읽거나 분할하지 않고
+    기존 청크를 그대로 씁니다. 바뀐 파일의 청크 중 새로 생긴 것만 임베딩해 추가하고,
+    어느 파일에도 남지 않은 청크는 docstore에서 지웁니다. 결과는 index_path 안의 새 버전 폴더에 저장한 뒤
+    CURRENT 파일만 바꿔 공개하므로 재생성 중에도, 교체 순간에도 기존 인덱스를 계속 읽을 수 있습니다.
+    mmap_format이 있으면 같은 폴더에 mmap 형식(mmap_index.py) 벡터 파일과 SQLite docstore도 저장합니다.
+    """
+    print("임베딩 모델 로딩 중 (Ollama)...")
+    # 이미 임베딩한 청크는 디스크 캐시에서 가져오므로 전체 재생성도 빠름
+    embeddings = get_cached_embeddings(EMBEDDING_MODEL)
+
+    current_dir = resolve_index_dir(index_path)
+    manifest = load_index_manifest(current_dir)
+    vector_store = None
+    # 임베딩 모델이나 메타데이터 규칙이 바뀌면 전체 재생성 (청크 ID가 같아도 메타데이터가 달라지므로)
+    if (not rebuild and manifest and manifest.get('embedding_model') == EMBEDDING_MODEL
+            and manifest.get('metadata_version') == CHUNK_METADATA_VERSION):
+        try:
+            vector_store = FAISS.load_local(current_dir, embeddings, allow_dangerous_deserialization=True)
+        except Exception as e:
+            print(f"기존 인덱스를 읽지 못해 전체를 다시 만듭니다: {e}")
+    # 분할 방식이 바뀌었거나 새로 만드는 경우에는 모든 파일을 다시 읽음
+    previous_files = {}
+    if vector_store is not None and manifest.get('chunking_strategy', CHUNKING_STRATEGY) == CHUNKING_STRATEGY:
+        previous_files = manifest.get('files', {})
+
+    print(f"코퍼스 '{corpus_dir}' 읽는 중... ({CHUNKING_STRATEGY})")
+    files = {}
+    new_chunks = {}      # 바뀐 파일에서 새로 분할한 청크
+    kept_ids = set()     # 바뀌지 않은 파일의 기존 청크
+    changed_files = []
+    for document in DocumentSource(corpus_dir, previous_files).iter_documents():
+        if not document.changed:
+            previous_ids = previous_files[document.name].get('chunk_ids', [])
+            kept_ids.update(previous_ids)
+            files[document.name] = document.to_manifest(previous_ids)
+            continue
+        chunks_by_id = split_documents([document.text])
+        for chunk in chunks_by_id.values():
+            chunk.metadata['source'] = document.name
+        new_chunks.update(chunks_by_id)
+        files[document.name] = document.to_manifest(chunks_by_id)
+        changed_files.append(document.name)
+    removed_files = [name for name in previous_files if name not in files]
+    print(f"코퍼스 파일 {len(files)}개 (변경 {len(changed_files)}개, 삭제 {len(removed_files)}개)")
+    if not files:
+        print("오류: RAG 인덱스를 생성할 문서가 없습니다.")
+        return
 
-    print(f"인덱스를 '{FAISS_INDEX_PATH}' 폴더에 저장 중...")
-    if os.path.exists(FAISS_INDEX_PATH):
-        shutil.rmtree(FAISS_INDEX_PATH)
-    vector_store.save_local(FAISS_INDEX_PATH)
+    if vector_store is not None:
+        # 바뀌지 않은 파일의 청크는 기존 docstore에서 가져옴 (보조 색인 재생성용)
+        for chunk_id in kept_ids - set(new_chunks):
+            doc = vector_store.docstore.search(chunk_id)
+            if isinstance(doc, str):
+                # docstore에 없는 청크가 있으면 증분 갱신을 믿을 수 없으므로 전체 재생성
+                print("기존 인덱스와 manifest가 맞지 않아 전체를 다시 만듭니다.")
+                return create_and_save_rag_index(index_path, True, batch_size, max_in_flight, corpus_dir, mmap_format)
+            new_chunks[chunk_id] = doc
+    chunks_by_id = new_chunks
+    stats = chunk_statistics(list(chunks_by_id.values()))
+    print(f"총 {stats['chunks']}개의 문서 조각으로 최종 분할되었습니다. "
+          f"(평균 {stats['avg_chars']:.0f}자, 어림 토큰 {stats['approx_tokens']}개)")
+
+    new_manifest = {'embedding_model': EMBEDDING_MODEL, 'chunking_strategy': CHUNKING_STRATEGY,
+                    'metadata_version': CHUNK_METADATA_VERSION, 'mmap_format': mmap_format,
+                    'chunk_ids': sorted(chunks_by_id), 'files': files}
+    if vector_store is None:
+        print(f"FAISS 인덱스 전체 생성 중... (청크 {len(chunks_by_id)}개 임베딩, 시간이 다소 걸릴 수 있습니다)")
+        text_embeddings, metadatas = _embed_documents(
+            embeddings, list(chunks_by_id.values()), batch_size, max_in_flight)
+        vector_store = FAISS.from_embeddings(
+            text_embeddings, embeddings, metadatas=metadatas, ids=list(chunks_by_id))
+        version = (manifest or {}).get('version', 0) + 1
+    else:
+        existing_ids = set(vector_store.index_to_docstore_id.values())
+        added_ids = [chunk_id for chunk_id in chunks_by_id if chunk_id not in existing_ids]
+        removed_ids = [chunk_id for chunk_id in existing_ids if chunk_id not in chunks_by_id]
+        print(f"증분 갱신: 추가 {len(added_ids)}개, 삭제 {len(removed_ids)}개, "
+              f"유지 {len(existing_ids) - len(removed_ids)}개")
+        if not added_ids and not removed_ids and manifest.get('mmap_format') == mmap_format:
+            save_sidecar_indexes(chunks_by_id, current_dir, only_missing=True)
+            # 청크는 그대로지만 파일 mtime 등이 바뀌었을 수 있으므로 manifest만 갱신 (버전은 유지)
+            new_manifest['version'] = manifest.get('version', 0)
+            manifest_path = os.path.join(current_dir, MANIFEST_FILE)
+            with open(manifest_path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(new_manifest, f, ensure_ascii=False, indent=2)
+            os.replace(manifest_path + ".tmp", manifest_path)
+            print("\n변경된 청크가 없어 기존 RAG 인덱스를 그대로 사용합니다.")
+            return
+        if removed_ids:
+            vector_store.delete(removed_ids)
+        if added_ids:
+            text_embeddings, metadatas = _embed_documents(
+                embeddings, [chunks_by_id[chunk_id] for chunk_id in added_ids], batch_size, max_in_flight)
+            vector_store.add_embeddings(text_embeddings, metadatas=metadatas, ids=added_ids)
+        version = manifest.get('version', 0) + 1
+
+    version_name = f"v{version:06d}"
+    version_path = os.path.join(index_path, version_name)
+    print(f"인덱스를 '{version_path}' 폴더에 저장 중... (버전 {version})")
+    if os.path.exists(version_path):
+        shutil.rmtree(version_path)   # 이전에 중단된 저장 (CURRENT가 가리키지 않음)
+    os.makedirs(index_path, exist_ok=True)
+    vector_store.save_local(version_path)
+    save_sidecar_indexes(chunks_by_id, version_path)
+    if mmap_format:
+        export_mmap_index(vector_store, version_path, mmap_format)
+    new_manifest['version'] = version
+    with open(os.path.join(version_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(new_manifest, f, ensure_ascii=False, indent=2)
+    _publish_index_version(index_path, version_name)
+    _prune_index_versions(index_path, version_name)
     print("\nRAG 인덱스 생성 및 저장이 완료되었습니다!")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="RAG용 FAISS 인덱스를 생성/갱신합니다.")
+    parser.add_argument('--rebuild', action='store_true', help="기존 인덱스를 무시하고 전체를 다시 생성")
+    parser.add_argument('--batch-size', type=int, default=EMBED_BATCH_SIZE, help="임베딩 요청당 청크 수")
+    parser.add_argument('--concurrency', type=int, default=EMBED_MAX_IN_FLIGHT, help="동시에 보내는 임베딩 요청 수")
+    parser.add_argument('--mmap-format', choices=MMAP_FORMATS + ('none',), default=MMAP_FORMAT,
+                        help="함께 저장할 mmap 인덱스 형식 (none: 저장 안 함)")
+    parser.add_argument('--corpus', default=CORPUS_DIR, help="RAG 문서(.md/.txt/.pdf)가 있는 폴더")
+    parser.add_argument('--compare-chunking', action='store_true',
+                        help="인덱스를 만들지 않고 분할 방식별 청크/토큰 통계만 비교")
+    return parser.parse_args()
+
 if __name__ == '__main__':
-    create_and_save_rag_index()
\ No newline at end of file
+    args = parse_args()
+    if args.compare_chunking:
+        compare_chunking_strategies(list(DocumentSource(args.corpus).iter_texts()))
+        raise SystemExit
+    create_and_save_rag_index(rebuild=args.rebuild, batch_size=args.batch_size, max_in_flight=args.concurrency,
+                              corpus_dir=args.corpus,
+                              mmap_format=None if args.mmap_format == 'none' else args.mmap_format)
\ No newline at end of file
@@ -1,68 +1,102 @@
-# 파일명: requirements_rule.py (수정 완료)
+# 파일명: requirements_rule.py
+# 졸업요건 규칙 파일 읽기/검증
+# 규칙은 graduation_rules/ 폴더의 JSON 파일로 관리합니다 (학과 + 적용 입학연도 범위별 1파일).
+# {
+#   "department": "인공지능소프트웨어학과",
+#   "admission_year_from": 2021,   (null이면 제한 없음)
+#   "admission_year_to": null,
+#   "version": "2024-2025",
+#   "requirements": {total_credits, classification_credits, required_courses, detailed_requirements}
+# }
+# 파일을 고치면 실행 중인 앱이 자동으로 다시 읽습니다 (rule_engine.get_rule_set).
 
-GRADUATION_REQUIREMENTS = {
-    '인공지능소프트웨어학과': {
-        'total_credits': 130,
-        
-        'classification_credits': {
-            '교필': 9,
-            '교선': 21,
-            '전선': 48,
-            '심선': 12,
-            '특필': 8,
-            '일선': 0
-        },
-        
-        'required_courses': [ 
-            '공학설계입문', '진로설계1(자기이해와 대학생활)', '진로설계2(진로탐색과 자기계발)',
-            '진로설계3(진로설정과 경력개발)', '진로설계4(취업전략과 실전취업)', '캡스톤디자인Ⅰ'
-        ],
-        
-        'detailed_requirements': {
-            # --- ★★★ 이 부분만 수정됩니다 ★★★ ---
-            '교양 학점 합계': {
-                'description': "교양(교필+교선+일선) 학점을 총 33학점 이상 이수", # 설명 변경
-                'type': 'credit_sum',
-                'classifications': ['교필', '교선', '일선'], # '일선' 추가
-                'required_credits': 33
-            },
-            # --- ★★★ 수정 끝 ★★★ ---
-            
-            '기초교양 필수 과목': {
-                'description': "'발표와 토론', '대학영어' 과목 필수 이수",
-                'type': 'take_all',
-                'courses': ['발표와 토론', '대학영어']
-            },
-            '기초교양 택1 (글쓰기)': {
-                'description': "'창의글쓰기', '공학글쓰기' 중 1과목 이상 필수 이수",
-                'type': 'take_one_or_more',
-                'courses': ['창의글쓰기', '공학글쓰기']
-            },
-            '기초교양 택1 (코딩)': {
-                'description': "코딩 5과목(C,Java,Python,Scratch,VB) 중 1과목 이상 필수 이수",
-                'type': 'take_one_or_more',
-                'courses': ['C 프로그래밍', 'Java 프로그래밍', 'Python 프로그래밍', 'Scratch 프로그래밍', '비주얼베이직']
-            },
-            '핵심교양 세부 영역': {
-                'description': "핵심교양 3개 영역(소통과인성, 분석과판단, 도전과미래)에서 각각 1과목 이상 필수 이수",
-                'type': 'area_based',
-                'num_areas_required': 3,
-                'areas': {
-                    '소통과 인성': [
-                        '문화콘텐츠스토리텔링', '인권과 사회', '종교와 문화', '인간과 환경',
-                        '[계열교차 교과목] 과학기술의 탐색 (수학 과학 공학)',
-                        '[계열교차 교과목] 인간의 탐색 (철학 역사 문학)'
-                    ],
-                    '분석과 판단': [
-                        '합리적 문제해결과 논리', '인간과 윤리', '통계로 보는 세상',
-                        '과학기술사', '심리분석'
-                    ],
-                    '도전과 미래': [
-                        '한국사의 이해', '인간삶과 교육', '역사와 문화',
-                        '세계시민과 국가', '경제와 사회'
-                    ]
-                }
-            }
-        }
-    }
-}
\ No newline at end of file
+import json
+import os
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "graduation_rules")
+
+
+class RuleFile:
+    """규칙 파일 하나 (학과, 적용 입학연도 범위, 버전, 요건 dict)."""
+
+    def __init__(self, path, department, year_from, year_to, version, requirements):
+        self.path = path
+        self.department = department
+        self.year_from = year_from
+        self.year_to = year_to
+        self.version = version
+        self.requirements = requirements
+
+    def covers(self, admission_year):
+        """이 파일이 해당 입학연도에 적용되는지 (입학연도를 모르면 범위와 상관없이 True)."""
+        if admission_year is None:
+            return True
+        return ((self.year_from is None or admission_year >= self.year_from)
+                and (self.year_to is None or admission_year <= self.year_to))
+
+    def overlaps(self, other):
+        low = max(self.year_from or 0, other.year_from or 0)
+        high = min(self.year_to or 9999, other.year_to or 9999)
+        return self.department == other.department and low <= high
+
+
+def parse_admission_year(student_id):
+    """학번 앞 4자리를 입학연도로 봅니다 (예: 20231081 -> 2023). 알 수 없으면 None."""
+    prefix = str(student_id or "")[:4]
+    return int(prefix) if len(prefix) == 4 and prefix.isdigit() else None
+
+def _check_year(value, path, key):
+    if value is not None and not isinstance(value, int):
+        raise ValueError(f"{path}: {key}는 정수 또는 null이어야 합니다.")
+    return value
+
+def load_rule_file(path):
+    """규칙 파일을 읽고 형식을 검사합니다. 잘못되면 ValueError (규칙 종류별 검사는 rule_engine에서)."""
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: JSON 형식 오류 ({e})") from e
+    if not isinstance(data, dict) or not isinstance(data.get('department'), str) or not data['department']:
+        raise ValueError(f"{path}: department(학과명)가 없습니다.")
+    requirements = data.get('requirements')
+    if not isinstance(requirements, dict):
+        raise ValueError(f"{path}: requirements가 없습니다.")
+    if not isinstance(requirements.get('total_credits'), (int, float)):
+        raise ValueError(f"{path}: requirements.total_credits는 숫자여야 합니다.")
+    if not isinstance(requirements.get('classification_credits'), dict):
+        raise ValueError(f"{path}: requirements.classification_credits가 없습니다.")
+    if not isinstance(requirements.get('required_courses', []), list):
+        raise ValueError(f"{path}: requirements.required_courses는 목록이어야 합니다.")
+    if not isinstance(requirements.get('detailed_requirements', {}), dict):
+        raise ValueError(f"{path}: requirements.detailed_requirements는 객체여야 합니다.")
+    year_from = _check_year(data.get('admission_year_from'), path, 'admission_year_from')
+    year_to = _check_year(data.get('admission_year_to'), path, 'admission_year_to')
+    if year_from is not None and year_to is not None and year_from > year_to:
+        raise ValueError(f"{path}: admission_year_from이 admission_year_to보다 큽니다.")
+    return RuleFile(path, data['department'], year_from, year_to, str(data.get('version', '')), requirements)
+
+def scan_rule_files(rules_dir=RULES_DIR):
+    """규칙 폴더의 JSON 파일을 (경로, mtime_ns, 크기) 목록으로 반환합니다. 변경 감지용."""
+    try:
+        names = sorted(name for name in os.listdir(rules_dir) if name.endswith('.json'))
+    except FileNotFoundError:
+        return ()
+    signature = []
+    for name in names:
+        path = os.path.join(rules_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def load_rule_files(paths):
+    """규칙 파일들을 읽어 RuleFile 목록을 반환합니다. 같은 학과의 입학연도 범위가 겹치면 ValueError."""
+    rule_files = [load_rule_file(path) for path in paths]
+    for i, rule_file in enumerate(rule_files):
+        for other in rule_files[i + 1:]:
+            if rule_file.overlaps(other):
+                raise ValueError(f"{rule_file.path}, {other.path}: '{rule_file.department}'의 적용 입학연도가 겹칩니다.")
+    return rule_files
@@ -0,0 +1,230 @@
+# 파일명: rule_engine.py
+# graduation_rules/의 졸업요건 규칙 파일을 한 번만 해석해 두는 규칙 엔진
+# - 과목명은 미리 정규화(공백 제거)해 정수 ID로 바꾸고, 규칙별 판정 함수를 만들어 둠
+# - 학생 한 명 평가 = 수강 과목 ID 집합과 규칙별 frozenset의 집합 연산 몇 번
+# - 규칙은 (학과, 입학연도)로 찾고, 규칙 파일이 바뀌면 재시작 없이 다시 읽어 통째로 교체
+
+import threading
+import time
+
+from academic_snapshot import normalize_course_name
+from requirements_rule import RULES_DIR, load_rule_files, parse_admission_year, scan_rule_files
+
+# --- 설정 ---
+RULES_RELOAD_INTERVAL = 5.0   # 규칙 파일 변경 여부를 확인하는 최소 간격(초)
+
+
+class CourseIdTable:
+    """규칙에 나오는 과목명(정규화)을 정수 ID로 바꾸는 표. 규칙에 없는 과목은 평가에 필요 없으므로 무시."""
+
+    def __init__(self):
+        self._ids = {}
+
+    def intern(self, course_name):
+        return self._ids.setdefault(normalize_course_name(course_name), len(self._ids))
+
+    def ids_for(self, normalized_names):
+        """정규화된 과목명 집합 -> 규칙에 등장하는 과목의 ID frozenset"""
+        ids = self._ids
+        return frozenset(ids[name] for name in normalized_names if name in ids)
+
+
+class CompiledRule:
+    """세부 요건 하나. check(taken_ids, credits_by_classification)가 결과 dict를 반환합니다."""
+    __slots__ = ('name', 'description', 'type', 'check')
+
+    def __init__(self, name, description, rule_type, check):
+        self.name = name
+        self.description = description
+        self.type = rule_type
+        self.check = check
+
+
+def _compile_credit_sum(rule, ids):
+    classifications = tuple(rule['classifications'])
+    required_credits = rule['required_credits']
+
+    def check(taken_ids, credits_by_classification):
+        sum_credits = sum(credits_by_classification.get(c, 0) for c in classifications)
+        return {'is_satisfied': sum_credits >= required_credits,
+                'details': f"필요: {required_credits}학점, 현재: {sum_credits}학점"}
+    return check
+
+def _compile_take_all(rule, ids):
+    courses = tuple((ids.intern(name), name) for name in rule['courses'])
+
+    def check(taken_ids, credits_by_classification):
+        missing = [name for course_id, name in courses if course_id not in taken_ids]
+        result = {'is_satisfied': not missing}
+        if missing:
+            result['missing_items'] = missing
+        return result
+    return check
+
+def _compile_take_one_or_more(rule, ids):
+    course_ids = frozenset(ids.intern(name) for name in rule['courses'])
+
+    def check(taken_ids, credits_by_classification):
+        completed = not course_ids.isdisjoint(taken_ids)
+        result = {'is_satisfied': completed}
+        if not completed:
+            result['details'] = "아직 이수하지 않았습니다."
+        return result
+    return check
+
+def _compile_area_based(rule, ids):
+    areas = tuple((area, frozenset(ids.intern(name) for name in courses)) for area, courses in rule['areas'].items())
+    num_required = rule['num_areas_required']
+
+    def check(taken_ids, credits_by_classification):
+        missing_areas = [area for area, course_ids in areas if course_ids.isdisjoint(taken_ids)]
+        result = {'is_satisfied': len(areas) - len(missing_areas) >= num_required}
+        if not result['is_satisfied']:
+            result['missing_areas'] = missing_areas
+        return result
+    return check
+
+RULE_COMPILERS = {
+    'credit_sum': (_compile_credit_sum, ('classifications', 'required_credits')),
+    'take_all': (_compile_take_all, ('courses',)),
+    'take_one_or_more': (_compile_take_one_or_more, ('courses',)),
+    'area_based': (_compile_area_based, ('areas', 'num_areas_required')),
+}
+
+
+class CompiledRequirements:
+    """한 학과의 졸업요건을 미리 해석해 둔 평가기 (만든 뒤에는 바꾸지 않음)."""
+
+    def __init__(self, department, requirements, version=""):
+        self.department = department
+        self.version = version               # 규칙 파일의 version (보고서 캐시 키, 화면 표시용)
+        self.source = requirements           # 원본 dict (추천 단계에서 과목 목록 참조용)
+        self.course_ids = CourseIdTable()
+        self.total_credits = requirements['total_credits']
+        self.classification_credits = tuple(requirements['classification_credits'].items())
+        self.required_courses = tuple(
+            (self.course_ids.intern(name), name) for name in requirements.get('required_courses', []))
+
+        rules = []
+        for name, rule in requirements.get('detailed_requirements', {}).items():
+            rule_type = rule.get('type')
+            if rule_type not in RULE_COMPILERS:
+                raise ValueError(f"'{department}' 요건 '{name}': 알 수 없는 규칙 종류 {rule_type!r}")
+            compiler, required_keys = RULE_COMPILERS[rule_type]
+            missing_keys = [key for key in required_keys + ('description',) if key not in rule]
+            if missing_keys:
+                raise ValueError(f"'{department}' 요건 '{name}': {', '.join(missing_keys)} 항목이 없습니다.")
+            rules.append(CompiledRule(name, rule['description'], rule_type, compiler(rule, self.course_ids)))
+        self.rules = tuple(rules)
+
+    def evaluate(self, taken_course_names_normalized, completed_credits_by_classification, total_completed_credits):
+        """수강 내역으로 졸업요건 충족 현황을 계산합니다 (analyze_graduation_progress와 같은 형식)."""
+        taken_ids = self.course_ids.ids_for(taken_course_names_normalized)
+        analysis = {
+            'summary': {
+                'total_required': self.total_credits,
+                'total_completed': int(total_completed_credits),
+                'total_missing': max(0, self.total_credits - total_completed_credits)
+            },
+            'by_classification': [],
+            'missing_required_courses': [name for course_id, name in self.required_courses
+                                         if course_id not in taken_ids],
+            'detailed_analysis': []
+        }
+        for classification, required in self.classification_credits:
+            completed = completed_credits_by_classification.get(classification, 0)
+            analysis['by_classification'].append({
+                'classification': classification, 'required': required,
+                'completed': int(completed), 'missing': max(0, required - completed)
+            })
+        for rule in self.rules:
+            result = {'name': rule.name, 'description': rule.description}
+            result.update(rule.check(taken_ids, completed_credits_by_classification))
+            analysis['detailed_analysis'].append(result)
+        return analysis
+
+    def evaluate_snapshot(self, snapshot):
+        return self.evaluate(snapshot.taken_course_names_normalized,
+                             snapshot.completed_credits_by_classification, snapshot.total_completed_credits)
+
+
+class RuleSet:
+    """규칙 파일 전체를 컴파일한 결과. (학과, 입학연도) 조회는 한 번 찾은 뒤 dict로 바로 반환합니다."""
+
+    def __init__(self, rule_files, signature=()):
+        self.signature = signature
+        by_department = {}
+        for rule_file in rule_files:
+            compiled = CompiledRequirements(rule_file.department, rule_file.requirements, rule_file.version)
+            by_department.setdefault(rule_file.department, []).append((rule_file, compiled))
+        # 학과별로 적용 시작 연도 순 정렬 (시작 연도가 없으면 가장 앞)
+        self.by_department = {
+            department: tuple(sorted(entries, key=lambda entry: entry[0].year_from or 0))
+            for department, entries in by_department.items()
+        }
+        self._memo = {}
+
+    def lookup(self, department, admission_year=None):
+        """학과와 입학연도에 맞는 CompiledRequirements. 입학연도를 모르면 가장 최근 규칙, 없으면 None."""
+        key = (department, admission_year)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        compiled = None
+        for rule_file, candidate in reversed(self.by_department.get(department, ())):
+            if rule_file.covers(admission_year):
+                compiled = candidate
+                break
+        self._memo[key] = compiled
+        return compiled
+
+
+def compile_rule_set(signature):
+    """scan_rule_files 결과의 파일을 모두 읽어 검증/컴파일합니다. 잘못된 파일이 있으면 ValueError."""
+    return RuleSet(load_rule_files([path for path, _, _ in signature]), signature)
+
+
+_rule_set = None
+_rule_set_checked_at = 0.0
+_failed_signature = None      # 오류가 난 규칙 파일 상태 (다시 바뀌기 전까지 같은 오류를 반복 출력하지 않음)
+_rule_set_lock = threading.Lock()
+
+def get_rule_set(rules_dir=RULES_DIR):
+    """현재 규칙 묶음을 반환합니다.
+
+    RULES_RELOAD_INTERVAL마다 규칙 파일의 수정 시각/크기를 확인해 바뀌었으면 다시 컴파일합니다.
+    새 규칙에 오류가 있으면 메시지만 출력하고 기존 규칙을 계속 사용합니다.
+    """
+    global _rule_set, _rule_set_checked_at, _failed_signature
+    now = time.monotonic()
+    if _rule_set is not None and now - _rule_set_checked_at < RULES_RELOAD_INTERVAL:
+        return _rule_set
+    with _rule_set_lock:
+        if _rule_set is not None and now - _rule_set_checked_at < RULES_RELOAD_INTERVAL:
+            return _rule_set
+        _rule_set_checked_at = now
+        signature = scan_rule_files(rules_dir)
+        if _rule_set is not None and signature in (_rule_set.signature, _failed_signature):
+            return _rule_set
+        try:
+            rule_set = compile_rule_set(signature)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"졸업요건 규칙을 읽지 못했습니다. 기존 규칙을 계속 사용합니다: {e}")
+            _failed_signature = signature
+            if _rule_set is None:
+                _rule_set = RuleSet(())
+            return _rule_set
+        if _rule_set is not None:
+            print(f"졸업요건 규칙을 다시 읽었습니다 (파일 {len(signature)}개).")
+        _rule_set = rule_set
+        return _rule_set
+
+def get_compiled_requirements(department, admission_year=None):
+    """학과(와 입학연도)의 컴파일된 졸업요건을 반환합니다. 정의되지 않았으면 None."""
+    return get_rule_set().lookup(department, admission_year)
+
+def get_requirements_for_student(student_info):
+    """학생 정보(department_major, student_id)로 적용할 졸업요건을 찾습니다. 학번 앞 4자리가 입학연도."""
+    return get_compiled_requirements(student_info.get('department_major'),
+                                     parse_admission_year(student_info.get('student_id')))